@@ -0,0 +1,203 @@
+import asyncio
+import hashlib
+import logging
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.db.batch_writer import BatchWriter
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SAMPLE_COLLECTION = "error"
+SUMMARY_COLLECTION = "error_summaries"
+
+# 샘플에 남기는 요청 헤더 (쿠키 / 인증 정보는 저장하지 않음)
+SAMPLE_HEADERS = ("user-agent", "referer", "origin", "content-type", "x-forwarded-for")
+
+# 경로 / 메시지의 가변 부분 -> placeholder
+_PATH_PATTERNS = [
+    (re.compile(r"/[0-9a-fA-F]{24}(?=/|$)"), "/{id}"),
+    (re.compile(r"/[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}(?=/|$)"), "/{uuid}"),
+    (re.compile(r"/[^/@]+@[^/]+(?=/|$)"), "/{email}"),
+    (re.compile(r"/\d+(?=/|$)"), "/{n}"),
+]
+_MESSAGE_PATTERNS = [
+    (re.compile(r"\b[0-9a-fA-F]{24}\b"), "{id}"),
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "{uuid}"),
+    (re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+"), "{email}"),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "{str}"),
+    (re.compile(r"https?://\S+"), "{url}"),
+    (re.compile(r"\d+(\.\d+)?"), "{n}"),
+]
+
+
+def path_template(path: str) -> str:
+    for pattern, replacement in _PATH_PATTERNS:
+        path = pattern.sub(replacement, path)
+    return path
+
+
+def message_template(message: str) -> str:
+    message = message[:500]
+    for pattern, replacement in _MESSAGE_PATTERNS:
+        message = pattern.sub(replacement, message)
+    return message
+
+
+class ErrorRecorder:
+    """예외 핸들러용 에러 집계기
+
+    같은 에러(경로 템플릿 + 메서드 + 상태 코드 + 메시지 템플릿 = fingerprint)는 window 동안 개수만 센다.
+    window가 끝나면 fingerprint별 요약 1건과, window당 fingerprint별 최대 samples_per_window 건의
+    원본 이벤트만 BatchWriter로 적재한다. 장애로 같은 에러가 폭주해도 DB 쓰기 / 콘솔 로그는 늘지 않는다.
+    """
+
+    def __init__(self, window_seconds: float, samples_per_window: int, max_fingerprints: int):
+        self.window_seconds = window_seconds
+        self.samples_per_window = samples_per_window
+        self.max_fingerprints = max_fingerprints
+
+        self.sample_writer = BatchWriter(
+            SAMPLE_COLLECTION,
+            max_queue_size=settings.ERROR_QUEUE_MAX_SIZE,
+            batch_size=100,
+            flush_interval=window_seconds,
+        )
+        self.summary_writer = BatchWriter(
+            SUMMARY_COLLECTION,
+            max_queue_size=settings.ERROR_QUEUE_MAX_SIZE,
+            batch_size=100,
+            flush_interval=window_seconds,
+        )
+
+        self._window: Dict[str, dict] = {}
+        self._window_started = datetime.now(timezone.utc)
+        # 프로세스 시작 이후 누적 (top errors 조회용, 오래된 fingerprint부터 제거)
+        self._totals: "OrderedDict[str, dict]" = OrderedDict()
+        self._task: Optional[asyncio.Task] = None
+        self.dropped_fingerprints = 0
+
+    def record(self,
+               path: str,
+               method: str,
+               status_code: int,
+               message: str,
+               headers: Optional[dict] = None,
+               error_type: Optional[str] = None) -> str:
+        """에러 1건 집계 (I/O 없음, fingerprint 반환)"""
+        now = datetime.now(timezone.utc)
+        template_path = path_template(path)
+        template_message = message_template(message)
+        fingerprint = hashlib.sha1(
+            f"{status_code}|{method}|{template_path}|{template_message}".encode()
+        ).hexdigest()[:16]
+
+        entry = self._window.get(fingerprint)
+        if entry is None:
+            if len(self._window) >= self.max_fingerprints:
+                # fingerprint 폭증 (템플릿화 안 되는 메시지) 방어
+                self.dropped_fingerprints += 1
+                return fingerprint
+            entry = {
+                "fingerprint": fingerprint,
+                "path": template_path,
+                "method": method,
+                "status_code": status_code,
+                "error_type": error_type,
+                "message_template": template_message,
+                "example_message": message[:500],
+                "count": 0,
+                "samples": 0,
+                "first_seen": now,
+            }
+            self._window[fingerprint] = entry
+            # window 내 첫 발생만 콘솔에 출력
+            logger.error("ERROR [%s] %s %s %s: %s", fingerprint, status_code, method, path, message[:500])
+
+        entry["count"] += 1
+        entry["last_seen"] = now
+
+        if entry["samples"] < self.samples_per_window:
+            entry["samples"] += 1
+            self.sample_writer.enqueue({
+                "fingerprint": fingerprint,
+                "path": path,
+                "method": method,
+                "status_code": status_code,
+                "error_type": error_type,
+                "error_message": message[:2000],
+                "headers": {key: value for key, value in (headers or {}).items() if key.lower() in SAMPLE_HEADERS},
+                "timestamp": now,
+            })
+
+        total = self._totals.get(fingerprint)
+        if total is None:
+            total = {key: entry[key] for key in ("fingerprint", "path", "method", "status_code",
+                                                 "error_type", "message_template", "example_message")}
+            total.update(count=0, first_seen=now)
+            self._totals[fingerprint] = total
+            while len(self._totals) > self.max_fingerprints:
+                self._totals.popitem(last=False)
+        total["count"] += 1
+        total["last_seen"] = now
+        self._totals.move_to_end(fingerprint)
+        return fingerprint
+
+    def rotate(self):
+        """현재 window 요약을 적재 큐에 넣고 새 window 시작"""
+        window, self._window = self._window, {}
+        started, self._window_started = self._window_started, datetime.now(timezone.utc)
+        for entry in window.values():
+            summary = {key: value for key, value in entry.items() if key != "samples"}
+            summary.update(window_start=started, window_end=self._window_started, sampled=entry["samples"])
+            self.summary_writer.enqueue(summary)
+            if entry["count"] > 1:
+                logger.error(
+                    "ERROR [%s] %s %s %s x%d (%.0fs)",
+                    entry["fingerprint"], entry["status_code"], entry["method"], entry["path"],
+                    entry["count"], self.window_seconds,
+                )
+
+    def top_errors(self, limit: int = 20) -> List[dict]:
+        """현재 window + 누적 건수 기준 상위 에러"""
+        result = []
+        for fingerprint, total in self._totals.items():
+            current = self._window.get(fingerprint)
+            result.append({**total, "window_count": current["count"] if current else 0})
+        result.sort(key=lambda item: (item["window_count"], item["count"]), reverse=True)
+        return result[:limit]
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.window_seconds)
+            self.rotate()
+
+    async def start(self):
+        await self.sample_writer.start()
+        await self.summary_writer.start()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="error-recorder")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # 진행 중이던 window 요약까지 저장
+        self.rotate()
+        await self.sample_writer.stop()
+        await self.summary_writer.stop()
+
+
+error_recorder = ErrorRecorder(
+    window_seconds=settings.ERROR_WINDOW_SECONDS,
+    samples_per_window=settings.ERROR_SAMPLES_PER_WINDOW,
+    max_fingerprints=settings.ERROR_MAX_FINGERPRINTS,
+)
@@ -1,29 +1,95 @@
-from typing import Dict
-from app.db.session import get_database
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional
+
+from cachetools import TTLCache
+from pymongo.errors import OperationFailure
+
+from app.core.config import settings
+from app.db.session import get_analytics_database
+from app.analytics.metrics_rollup import DAY_COLLECTION, ROLLUP_TIMEZONE
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# /bi/api/metrics/* 응답 캐시 (days 구간별)
+_metrics_cache: TTLCache = TTLCache(maxsize=128, ttl=settings.BI_METRICS_CACHE_SECONDS)
+_metrics_locks: Dict[Hashable, asyncio.Lock] = {}
+
+# 퍼널 단계별 경로
+FUNNEL_PATHS = {
+    "/auth/login": "visitors",
+    "/payments/ready": "reservation_attempts",
+    "/payments/approve": "reservation_completed",
+}
+
+
+async def get_cached_metrics(key: Hashable, loader: Callable[[], Awaitable]):
+    """key 기준으로 결과를 캐시, 동시에 들어온 요청은 한번만 집계"""
+    if key in _metrics_cache:
+        return _metrics_cache[key]
+
+    lock = _metrics_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        if key in _metrics_cache:
+            return _metrics_cache[key]
+        value = await loader()
+        _metrics_cache[key] = value
+        return value
+
+
+def _rate(numerator: int, denominator: int) -> float:
+    return numerator / denominator if denominator > 0 else 0
+
+
+# $percentile 은 MongoDB 7.0+ (미지원 서버면 첫 호출에서 False로 바뀌고 이후 히스토그램 방식 사용)
+_percentile_supported: Optional[bool] = None
+# unknown group operator
+UNKNOWN_GROUP_OPERATOR = 15952
+PERCENTILES = (0.5, 0.95, 0.99)
+
+
+def _histogram_percentiles(histogram: List[dict], count: int) -> List[float]:
+    """[{ms: 정수 ms, count}] (ms 오름차순) -> PERCENTILES 값 (1ms 해상도)"""
+    result = []
+    for quantile in PERCENTILES:
+        rank = max(int(quantile * count + 0.999999), 1)
+        cumulative = 0
+        value = histogram[-1]["ms"] if histogram else None
+        for bucket in histogram:
+            cumulative += bucket["count"]
+            if cumulative >= rank:
+                value = bucket["ms"]
+                break
+        result.append(value)
+    return result
 
 class MetricsAnalyzer:
     def __init__(self):
-        self.db = get_database()
+        # 조회 전용: 예약 / 결제 요청과 다른 커넥션 풀, secondary 우선
+        self.db = get_analytics_database()
 
+    # 원본 metrics 대신 일 단위 rollup(metrics_rollup_day)을 읽어 이력이 쌓여도 조회 비용이 일정함
     async def get_reservation_stats(self) -> Dict:
         pipeline = [
             {
                 "$match": {
-                    "request_details.cookies.email": {"$exists": True}
+                    "_id.email": {"$ne": None}
                 }
             },
             {
                 "$project": {
-                    "email": "$request_details.cookies.email",
+                    "email": "$_id.email",
                     "isVisitor": {
                         "$cond": [
                             {
                                 "$and": [
-                                    {"$eq": ["$path", "/auth/login"]},
-                                    {"$eq": ["$business_metrics.is_success", True]}
+                                    {"$eq": ["$_id.path", "/auth/login"]},
+                                    {"$eq": ["$_id.status_class", "2xx"]}
                                 ]
                             },
-                            1,
+                            "$count",
                             0
                         ]
                     },
@@ -31,11 +97,11 @@ class MetricsAnalyzer:
                         "$cond": [
                             {
                                 "$and": [
-                                    {"$eq": ["$path", "/payments/ready"]},
-                                    {"$eq": ["$business_metrics.is_success", True]}
+                                    {"$eq": ["$_id.path", "/payments/ready"]},
+                                    {"$eq": ["$_id.status_class", "2xx"]}
                                 ]
                             },
-                            1,
+                            "$count",
                             0
                         ]
                     },
@@ -43,11 +109,11 @@ class MetricsAnalyzer:
                         "$cond": [
                             {
                                 "$and": [
-                                    {"$eq": ["$path", "/payments/approve"]},
-                                    {"$eq": ["$business_metrics.is_success", True]}
+                                    {"$eq": ["$_id.path", "/payments/approve"]},
+                                    {"$eq": ["$_id.status_class", "2xx"]}
                                 ]
                             },
-                            1,
+                            "$count",
                             0
                         ]
                     }
@@ -62,7 +128,7 @@ class MetricsAnalyzer:
                 }
             }
         ]
-        results = await self.db["metrics"].aggregate(pipeline).to_list(None)
+        results = await self.db[DAY_COLLECTION].aggregate(pipeline).to_list(None)
         overall = {
             "total_visitors": 0,
             "total_reservation_attempts": 0,
@@ -92,86 +158,49 @@ class MetricsAnalyzer:
     async def get_designer_stats(self) -> list:
         pipeline = [
             {
-                "$facet": {
-                    "views": [
-                        {
-                            "$match": {
-                                "endpoint_category": "designers",
-                                "path": { "$regex": "^/designers/([a-f0-9]+)$" }
-                            }
-                        },
-                        {
-                            "$addFields": {
-                                "designer_id": { "$arrayElemAt": [ { "$split": [ "$path", "/" ] }, 2 ] }
-                            }
-                        },
-                        {
-                            "$group": {
-                                "_id": "$designer_id",
-                                "viewCount": { "$sum": 1 }
-                            }
-                        }
-                    ],
-                    "reservations": [
-                        {
-                            "$match": {
-                                "endpoint_category": "reservation",
-                                "path": "/reservation/create",
-                                "status_code": 200
-                            }
-                        },
-                        {
-                            "$project": {
-                                "designer_id": "$request_details.body.designer_id"
-                            }
-                        },
-                        { "$match": { "designer_id": { "$ne": None } } },
-                        {
-                            "$group": {
-                                "_id": "$designer_id",
-                                "reservationCount": { "$sum": 1 }
-                            }
-                        }
-                    ]
+                "$match": {
+                    "_id.designer_id": {"$ne": None}
                 }
             },
             {
-                "$project": {
-                    "combined": {
-                        "$map": {
-                            "input": "$views",
-                            "as": "v",
-                            "in": {
-                                "designer_id": "$$v._id",
-                                "viewCount": "$$v.viewCount",
-                                "reservationCount": {
-                                    "$reduce": {
-                                        "input": {
-                                            "$filter": {
-                                                "input": "$reservations",
-                                                "as": "r",
-                                                "cond": { "$eq": [ "$$r._id", "$$v._id" ] }
-                                            }
-                                        },
-                                        "initialValue": 0,
-                                        "in": { "$add": [ "$$value", "$$this.reservationCount" ] }
-                                    }
-                                }
-                            }
+                "$group": {
+                    "_id": "$_id.designer_id",
+                    "viewCount": {
+                        "$sum": {
+                            "$cond": [
+                                {"$regexMatch": {"input": "$_id.path", "regex": "^/designers/"}},
+                                "$count",
+                                0
+                            ]
+                        }
+                    },
+                    "reservationCount": {
+                        "$sum": {
+                            "$cond": [
+                                {
+                                    "$and": [
+                                        {"$eq": ["$_id.path", "/reservation/create"]},
+                                        {"$eq": ["$_id.status_class", "2xx"]}
+                                    ]
+                                },
+                                "$count",
+                                0
+                            ]
                         }
                     }
                 }
             },
-            { "$unwind": "$combined" },
+            # 상세 조회가 있었던 디자이너만 대상
+            { "$match": { "viewCount": { "$gt": 0 } } },
             {
                 "$project": {
-                    "designer_id": "$combined.designer_id",
-                    "viewCount": "$combined.viewCount",
-                    "reservationCount": "$combined.reservationCount",
+                    "designer_id": "$_id",
+                    "viewCount": 1,
+                    "reservationCount": 1,
                     "reservationRate": {
                         "$cond": [
-                            { "$gt": [ "$combined.viewCount", 0 ] },
-                            { "$multiply": [ { "$divide": [ "$combined.reservationCount", "$combined.viewCount" ] }, 100 ] },
+                            { "$gt": [ "$viewCount", 0 ] },
+                            { "$multiply": [ { "$divide": [ "$reservationCount", "$viewCount" ] }, 100 ] },
                             0
                         ]
                     }
@@ -180,7 +209,7 @@ class MetricsAnalyzer:
             {
                 "$lookup": {
                     "from": "designers",
-                    "let": { "designerId": { "$toObjectId": "$designer_id" } },
+                    "let": { "designerId": { "$convert": { "input": "$designer_id", "to": "objectId", "onError": None, "onNull": None } } },
                     "pipeline": [
                         { "$match": { "$expr": { "$eq": [ "$_id", "$$designerId" ] } } },
                         { "$project": { "name": 1, "_id": 0 } }
@@ -202,5 +231,221 @@ class MetricsAnalyzer:
                 }
             }
         ]
-        result = await self.db["metrics"].aggregate(pipeline).to_list(None)
-        return result
\ No newline at end of file
+        result = await self.db[DAY_COLLECTION].aggregate(pipeline).to_list(None)
+        return result
+
+    # 아래 집계는 모두 timestamp 범위 $match로 시작 (metrics.timestamp 인덱스 사용)
+    async def get_overall_stats(self, days: int = 30) -> Dict:
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        pipeline = [
+            {"$match": {"timestamp": {"$gte": since}}},
+            {
+                "$group": {
+                    "_id": "$request_details.cookies.email",
+                    "requests": {"$sum": 1},
+                    "errors": {"$sum": {"$cond": ["$business_metrics.is_error", 1, 0]}},
+                    "total_time_ms": {"$sum": "$process_time_ms"},
+                }
+            },
+            {
+                "$group": {
+                    "_id": None,
+                    "total_requests": {"$sum": "$requests"},
+                    "unique_users": {"$sum": {"$cond": [{"$ne": ["$_id", None]}, 1, 0]}},
+                    "error_count": {"$sum": "$errors"},
+                    "total_time_ms": {"$sum": "$total_time_ms"},
+                }
+            },
+        ]
+        results = await self.db["metrics"].aggregate(pipeline).to_list(None)
+        doc = results[0] if results else {}
+        total_requests = doc.get("total_requests", 0)
+        return {
+            "days": days,
+            "total_requests": total_requests,
+            "unique_users": doc.get("unique_users", 0),
+            "error_count": doc.get("error_count", 0),
+            "error_rate": _rate(doc.get("error_count", 0), total_requests),
+            "avg_process_time_ms": round(_rate(doc.get("total_time_ms", 0), total_requests), 2),
+        }
+
+    async def get_conversion_rates(self, start_date: datetime, end_date: datetime) -> Dict:
+        pipeline = [
+            {
+                "$match": {
+                    "timestamp": {"$gte": start_date, "$lt": end_date},
+                    "path": {"$in": list(FUNNEL_PATHS)},
+                    "business_metrics.is_success": True,
+                }
+            },
+            {
+                "$group": {
+                    "_id": {
+                        "date": {"$dateToString": {"date": "$timestamp", "format": "%Y-%m-%d", "timezone": ROLLUP_TIMEZONE}},
+                        "path": "$path",
+                    },
+                    "count": {"$sum": 1},
+                }
+            },
+        ]
+        results = await self.db["metrics"].aggregate(pipeline).to_list(None)
+
+        totals = {stage: 0 for stage in FUNNEL_PATHS.values()}
+        daily: Dict[str, Dict] = {}
+        for doc in results:
+            stage = FUNNEL_PATHS[doc["_id"]["path"]]
+            date = doc["_id"]["date"]
+            totals[stage] += doc["count"]
+            day = daily.setdefault(date, {"date": date, **{key: 0 for key in FUNNEL_PATHS.values()}})
+            day[stage] += doc["count"]
+
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            **totals,
+            "attempt_rate": _rate(totals["reservation_attempts"], totals["visitors"]),
+            "conversion_rate": _rate(totals["reservation_completed"], totals["visitors"]),
+            "daily": [daily[date] for date in sorted(daily)],
+        }
+
+    async def get_user_retention(self, days: int = 30) -> Dict:
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        pipeline = [
+            {
+                "$match": {
+                    "timestamp": {"$gte": since},
+                    "request_details.cookies.email": {"$exists": True},
+                }
+            },
+            # 사용자별 활동일
+            {
+                "$group": {
+                    "_id": {
+                        "email": "$request_details.cookies.email",
+                        "date": {"$dateToString": {"date": "$timestamp", "format": "%Y-%m-%d", "timezone": ROLLUP_TIMEZONE}},
+                    }
+                }
+            },
+            {
+                "$facet": {
+                    "users": [
+                        {"$group": {"_id": "$_id.email", "active_days": {"$sum": 1}}},
+                        {
+                            "$group": {
+                                "_id": None,
+                                "total_users": {"$sum": 1},
+                                "returning_users": {"$sum": {"$cond": [{"$gte": ["$active_days", 2]}, 1, 0]}},
+                                "total_active_days": {"$sum": "$active_days"},
+                            }
+                        },
+                    ],
+                    "daily_active_users": [
+                        {"$group": {"_id": "$_id.date", "users": {"$sum": 1}}},
+                        {"$sort": {"_id": 1}},
+                    ],
+                }
+            },
+        ]
+        results = await self.db["metrics"].aggregate(pipeline).to_list(None)
+        facet = results[0] if results else {"users": [], "daily_active_users": []}
+        users = facet["users"][0] if facet["users"] else {}
+        total_users = users.get("total_users", 0)
+        return {
+            "days": days,
+            "total_users": total_users,
+            "returning_users": users.get("returning_users", 0),
+            "retention_rate": _rate(users.get("returning_users", 0), total_users),
+            "avg_active_days": round(_rate(users.get("total_active_days", 0), total_users), 2),
+            "daily_active_users": [
+                {"date": doc["_id"], "users": doc["users"]} for doc in facet["daily_active_users"]
+            ],
+        }
+
+    async def get_performance_metrics(self, days: int = 7) -> list:
+        global _percentile_supported
+        since = datetime.now(timezone.utc) - timedelta(days=days)
+        if _percentile_supported is not False:
+            try:
+                results = await self._performance_with_percentile(since)
+                _percentile_supported = True
+            except OperationFailure as e:
+                if e.code != UNKNOWN_GROUP_OPERATOR and "$percentile" not in str(e):
+                    raise
+                logger.warning("MongoDB 7.0 미만: $percentile 미지원, ms 단위 히스토그램으로 백분위수 계산")
+                _percentile_supported = False
+        if _percentile_supported is False:
+            results = await self._performance_with_histogram(since)
+
+        return [
+            {
+                "endpoint_category": doc["_id"],
+                "request_count": doc["request_count"],
+                "error_rate": _rate(doc["error_count"], doc["request_count"]),
+                "avg_time_ms": round(doc.get("avg_time_ms") or 0, 2),
+                "max_time_ms": doc.get("max_time_ms"),
+                "p50_ms": doc["percentiles"][0],
+                "p95_ms": doc["percentiles"][1],
+                "p99_ms": doc["percentiles"][2],
+            }
+            for doc in results
+        ]
+
+    async def _performance_with_percentile(self, since: datetime) -> list:
+        pipeline = [
+            {"$match": {"timestamp": {"$gte": since}}},
+            {
+                "$group": {
+                    "_id": "$endpoint_category",
+                    "request_count": {"$sum": 1},
+                    "error_count": {"$sum": {"$cond": ["$business_metrics.is_error", 1, 0]}},
+                    "avg_time_ms": {"$avg": "$process_time_ms"},
+                    "max_time_ms": {"$max": "$process_time_ms"},
+                    # MongoDB 7.0+ 근사 백분위수
+                    "percentiles": {
+                        "$percentile": {
+                            "input": "$process_time_ms",
+                            "p": list(PERCENTILES),
+                            "method": "approximate",
+                        }
+                    },
+                }
+            },
+            {"$sort": {"request_count": -1}},
+        ]
+        return await self.db["metrics"].aggregate(pipeline).to_list(None)
+
+    async def _performance_with_histogram(self, since: datetime) -> list:
+        """MongoDB 7.0 미만: 카테고리별 ms 단위 개수를 모아서 백분위수 계산
+
+        요청 시간을 배열로 모으면($push) 요청 수에 비례해 16MB 문서 제한에 걸리므로
+        (카테고리, 정수 ms) 개수만 집계한다. 결과 크기는 서로 다른 ms 값 수에 비례한다.
+        """
+        pipeline = [
+            {"$match": {"timestamp": {"$gte": since}}},
+            {
+                "$group": {
+                    "_id": {"category": "$endpoint_category", "ms": {"$floor": "$process_time_ms"}},
+                    "count": {"$sum": 1},
+                    "error_count": {"$sum": {"$cond": ["$business_metrics.is_error", 1, 0]}},
+                    "total_time_ms": {"$sum": "$process_time_ms"},
+                    "max_time_ms": {"$max": "$process_time_ms"},
+                }
+            },
+            {"$sort": {"_id.category": 1, "_id.ms": 1}},
+            {
+                "$group": {
+                    "_id": "$_id.category",
+                    "request_count": {"$sum": "$count"},
+                    "error_count": {"$sum": "$error_count"},
+                    "total_time_ms": {"$sum": "$total_time_ms"},
+                    "max_time_ms": {"$max": "$max_time_ms"},
+                    "histogram": {"$push": {"ms": "$_id.ms", "count": "$count"}},
+                }
+            },
+            {"$sort": {"request_count": -1}},
+        ]
+        results = await self.db["metrics"].aggregate(pipeline, allowDiskUse=True).to_list(None)
+        for doc in results:
+            doc["avg_time_ms"] = _rate(doc["total_time_ms"], doc["request_count"])
+            doc["percentiles"] = _histogram_percentiles(doc.pop("histogram"), doc["request_count"])
+        return results
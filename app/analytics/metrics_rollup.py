@@ -0,0 +1,177 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.db.session import get_database
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 원본 metrics 컬렉션을 분/시간/일 단위로 미리 집계해두는 컬렉션
+# _id = {bucket, email, path, designer_id, status_class}
+MINUTE_COLLECTION = "metrics_rollup_minute"
+HOUR_COLLECTION = "metrics_rollup_hour"
+DAY_COLLECTION = "metrics_rollup_day"
+STATE_COLLECTION = "metrics_rollup_state"
+
+ROLLUP_TIMEZONE = "Asia/Seoul"
+KST_OFFSET = timedelta(hours=9)
+
+# 배치 적재 지연을 고려해 현재 시각보다 LAG 만큼 이전 분까지만 집계
+ROLLUP_LAG = timedelta(minutes=2)
+# 한번에 집계하는 최대 구간 (최초 실행 시 과거 데이터를 나눠서 처리)
+ROLLUP_MAX_WINDOW = timedelta(hours=6)
+# watermark 이전 구간도 매번 다시 집계 (BatchWriter가 늦게 flush한 메트릭스 반영, 최소 flush 주기)
+ROLLUP_OVERLAP = timedelta(seconds=max(settings.METRICS_ROLLUP_OVERLAP_SECONDS, settings.METRICS_FLUSH_INTERVAL_SECONDS))
+
+DESIGNER_DETAIL_PATH_REGEX = "^/designers/[a-f0-9]+$"
+
+
+def _floor_minute(dt: datetime) -> datetime:
+    return dt.replace(second=0, microsecond=0)
+
+
+def _as_utc(dt: datetime) -> datetime:
+    # motor는 tz 정보가 없는 UTC datetime을 반환함
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def _minute_pipeline(start: datetime, end: datetime) -> list:
+    """원본 metrics -> 분 단위 rollup"""
+    return [
+        {"$match": {"timestamp": {"$gte": start, "$lt": end}}},
+        {
+            "$project": {
+                "bucket": {"$dateTrunc": {"date": "$timestamp", "unit": "minute"}},
+                "email": {"$ifNull": ["$request_details.cookies.email", None]},
+                "path": 1,
+                "designer_id": {
+                    "$switch": {
+                        "branches": [
+                            {
+                                "case": {"$eq": ["$path", "/reservation/create"]},
+                                "then": {"$ifNull": ["$request_details.body.designer_id", None]},
+                            },
+                            {
+                                "case": {"$regexMatch": {"input": "$path", "regex": DESIGNER_DETAIL_PATH_REGEX}},
+                                "then": {"$arrayElemAt": [{"$split": ["$path", "/"]}, 2]},
+                            },
+                        ],
+                        "default": None,
+                    }
+                },
+                "status_class": {
+                    "$concat": [
+                        {"$toString": {"$floor": {"$divide": ["$status_code", 100]}}},
+                        "xx",
+                    ]
+                },
+                "process_time_ms": 1,
+            }
+        },
+        {
+            "$group": {
+                "_id": {
+                    "bucket": "$bucket",
+                    "email": "$email",
+                    "path": "$path",
+                    "designer_id": "$designer_id",
+                    "status_class": "$status_class",
+                },
+                "count": {"$sum": 1},
+                "total_time_ms": {"$sum": "$process_time_ms"},
+                "max_time_ms": {"$max": "$process_time_ms"},
+            }
+        },
+        # bucket: TTL 인덱스용 최상위 필드 (_id 하위 필드에는 TTL 불가)
+        {"$set": {"bucket": "$_id.bucket"}},
+        {"$merge": {"into": MINUTE_COLLECTION, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+
+def _reroll_pipeline(start: datetime, end: datetime, unit: str, target: str) -> list:
+    """하위 rollup -> 상위 rollup (해당 구간을 다시 계산해서 replace 하므로 재실행해도 안전)"""
+    return [
+        {"$match": {"_id.bucket": {"$gte": start, "$lt": end}}},
+        {
+            "$group": {
+                "_id": {
+                    "bucket": {"$dateTrunc": {"date": "$_id.bucket", "unit": unit, "timezone": ROLLUP_TIMEZONE}},
+                    "email": "$_id.email",
+                    "path": "$_id.path",
+                    "designer_id": "$_id.designer_id",
+                    "status_class": "$_id.status_class",
+                },
+                "count": {"$sum": "$count"},
+                "total_time_ms": {"$sum": "$total_time_ms"},
+                "max_time_ms": {"$max": "$max_time_ms"},
+            }
+        },
+        {"$set": {"bucket": "$_id.bucket"}},
+        {"$merge": {"into": target, "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+
+async def _get_watermark(db) -> Optional[datetime]:
+    state = await db[STATE_COLLECTION].find_one({"_id": "metrics"})
+    if state:
+        return _as_utc(state["watermark"])
+
+    # 최초 실행: 가장 오래된 메트릭스부터 시작
+    first = await db["metrics"].find_one(
+        {"timestamp": {"$type": "date"}},
+        {"timestamp": 1},
+        sort=[("timestamp", 1)],
+    )
+    if not first:
+        return None
+    return _floor_minute(_as_utc(first["timestamp"]))
+
+
+async def rollup_window(start: datetime, end: datetime):
+    """[start, end) 구간의 분/시간/일 rollup 갱신"""
+    db = get_database()
+
+    await db["metrics"].aggregate(_minute_pipeline(start, end)).to_list(None)
+
+    # 영향을 받은 시간/일 구간 전체를 하위 rollup에서 다시 계산
+    hour_start = start.replace(minute=0)
+    hour_end = end.replace(minute=0) + timedelta(hours=1)
+    await db[MINUTE_COLLECTION].aggregate(
+        _reroll_pipeline(hour_start, hour_end, "hour", HOUR_COLLECTION)
+    ).to_list(None)
+
+    # 일 단위는 KST 자정 기준
+    day_start = (start + KST_OFFSET).replace(hour=0, minute=0) - KST_OFFSET
+    day_end = (end + KST_OFFSET).replace(hour=0, minute=0) - KST_OFFSET + timedelta(days=1)
+    await db[HOUR_COLLECTION].aggregate(
+        _reroll_pipeline(day_start, day_end, "day", DAY_COLLECTION)
+    ).to_list(None)
+
+
+async def rollup_metrics():
+    """watermark 이후 완료된 분 구간을 rollup에 반영하고 watermark 전진"""
+    db = get_database()
+
+    watermark = await _get_watermark(db)
+    upper = _floor_minute(datetime.now(timezone.utc) - ROLLUP_LAG)
+    if watermark is None:
+        # 아직 집계할 메트릭스가 없음
+        await db[STATE_COLLECTION].update_one(
+            {"_id": "metrics"}, {"$set": {"watermark": upper}}, upsert=True
+        )
+        return
+
+    # 분 rollup은 해당 분 전체를 원본에서 다시 계산해 replace 하므로 겹쳐서 집계해도 안전
+    window_start = _floor_minute(watermark - ROLLUP_OVERLAP)
+    while watermark < upper:
+        window_end = min(upper, watermark + ROLLUP_MAX_WINDOW)
+        await rollup_window(window_start, window_end)
+        await db[STATE_COLLECTION].update_one(
+            {"_id": "metrics"},
+            {"$set": {"watermark": window_end, "updated_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+        logger.info("metrics rollup: %s ~ %s", watermark.isoformat(), window_end.isoformat())
+        watermark = window_start = window_end
@@ -0,0 +1,430 @@
+import asyncio
+import copy
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 쿼리 shape 단위로 집계하는 명령 (hello / ping / createIndexes / explain 등 관리 명령은 제외)
+PROFILED_COMMANDS = ("find", "aggregate", "count", "distinct", "findAndModify", "update", "delete", "insert")
+# 같은 필터로 find explain 이 가능한 명령 (쓰기 명령도 실제 쓰기 없이 필터만 평가)
+EXPLAINABLE_COMMANDS = ("find", "aggregate", "count", "distinct", "findAndModify", "update", "delete")
+
+# 지연 시간 버킷 (ms, 마지막은 +Inf)
+LATENCY_BUCKETS_MS = (1, 2, 3, 5, 7.5, 10, 15, 25, 35, 50, 75, 100, 150, 200, 300, 500, 750, 1000, 2500, 5000, 10000)
+
+# getMore 를 원래 find / aggregate shape 로 묶기 위해 기억하는 커서 수
+MAX_TRACKED_CURSORS = 10000
+
+# 명령을 보낸 클라이언트 (app.db.session event_listeners 의 client_name), explain 도 같은 쪽으로 보냄
+MAIN_CLIENT = "main"
+ANALYTICS_CLIENT = "analytics"
+
+
+def _issuer(client_name: str, command: Mapping) -> str:
+    """secondary 등 primary 외 read preference 로 보낸 명령은 분석용 DB(get_analytics_database)에서 explain"""
+    read_preference = command.get("$readPreference")
+    if isinstance(read_preference, Mapping) and read_preference.get("mode", "primary") != "primary":
+        return ANALYTICS_CLIENT
+    return client_name
+
+
+def _filter_shape(filter_doc) -> str:
+    """필터 값은 버리고 키 + 연산자만 남김 ({created_at:$gte,$lt, status})"""
+    if not isinstance(filter_doc, Mapping):
+        return "{}"
+    parts = []
+    for key, value in filter_doc.items():
+        if key in ("$and", "$or", "$nor") and isinstance(value, list):
+            branches = sorted({_filter_shape(branch) for branch in value})
+            parts.append(f"{key}[{' | '.join(branches)}]")
+        elif key.startswith("$"):
+            # $expr, $text 등
+            parts.append(key)
+        elif isinstance(value, Mapping) and value and all(str(op).startswith("$") for op in value):
+            parts.append(f"{key}:{','.join(sorted(value))}")
+        else:
+            parts.append(key)
+    return "{" + ", ".join(sorted(parts)) + "}"
+
+
+def _sort_shape(sort_doc) -> str:
+    if not isinstance(sort_doc, Mapping) or not sort_doc:
+        return ""
+    return "{" + ", ".join(f"{key}:{direction}" for key, direction in sort_doc.items()) + "}"
+
+
+def query_shape(command_name: str, command: Mapping) -> Optional[dict]:
+    """명령 -> shape (collection + 필터 키 + 정렬), 집계 대상이 아니면 None
+
+    explain 용 샘플(필터 / 정렬 / limit 원본 값)도 함께 반환하며, 샘플은 API 응답에 노출하지 않는다.
+    """
+    if command_name not in PROFILED_COMMANDS:
+        return None
+    collection = command.get(command_name)
+    if not isinstance(collection, str):
+        return None
+
+    filter_doc, sort_doc, limit, stages = None, None, None, None
+    if command_name == "find":
+        filter_doc, sort_doc, limit = command.get("filter"), command.get("sort"), command.get("limit")
+    elif command_name in ("count", "distinct", "findAndModify"):
+        filter_doc, sort_doc = command.get("query"), command.get("sort")
+    elif command_name == "update":
+        updates = command.get("updates") or [{}]
+        filter_doc = updates[0].get("q")
+    elif command_name == "delete":
+        deletes = command.get("deletes") or [{}]
+        filter_doc = deletes[0].get("q")
+    elif command_name == "aggregate":
+        pipeline = command.get("pipeline") or []
+        stages = [next(iter(stage), "") for stage in pipeline if isinstance(stage, Mapping)]
+        if pipeline and isinstance(pipeline[0], Mapping) and "$match" in pipeline[0]:
+            filter_doc = pipeline[0]["$match"]
+        sort_stage = next((stage for stage in pipeline if isinstance(stage, Mapping) and "$sort" in stage), None)
+        if sort_stage is not None:
+            sort_doc = sort_stage["$sort"]
+
+    key = f"{command_name} {collection} filter{_filter_shape(filter_doc)}"
+    if sort_doc:
+        key += f" sort{_sort_shape(sort_doc)}"
+    if stages:
+        key += f" pipeline[{','.join(stages)}]"
+    return {
+        "key": key,
+        "collection": collection,
+        "command": command_name,
+        "filter": _filter_shape(filter_doc),
+        "sort": _sort_shape(sort_doc),
+        "pipeline": stages,
+        "sample": {"filter": filter_doc or {}, "sort": sort_doc, "limit": limit},
+    }
+
+
+def _returned(command_name: str, reply: Mapping) -> int:
+    """응답 문서 수 (find / aggregate / getMore 는 batch 크기, count / update / delete 는 n)"""
+    cursor = reply.get("cursor")
+    if isinstance(cursor, Mapping):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    if command_name == "distinct":
+        return len(reply.get("values") or [])
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") else 0
+    return int(reply.get("n", 0) or 0)
+
+
+def _plan_summary(plan, stages: set, indexes: set):
+    """explain winningPlan 에서 stage / 인덱스 이름 수집 (classic / SBE 구조 모두 재귀 탐색)"""
+    if isinstance(plan, Mapping):
+        if "stage" in plan:
+            stages.add(plan["stage"])
+        if "indexName" in plan:
+            indexes.add(plan["indexName"])
+        for value in plan.values():
+            _plan_summary(value, stages, indexes)
+    elif isinstance(plan, list):
+        for item in plan:
+            _plan_summary(item, stages, indexes)
+
+
+class QueryProfiler:
+    """pymongo command monitoring 기반 쿼리 shape 프로파일러 (서버 profiler 없이 운영에서 사용)
+
+    repository / service / scheduler / MetricsAnalyzer 가 보내는 모든 명령을 shape 로 묶어
+    지연 시간 히스토그램(p50 / p95 / p99 추정), 호출 / 에러 / 반환 문서 수를 프로세스 메모리에 누적한다.
+    command monitoring 에는 검사한 문서 수가 없으므로 p95 가 explain_threshold_ms 이상인 shape 만
+    백그라운드에서 explain(executionStats) 해서 docs examined / returned 비율과 COLLSCAN 여부를 기록한다.
+    explain 은 shape 를 보낸 클라이언트 / read preference 쪽 DB로 보내고 (BI 집계는 분석용 DB),
+    aggregate shape 는 전체 스캔이 될 수 있으므로 실행 없이 플랜(queryPlanner)만 확인한다.
+    같은 shape 는 explain_interval 동안 다시 explain 하지 않는다.
+    """
+
+    def __init__(self, max_shapes: int, explain_threshold_ms: float, explain_interval: float,
+                 examined_ratio: float, min_examined: int):
+        self.max_shapes = max_shapes
+        self.explain_threshold_ms = explain_threshold_ms
+        self.explain_interval = explain_interval
+        self.examined_ratio = examined_ratio
+        self.min_examined = min_examined
+        self.started_at = datetime.now(timezone.utc)
+        self.dropped_shapes = 0
+
+        self._shapes: Dict[str, dict] = {}
+        # (request_id, connection_id) -> (shape key, getMore 커서 id) (started ~ succeeded / failed 사이)
+        self._inflight: Dict[Tuple[int, object], Tuple[str, Optional[int]]] = {}
+        # cursor id -> shape key (getMore 집계용)
+        self._cursors: "OrderedDict[int, str]" = OrderedDict()
+        # Motor 실행 스레드들에서 동시에 호출됨
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    # --- command listener 에서 호출 (I/O 없음) ---
+
+    def started(self, event, client_name: str = MAIN_CLIENT):
+        command_name = event.command_name
+        if command_name == "getMore":
+            cursor_id = event.command.get("getMore")
+            with self._lock:
+                key = self._cursors.get(cursor_id)
+            if key is not None:
+                self._inflight[(event.request_id, event.connection_id)] = (key, cursor_id)
+            return
+
+        shape = query_shape(command_name, event.command)
+        if shape is None:
+            return
+        key = shape["key"]
+        issuer = _issuer(client_name, event.command)
+        with self._lock:
+            entry = self._shapes.get(key)
+            if entry is None:
+                if len(self._shapes) >= self.max_shapes:
+                    self.dropped_shapes += 1
+                    return
+                entry = {
+                    "shape": key,
+                    "collection": shape["collection"],
+                    "command": shape["command"],
+                    "filter": shape["filter"],
+                    "sort": shape["sort"],
+                    "pipeline": shape["pipeline"],
+                    "client": issuer,
+                    "count": 0,
+                    "errors": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                    "returned": 0,
+                    "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                    "first_seen": datetime.now(timezone.utc),
+                    "sample": None,
+                    "explain": None,
+                    "explained_at": 0.0,
+                }
+                self._shapes[key] = entry
+            elif issuer == ANALYTICS_CLIENT:
+                # 양쪽에서 오는 shape 는 primary 부하를 피해 분석용 DB에서 explain
+                entry["client"] = ANALYTICS_CLIENT
+            if entry["sample"] is None and command_name in EXPLAINABLE_COMMANDS:
+                # explain 이 끝나면 비워서 다음 호출 값으로 갱신
+                entry["sample"] = copy.deepcopy(shape["sample"])
+        self._inflight[(event.request_id, event.connection_id)] = (key, None)
+
+    def succeeded(self, event):
+        inflight = self._inflight.pop((event.request_id, event.connection_id), None)
+        if inflight is None:
+            return
+        key, get_more_cursor = inflight
+        reply = event.reply or {}
+        cursor = reply.get("cursor")
+        with self._lock:
+            if isinstance(cursor, Mapping):
+                if cursor.get("id"):
+                    self._cursors[cursor["id"]] = key
+                    while len(self._cursors) > MAX_TRACKED_CURSORS:
+                        self._cursors.popitem(last=False)
+                elif get_more_cursor is not None:
+                    # 커서 소진
+                    self._cursors.pop(get_more_cursor, None)
+            self._observe(key, event.duration_micros / 1000, _returned(event.command_name, reply), error=False)
+
+    def failed(self, event):
+        inflight = self._inflight.pop((event.request_id, event.connection_id), None)
+        if inflight is None:
+            return
+        with self._lock:
+            self._observe(inflight[0], event.duration_micros / 1000, 0, error=True)
+
+    def _observe(self, key: str, elapsed_ms: float, returned: int, error: bool):
+        entry = self._shapes.get(key)
+        if entry is None:
+            return
+        entry["count"] += 1
+        entry["errors"] += error
+        entry["total_ms"] += elapsed_ms
+        entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+        entry["returned"] += returned
+        entry["buckets"][bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        entry["last_seen"] = datetime.now(timezone.utc)
+
+    # --- 조회 ---
+
+    @staticmethod
+    def _percentile(entry: dict, quantile: float) -> float:
+        """버킷 안에서 선형 보간한 추정치 (ms, 마지막 버킷 상한은 max_ms)"""
+        count = entry["count"]
+        if count == 0:
+            return 0.0
+        rank = quantile * count
+        cumulative = 0
+        lower = 0.0
+        for index, bucket_count in enumerate(entry["buckets"]):
+            upper = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else entry["max_ms"]
+            if bucket_count and cumulative + bucket_count >= rank:
+                estimate = lower + (upper - lower) * (rank - cumulative) / bucket_count
+                return round(min(estimate, entry["max_ms"]), 2)
+            cumulative += bucket_count
+            lower = upper
+        return round(entry["max_ms"], 2)
+
+    def _summary(self, entry: dict) -> dict:
+        count = entry["count"]
+        summary = {
+            key: entry[key] for key in ("shape", "collection", "command", "filter", "sort", "pipeline",
+                                        "client", "count", "errors", "returned", "first_seen")
+        }
+        summary.update(
+            last_seen=entry.get("last_seen"),
+            total_ms=round(entry["total_ms"], 2),
+            mean_ms=round(entry["total_ms"] / count, 2) if count else 0.0,
+            p50_ms=self._percentile(entry, 0.5),
+            p95_ms=self._percentile(entry, 0.95),
+            p99_ms=self._percentile(entry, 0.99),
+            max_ms=round(entry["max_ms"], 2),
+            explain=entry["explain"],
+            missing_index=bool(entry["explain"] and entry["explain"]["missing_index"]),
+        )
+        return summary
+
+    def top_queries(self, limit: int = 20, order: str = "total_ms") -> List[dict]:
+        """누적 시간(기본) / p95 / max / 검사 비율 기준 상위 shape"""
+        with self._lock:
+            summaries = [self._summary(entry) for entry in self._shapes.values() if entry["count"]]
+        if order == "examined_ratio":
+            summaries.sort(key=lambda item: (item["explain"] or {}).get("examined_ratio", 0), reverse=True)
+        else:
+            summaries.sort(key=lambda item: item[order], reverse=True)
+        return summaries[:limit]
+
+    # --- explain ---
+
+    def _due_for_explain(self) -> List[Tuple[str, dict]]:
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            for key, entry in self._shapes.items():
+                if entry["sample"] is None or now - entry["explained_at"] < self.explain_interval:
+                    continue
+                if entry["count"] and self._percentile(entry, 0.95) >= self.explain_threshold_ms:
+                    due.append((key, entry["sample"]))
+        return due
+
+    async def explain_slow_shapes(self, databases: Mapping) -> int:
+        """느린 shape 를 같은 필터 / 정렬의 find 로 explain (쓰기 명령도 실제 쓰기 없음)
+
+        databases: 클라이언트 이름 -> DB ({"main": get_database(), "analytics": get_analytics_database()})
+        """
+        explained = 0
+        for key, sample in self._due_for_explain():
+            entry = self._shapes[key]
+            db = databases.get(entry["client"]) or databases[MAIN_CLIENT]
+            command = {"find": entry["collection"], "filter": sample["filter"]}
+            if sample.get("sort"):
+                command["sort"] = sample["sort"]
+            if sample.get("limit"):
+                command["limit"] = sample["limit"]
+            # executionStats 는 쿼리를 끝까지 실행하므로 aggregate($match 뒤 단계 limit 없음)는 플랜만 확인
+            verbosity = "queryPlanner" if entry["command"] == "aggregate" else "executionStats"
+            try:
+                result = await db.command({"explain": command, "verbosity": verbosity})
+            except PyMongoError as e:
+                logger.warning("explain 실패 %s: %s", key, str(e))
+                result = None
+
+            explain = None
+            if result is not None:
+                stats = result.get("executionStats", {})
+                stages, indexes = set(), set()
+                _plan_summary(result.get("queryPlanner", {}).get("winningPlan", {}), stages, indexes)
+                examined = int(stats.get("totalDocsExamined", 0))
+                returned = int(stats.get("nReturned", 0))
+                ratio = round(examined / max(returned, 1), 2)
+                if verbosity == "queryPlanner":
+                    # 실행 통계 없음 -> COLLSCAN 여부로만 판단
+                    missing_index = "COLLSCAN" in stages
+                else:
+                    missing_index = examined >= self.min_examined and (
+                        "COLLSCAN" in stages or ratio >= self.examined_ratio)
+                explain = {
+                    "verbosity": verbosity,
+                    "docs_examined": examined,
+                    "keys_examined": int(stats.get("totalKeysExamined", 0)),
+                    "returned": returned,
+                    "examined_ratio": ratio,
+                    "collscan": "COLLSCAN" in stages,
+                    "indexes": sorted(indexes),
+                    "missing_index": missing_index,
+                    "explained_at": datetime.now(timezone.utc),
+                }
+                if explain["missing_index"]:
+                    logger.warning("인덱스 부족 의심 쿼리 %s (examined=%d, returned=%d)", key, examined, returned)
+                explained += 1
+
+            with self._lock:
+                if explain is not None:
+                    entry["explain"] = explain
+                entry["explained_at"] = time.monotonic()
+                entry["sample"] = None
+        return explained
+
+    async def _run(self):
+        # session 모듈이 이 모듈의 리스너를 import 하므로 지연 import
+        from app.db.session import get_analytics_database, get_database
+
+        databases = {MAIN_CLIENT: get_database(), ANALYTICS_CLIENT: get_analytics_database()}
+        while True:
+            await asyncio.sleep(settings.SLOW_QUERY_EXPLAIN_CHECK_SECONDS)
+            try:
+                await self.explain_slow_shapes(databases)
+            except Exception as e:
+                logger.error("쿼리 explain 실패: %s", str(e))
+
+    def start(self):
+        if self._task is None and settings.SLOW_QUERY_PROFILER_ENABLED:
+            self._task = asyncio.create_task(self._run(), name="query-profiler")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+class QueryProfilerListener(monitoring.CommandListener):
+    """MongoDB 명령 이벤트 -> query_profiler"""
+
+    def __init__(self, profiler: QueryProfiler, client_name: str = MAIN_CLIENT):
+        self.profiler = profiler
+        self.client_name = client_name
+
+    def started(self, event):
+        self.profiler.started(event, self.client_name)
+
+    def succeeded(self, event):
+        self.profiler.succeeded(event)
+
+    def failed(self, event):
+        self.profiler.failed(event)
+
+
+query_profiler = QueryProfiler(
+    max_shapes=settings.SLOW_QUERY_MAX_SHAPES,
+    explain_threshold_ms=settings.SLOW_QUERY_EXPLAIN_MS,
+    explain_interval=settings.SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS,
+    examined_ratio=settings.SLOW_QUERY_EXAMINED_RATIO,
+    min_examined=settings.SLOW_QUERY_MIN_EXAMINED,
+)
@@ -5,6 +5,7 @@ import logging
 from fastapi.responses import RedirectResponse
 from fastapi.responses import JSONResponse
 from app.core.config import settings
+from app.core.principal_cache import principal_cache
 from app.services.auth_service import (
     get_google_auth_url,
     get_google_access_token,
@@ -77,6 +78,8 @@ async def auth_callback(request: Request, response: Response):
             {"$set": update_data},
             upsert=True
         )
+        # 새 Google 토큰으로 다시 로드되도록 캐시 제거
+        principal_cache.invalidate(email=user_email)
 
         # 로그인 성공 후 프론트엔드로 리디렉트
         redirect_url = f"{FRONTEND_URL}/designer-list"
@@ -1,15 +1,26 @@
-from fastapi import APIRouter, Request, Query
+from fastapi import APIRouter, HTTPException, Request, Query
 from fastapi.responses import JSONResponse, HTMLResponse
 from fastapi.encoders import jsonable_encoder
 from fastapi.templating import Jinja2Templates
-from app.analytics.metrics_analyzer import MetricsAnalyzer
-from datetime import datetime, timedelta
+from app.analytics.metrics_analyzer import MetricsAnalyzer, get_cached_metrics
+from app.core.config import settings
+from app.analytics.error_recorder import error_recorder
+from app.analytics.query_profiler import query_profiler
+from datetime import datetime, timedelta, timezone
 import logging
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/templates")
 logger = logging.getLogger(__name__)
 
+def check_raw_metrics_days(days: int):
+    # 원본 metrics는 METRICS_TTL_DAYS 이후 삭제되므로 더 긴 구간은 일부 데이터만 집계됨
+    if settings.METRICS_TTL_DAYS and days > settings.METRICS_TTL_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"원본 메트릭스 보관 기간({settings.METRICS_TTL_DAYS}일)보다 긴 구간은 조회할 수 없습니다.",
+        )
+
 @router.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(request: Request):
     try:
@@ -39,31 +50,58 @@ async def dashboard(request: Request):
         )
 
 @router.get("/api/metrics/overall")
-async def overall_metrics():
+async def overall_metrics(days: int = Query(30, ge=1, le=365)):
+    check_raw_metrics_days(days)
     analyzer = MetricsAnalyzer()
-    data = await analyzer.get_overall_stats()
+    data = await get_cached_metrics(("overall", days), lambda: analyzer.get_overall_stats(days))
     logger.info(f"Sending overall_metrics data: {data}")
     return JSONResponse(content=jsonable_encoder(data))
 
 @router.get("/api/metrics/conversion")
-async def conversion_metrics(days: int = 30):
+async def conversion_metrics(days: int = Query(30, ge=1, le=365)):
+    check_raw_metrics_days(days)
     analyzer = MetricsAnalyzer()
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
-    data = await analyzer.get_conversion_rates(start_date, end_date)
+
+    async def load():
+        end_date = datetime.now(timezone.utc)
+        start_date = end_date - timedelta(days=days)
+        return await analyzer.get_conversion_rates(start_date, end_date)
+
+    data = await get_cached_metrics(("conversion", days), load)
     logger.info(f"Sending conversion_metrics data: {data}")
     return JSONResponse(content=jsonable_encoder(data))
 
 @router.get("/api/metrics/retention")
-async def retention_metrics(days: int = 30):
+async def retention_metrics(days: int = Query(30, ge=1, le=365)):
+    check_raw_metrics_days(days)
     analyzer = MetricsAnalyzer()
-    data = await analyzer.get_user_retention(days)
+    data = await get_cached_metrics(("retention", days), lambda: analyzer.get_user_retention(days))
     logger.info(f"Sending retention_metrics data: {data}")
     return JSONResponse(content=jsonable_encoder(data))
 
 @router.get("/api/metrics/performance")
-async def performance_metrics():
+async def performance_metrics(days: int = Query(7, ge=1, le=90)):
+    check_raw_metrics_days(days)
     analyzer = MetricsAnalyzer()
-    data = await analyzer.get_performance_metrics()
+    data = await get_cached_metrics(("performance", days), lambda: analyzer.get_performance_metrics(days))
     logger.info(f"Sending performance_metrics data: {data}")
     return JSONResponse(content=jsonable_encoder(data))
+
+@router.get("/api/errors/top")
+async def top_errors(limit: int = Query(20, ge=1, le=100)):
+    # 이 프로세스의 메모리 집계 (현재 window 건수, 누적 건수 순)
+    return JSONResponse(content=jsonable_encoder({
+        "window_seconds": error_recorder.window_seconds,
+        "dropped_fingerprints": error_recorder.dropped_fingerprints,
+        "errors": error_recorder.top_errors(limit),
+    }))
+
+@router.get("/api/slow-queries")
+async def slow_queries(limit: int = Query(20, ge=1, le=100),
+                       order: str = Query("total_ms", pattern="^(total_ms|p95_ms|max_ms|count|examined_ratio)$")):
+    # 이 프로세스의 메모리 집계 (쿼리 shape별 누적 시간 순, missing_index: explain 결과 인덱스 부족 의심)
+    return JSONResponse(content=jsonable_encoder({
+        "since": query_profiler.started_at,
+        "dropped_shapes": query_profiler.dropped_shapes,
+        "queries": query_profiler.top_queries(limit, order),
+    }))
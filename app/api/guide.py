@@ -1,22 +1,15 @@
-import os
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
+from app.core.page_cache import page_cache
 
 router = APIRouter()
 
-@router.get("/", response_class=HTMLResponse)
-async def guide():
-    # templates 폴더에서 guide.html 파일 경로 설정
-    html_path = os.path.join(os.getcwd(), "app", "templates", "guide.html")
-    
-    # HTML 파일이 존재하는지 확인
-    if os.path.exists(html_path):
-        with open(html_path, "r", encoding="utf-8") as f:
-            html_content = f.read()
-        return html_content
-    else:
-        # 파일이 없는 경우 오류 메시지 제공
-        return """
+# 시작 시 한 번만 읽어서 압축본과 함께 메모리에 보관
+page_cache.register_file(
+    "guide",
+    "guide.html",
+    # 파일이 없는 경우 오류 메시지 제공
+    fallback_html="""
         <html>
             <head>
                 <title>가이드 페이지</title>
@@ -27,3 +20,8 @@ async def guide():
             </body>
         </html>
         """
+)
+
+@router.get("/", response_class=HTMLResponse)
+async def guide(request: Request):
+    return page_cache.response(request, "guide")
@@ -0,0 +1,50 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, JSONResponse, Response
+
+from app.services.image_service import image_store
+
+router = APIRouter()
+
+# URL에 원본 내용 해시가 들어가므로 1년 + immutable
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/manifest")
+async def image_manifest():
+    """파일명 -> content-hash URL / srcset (프론트에서 <img srcset> 구성용)"""
+    return JSONResponse(
+        content=image_store.manifest(),
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@router.api_route("/{content_hash}/{variant}/{name}", methods=["GET", "HEAD"])
+async def get_image(request: Request, content_hash: str, variant: str, name: str):
+    image = image_store.get(content_hash)
+    if image is None or image.name != name:
+        raise HTTPException(status_code=404, detail="이미지를 찾을 수 없습니다.")
+
+    if variant == "orig":
+        width = None
+    elif variant.startswith("w") and variant[1:].isdigit() and int(variant[1:]) in image_store.widths:
+        width = int(variant[1:])
+    else:
+        raise HTTPException(status_code=404, detail="지원하지 않는 이미지 크기입니다.")
+
+    image_format = image_store.negotiate(request.headers.get("accept", ""))
+    path, media_type = await image_store.derivative(image, width, image_format)
+
+    headers = {
+        "ETag": f'"{content_hash}-{variant}-{media_type.split("/")[-1]}"',
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+        # 같은 URL이라도 Accept에 따라 포맷이 다름
+        "Vary": "Accept",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or headers["ETag"] in [
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    ]):
+        return Response(status_code=304, headers=headers)
+
+    # Range / If-Range / HEAD 는 FileResponse가 처리
+    return FileResponse(path, media_type=media_type, headers=headers)
@@ -1,34 +1,22 @@
-import os
-import datetime
-from typing import Optional
-from pydantic import BaseModel
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import HTMLResponse, JSONResponse
-from app.db.session import get_database
 from app.core.config import settings
+from app.core.page_cache import page_cache
+from app.schemas.click_event_schema import ClickEvent, ClickEventBatchResponse
+from app.services.click_event_service import (
+    ClickEventPayloadError,
+    parse_click_events,
+    record_click_events
+)
 
 router = APIRouter()
-db = get_database()
 
-class ClickEvent(BaseModel):
-    event_type: str
-    button_location: str
-    user_agent: Optional[str] = None
-    referrer: Optional[str] = None
-
-@router.get("/", response_class=HTMLResponse)
-async def introduce():
-    # templates 폴더에서 introduce.html 파일 경로 설정
-    html_path = os.path.join(os.getcwd(), "app", "templates", "introduce.html")
-    
-    # HTML 파일이 존재하는지 확인
-    if os.path.exists(html_path):
-        with open(html_path, "r", encoding="utf-8") as f:
-            html_content = f.read()
-        return html_content
-    else:
-        # 파일이 없는 경우 오류 메시지 제공
-        return """
+# 시작 시 한 번만 읽어서 압축본과 함께 메모리에 보관
+page_cache.register_file(
+    "introduce",
+    "introduce.html",
+    # 파일이 없는 경우 오류 메시지 제공
+    fallback_html="""
         <html>
             <head>
                 <title>소개 페이지</title>
@@ -39,23 +27,39 @@ async def introduce():
             </body>
         </html>
         """
+)
+
+@router.get("/", response_class=HTMLResponse)
+async def introduce(request: Request):
+    return page_cache.response(request, "introduce")
 
 @router.post("/click-event")
 async def record_click_event(request: Request, event: ClickEvent):
-    # MongoDB에 저장할 데이터
-    click_data = {
-        "event_type": event.event_type,
-        "button_location": event.button_location,
-        "user_agent": event.user_agent,
-        "referrer": event.referrer,
-        "ip_address": request.client.host if request.client else None,
-        "timestamp": settings.CURRENT_DATETIME,  # 기존 프로젝트 패턴과 동일하게 settings에서 시간 가져오기
-        "url": str(request.url)
-    }
-    
-    # MongoDB에 데이터 저장
+    # 단건 전송 (기존 클라이언트 호환), 배치 적재 큐를 같이 사용
+    result = record_click_events(
+        [event.model_dump()],
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
+        url=str(request.url)
+    )
+    return JSONResponse({"status": "success", "duplicates": result.duplicates})
+
+
+@router.post("/click-events", status_code=202, response_model=ClickEventBatchResponse)
+async def record_click_events_batch(request: Request):
+    """클릭 이벤트 배치 수집 (JSON 배열 / NDJSON, navigator.sendBeacon 의 text/plain 본문 허용)"""
+    body = await request.body()
+    if len(body) > settings.CLICK_EVENT_MAX_BODY_BYTES:
+        raise HTTPException(status_code=413, detail="요청 본문이 너무 큽니다.")
+
     try:
-        db["click_events"].insert_one(click_data)
-        return JSONResponse({"status": "success"})
-    except Exception as e:
-        return JSONResponse({"status": "error", "message": str(e)})
\ No newline at end of file
+        raw_events = parse_click_events(body)
+    except ClickEventPayloadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return record_click_events(
+        raw_events,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent"),
+        url=str(request.url)
+    )
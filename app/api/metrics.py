@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.core.metrics_registry import registry
+
+router = APIRouter()
+
+
+@router.get("", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape 용 (워커 프로세스별 값)"""
+    return Response(content=registry.render(), media_type=registry.content_type)
@@ -5,6 +5,13 @@ from typing import Optional, List
 from bson import ObjectId
 
 from app.db.session import get_database
+from app.repository.payment_repository import (
+    PAYMENT_LIST_SORT,
+    InvalidCursorError,
+    count_payments,
+    encode_cursor,
+    find_payments_page
+)
 from app.services.kakao_pay import KakaoPayService
 from ...schemas import payments_schemas
 
@@ -223,13 +230,15 @@ async def get_payment(
 # 결제 목록 조회 API
 @router.get("/", response_model=payments_schemas.PaymentListResponse)
 async def list_payments(
-    page: int = Query(1, ge=1, description="페이지 번호"),
+    cursor: Optional[str] = Query(None, description="다음 페이지 cursor (이전 응답의 next_cursor)"),
+    page: int = Query(1, ge=1, description="페이지 번호 (cursor 미사용 시, 깊은 페이지는 느림)"),
     size: int = Query(10, ge=1, le=100, description="페이지 크기"),
     user_id: Optional[str] = Query(None, description="사용자 ID로 필터링"),
     status: Optional[str] = Query(None, description="결제 상태로 필터링"),
+    include_total: bool = Query(True, description="전체 결제 수 포함 여부"),
     db: AsyncIOMotorClient = Depends(get_database)
 ):
-    """결제 목록 조회 API"""
+    """결제 목록 조회 API (created_at, _id 기준 keyset 페이지네이션)"""
     try:
         # 필터 조건 설정
         filter_query = {}
@@ -237,31 +246,39 @@ async def list_payments(
             filter_query["user_id"] = user_id
         if status:
             filter_query["status"] = status
-            
-        # 전체 결제 수 조회
-        total = await db.payments.count_documents(filter_query)
-        
-        # 결제 목록 조회
-        skip = (page - 1) * size
-        cursor = db.payments.find(filter_query)
-        cursor.sort("created_at", -1)  # 최신순 정렬
-        cursor.skip(skip).limit(size)
-        
+
+        if cursor or page == 1:
+            # 결제 목록 조회 (cursor 위치부터 인덱스 순서대로)
+            payment_docs, next_cursor = await find_payments_page(db, filter_query, size, cursor)
+        else:
+            # 기존 page 파라미터 호환 (skip)
+            payment_docs = await db.payments.find(filter_query).sort(PAYMENT_LIST_SORT) \
+                .skip((page - 1) * size).limit(size + 1).to_list(length=size + 1)
+            next_cursor = encode_cursor(payment_docs[size - 1]) if len(payment_docs) > size else None
+            payment_docs = payment_docs[:size]
+
         payments = []
-        async for payment in cursor:
+        for payment in payment_docs:
             payment_response = {
                 **payment,
                 "id": str(payment["_id"]),
             }
             del payment_response["_id"]
             payments.append(payment_response)
-            
+
+        # 전체 결제 수 (필터 없으면 추정치, 있으면 캐시된 count)
+        total, total_is_estimate = await count_payments(db, filter_query) if include_total else (None, False)
+
         return payments_schemas.PaymentListResponse(
             total=total,
+            total_is_estimate=total_is_estimate,
             payments=payments,
             page=page,
-            size=size
+            size=size,
+            next_cursor=next_cursor
         )
-        
+
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -3,12 +3,14 @@ from fastapi import APIRouter, HTTPException, status, Request, Depends
 from app.core.security import get_auth_user
 from app.schemas.reservation_schema import (
     ReservationListResponse, ReservationListRequest, ReservationCreateResponse, ReservationCreateRequest, \
-    ReservationDetail, ReservationSimple, GoogleMeetLinkResponse, PayReadyRequest
+    ReservationDetail, ReservationSimple, GoogleMeetLinkResponse, PayReadyRequest, AvailabilityResponse
 )
 from app.services.reservation_service import (
     reservation_list_service, reservation_create_service, get_reservations_list_by_user_id, get_reservation_by_id, \
-    update_reservation_status, generate_google_meet_link_service, reservation_pay_ready_service, update_just_status
+    update_reservation_status, generate_google_meet_link_service, reservation_pay_ready_service, update_just_status,
+    ReservationConflictError
 )
+from app.services.availability_service import get_availability
 from typing import List
 
 router = APIRouter()
@@ -34,6 +36,8 @@ async def reservation_list_endpoint(request: ReservationCreateRequest, user : di
     try:
         reservation_list = await reservation_create_service(request, user)
         return reservation_list
+    except ReservationConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -110,12 +114,26 @@ async def generate_google_meet_link(reservation_id: str):
             detail=f"오류 : {str(e)}"
         )
 
+@router.get("/availability", response_model=AvailabilityResponse)
+async def reservation_availability_endpoint(designer_id: str, start_date: str, end_date: str):
+    try:
+        return await get_availability(designer_id, start_date, end_date)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"오류 : {str(e)}")
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"오류 : {str(e)}"
+        )
+
 @router.get("/pay_ready", response_model=dict)
 async def reservation_pay_ready_endpoint(designer_id: str, reservation_date_time: str, user : dict = Depends(get_auth_user)):
     try:
         req = PayReadyRequest(designer_id=designer_id, reservation_date_time=reservation_date_time)
         result = await reservation_pay_ready_service(req, user)
         return result
+    except ReservationConflictError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except Exception as e:
         # 에러 로깅 추가
         print("Pay Ready Error:", str(e))
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, Request, HTTPException, Response
+from app.core.principal_cache import principal_cache
 from app.core.security import verify_access_token
 from app.services.user_service import withdraw_user
-from app.repository.user_repository import get_user_by_email
+from app.repository.user_repository import get_user_by_email, to_user_detail
 from app.schemas.user_schema import UserDetailResponse
 
 router = APIRouter()
@@ -23,12 +24,12 @@ async def get_logged_in_user(request: Request):
         if not email:
             raise HTTPException(status_code=401, detail="토큰이 문제 있음")
 
-        # 사용자 정보 조회
-        user = await get_user_by_email(email)
-        if not user:
+        # 사용자 정보 조회 (principal 캐시, 없으면 DB)
+        principal = await principal_cache.get_principal(email)
+        if not principal:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없다.")
 
-        return user
+        return to_user_detail(principal["user"])
 
     except HTTPException as e:
         raise e
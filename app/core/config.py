@@ -4,7 +4,7 @@ from datetime import datetime
 import pytz
 from urllib.parse import quote_plus
 import logging
-from typing import List
+from typing import ClassVar, List, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +14,25 @@ class Settings(BaseSettings):
     DATABASE_NAME: str
     DB_PW: str
     DB_USER: str
+
+    # MongoDB 클라이언트: 커넥션 풀 크기, 유휴 연결 유지 시간, 풀 대기 시간, 타임아웃 (ms, socket 0이면 제한 없음)
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: int = 300000
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = 2000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 10000
+    MONGO_SOCKET_TIMEOUT_MS: int = 0
+    # 전송 압축 (우선순위 순, 패키지가 설치된 것만 사용: zstd=zstandard, snappy=python-snappy)
+    # 기본은 추가 패키지가 필요 없는 zlib, 패키지 설치 후 "zstd,snappy,zlib" 등으로 지정
+    MONGO_COMPRESSORS: str = "zlib"
+    # BI / 분석 조회: 별도 클라이언트(풀) 사용 여부, 풀 크기, socket 타임아웃,
+    # read preference (primary / primaryPreferred / secondary / secondaryPreferred / nearest), 허용 지연 (초, 90 이상 또는 -1)
+    MONGO_ANALYTICS_SEPARATE_CLIENT: bool = True
+    MONGO_ANALYTICS_MAX_POOL_SIZE: int = 10
+    MONGO_ANALYTICS_SOCKET_TIMEOUT_MS: int = 120000
+    MONGO_ANALYTICS_READ_PREFERENCE: str = "secondaryPreferred"
+    MONGO_ANALYTICS_MAX_STALENESS_SECONDS: int = 120
     
     # 카카오페이 설정 추가
     KAKAO_PAY_CLIENT_ID: str
@@ -49,6 +68,110 @@ class Settings(BaseSettings):
     # Frontend
     FRONTEND_URL: str
 
+    # 디자이너 지역 (고정값)
+    DESIGNER_REGIONS: ClassVar[Tuple[str, ...]] = ('홍대/연남/합정', '강남/청담/압구정', '성수/건대', '서울 전체')
+
+    # 요청 메트릭스 배치 적재
+    METRICS_QUEUE_MAX_SIZE: int = 10000
+    METRICS_BATCH_SIZE: int = 500
+    METRICS_FLUSH_INTERVAL_SECONDS: float = 2.0
+    METRICS_BODY_CAPTURE_BYTES: int = 4096
+    # false면 요청별 문서를 저장하지 않음 (BI 대시보드 미사용 시, 운영 지표는 /metrics)
+    METRICS_STORE_REQUESTS: bool = True
+    # 응답에 Server-Timing 헤더 추가 (parse / app / serialize / db / 외부 API 단계별 시간)
+    # 내부 처리 구조가 외부에 노출되므로 기본 꺼짐 (개발 / 내부 환경에서만 켬, 단계별 시간은 metrics 문서에 항상 저장)
+    SERVER_TIMING_ENABLED: bool = False
+
+    # 소개 페이지 클릭 이벤트 배치 적재
+    CLICK_EVENT_QUEUE_MAX_SIZE: int = 20000
+    CLICK_EVENT_BATCH_SIZE: int = 500
+    CLICK_EVENT_FLUSH_INTERVAL_SECONDS: float = 5.0
+    CLICK_EVENT_DEDUP_SECONDS: float = 3.0
+    CLICK_EVENT_MAX_BATCH: int = 100
+    CLICK_EVENT_MAX_BODY_BYTES: int = 65536
+
+    # BI 지표 API 캐시 (초)
+    BI_METRICS_CACHE_SECONDS: int = 60
+    # 원본 metrics 보관 기간 (TTL 인덱스, BI API 최대 조회 구간 365일보다 길게)
+    METRICS_TTL_DAYS: int = 400
+    # 분 / 시간 rollup 보관 기간 (TTL 인덱스, 일 rollup은 계속 보관)
+    METRICS_ROLLUP_MINUTE_TTL_DAYS: int = 14
+    METRICS_ROLLUP_HOUR_TTL_DAYS: int = 400
+    # rollup 시 watermark 이전 구간 재집계 길이 (초, 늦게 적재된 메트릭스 반영)
+    METRICS_ROLLUP_OVERLAP_SECONDS: float = 300.0
+
+    # 에러 집계: window 길이(초), window당 fingerprint별 원본 샘플 수, 추적 fingerprint 수
+    ERROR_WINDOW_SECONDS: float = 60.0
+    ERROR_SAMPLES_PER_WINDOW: int = 3
+    ERROR_MAX_FINGERPRINTS: int = 1000
+    ERROR_QUEUE_MAX_SIZE: int = 5000
+    # 에러 원본 샘플 보관 기간 (TTL 인덱스)
+    ERROR_SAMPLE_TTL_DAYS: int = 30
+
+    # 예약 만료: 임시예약 유지 시간(분), 결제대기 유지 시간(시간)
+    TEMP_RESERVATION_HOLD_MINUTES: int = 60
+    PAYMENT_WAITING_HOURS: int = 24
+
+    # 인증 사용자(principal) 캐시: 최대 항목 수, 유지 시간 (초)
+    PRINCIPAL_CACHE_MAXSIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 300
+
+    # 소개/가이드/홈 페이지 캐시: 브라우저 캐시 시간(초), 템플릿 변경 감시 (dev 전용)
+    PAGE_CACHE_MAX_AGE_SECONDS: int = 300
+    PAGE_CACHE_DEV_RELOAD: bool = False
+
+    # 이미지 파생본 (리사이즈 / WebP / AVIF, Pillow 설치 시): 디스크 캐시 위치, 허용 너비, 품질
+    IMAGE_CACHE_DIR: str = ".cache/images"
+    IMAGE_WIDTHS: List[int] = [320, 640, 960, 1280]
+    IMAGE_QUALITY: int = 80
+    # 시작 시 모든 파생본 미리 생성 (기본: 첫 요청 시 생성)
+    IMAGE_PREGENERATE: bool = False
+
+    # 결제 목록 필터별 전체 건수 캐시 (초)
+    PAYMENT_COUNT_CACHE_SECONDS: int = 30
+
+    # 디자이너 목록 캐시 유지 시간 (초)
+    DESIGNER_CACHE_TTL_SECONDS: int = 300
+    # 디자이너 목록 필터 조합별 결과 캐시 최대 개수
+    DESIGNER_CACHE_RESULTS_MAXSIZE: int = 1024
+
+    # 시작 시 쿼리 플랜 검증: warn(경고 로그) / fail(기동 실패) / off
+    INDEX_PLAN_CHECK: str = "warn"
+    # 쿼리 shape 프로파일러 (/bi/api/slow-queries): 최대 shape 수,
+    # p95가 이 값(ms) 이상인 shape만 explain, 같은 shape 재 explain 간격(초), explain 확인 주기(초)
+    SLOW_QUERY_PROFILER_ENABLED: bool = True
+    SLOW_QUERY_MAX_SHAPES: int = 500
+    SLOW_QUERY_EXPLAIN_MS: float = 100.0
+    SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS: float = 600.0
+    SLOW_QUERY_EXPLAIN_CHECK_SECONDS: float = 30.0
+    # 검사 문서 수 / 반환 문서 수 비율이 이 값 이상이거나 COLLSCAN 이면 인덱스 부족 의심 (검사 문서 수가 최소값 이상일 때)
+    SLOW_QUERY_EXAMINED_RATIO: float = 10.0
+    SLOW_QUERY_MIN_EXAMINED: int = 1000
+
+    # 외부 API(카카오페이, Google) HTTP 클라이언트 풀
+    HTTP2_ENABLED: bool = False
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_READ_TIMEOUT_SECONDS: float = 10.0
+    HTTP_POOL_TIMEOUT_SECONDS: float = 5.0
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS_PER_HOST: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+
+    # Google Calendar API 호출 스레드 풀 크기, 요청 타임아웃 (초)
+    GOOGLE_CALENDAR_MAX_WORKERS: int = 8
+    GOOGLE_CALENDAR_TIMEOUT_SECONDS: float = 10.0
+
+    # 외부 API 부수효과 작업 큐 (jobs 컬렉션)
+    JOB_WORKERS: int = 4
+    JOB_PER_KEY_CONCURRENCY: int = 1
+    JOB_MAX_ATTEMPTS: int = 8
+    JOB_BACKOFF_BASE_SECONDS: float = 5.0
+    JOB_BACKOFF_MAX_SECONDS: float = 600.0
+    JOB_LEASE_SECONDS: float = 60.0
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    # 완료된 작업 보관 기간 (dead 작업은 삭제하지 않음)
+    JOB_DONE_TTL_DAYS: int = 7
+
     class Config:
         env_file = 'real.env'
         env_file_encoding = 'utf-8'
@@ -64,8 +187,4 @@ class Settings(BaseSettings):
         kst = pytz.timezone('Asia/Seoul')
         return datetime.now(kst).isoformat()
 
-    @property
-    def DESIGNER_REGIONS(self) -> list[str]:
-        return ['홍대/연남/합정', '강남/청담/압구정', '성수/건대', '서울 전체']
-
 settings = Settings()
@@ -0,0 +1,124 @@
+import logging
+import time
+from typing import Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core import request_timing
+from app.core.metrics_registry import OUTBOUND_REQUEST_DURATION, status_class
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """외부 API 호출 시간 기록 (/metrics outbound_request_duration_seconds, 요청별 Server-Timing)"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, name: str):
+        self._transport = transport
+        self.name = name
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = status_class(response.status_code)
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            OUTBOUND_REQUEST_DURATION.observe(elapsed, self.name, status)
+            request_timing.record(self.name, elapsed)
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class HttpClientRegistry:
+    """외부 API 호출용 httpx.AsyncClient 레지스트리
+
+    호출할 때마다 AsyncClient를 새로 만들면 매번 TCP + TLS handshake가 발생하므로
+    애플리케이션 수명 동안 이름(=호스트)별 클라이언트 하나를 재사용한다.
+    httpx의 Limits는 클라이언트 단위이므로 호스트별로 클라이언트를 나눠 호스트별 연결 수를 제한한다.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._http2 = settings.HTTP2_ENABLED
+        if self._http2 and not _http2_available():
+            # http2=True 인데 h2 패키지가 없으면 httpx가 ImportError를 내므로 HTTP/1.1로 동작
+            logger.warning("HTTP2_ENABLED=True 이지만 h2 패키지가 없어 HTTP/1.1 사용 (pip install 'httpx[http2]')")
+            self._http2 = False
+
+    def _create(self, name: str, base_url: str) -> httpx.AsyncClient:
+        transport = httpx.AsyncHTTPTransport(
+            http2=self._http2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS_PER_HOST,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        return httpx.AsyncClient(
+            base_url=base_url,
+            transport=InstrumentedTransport(transport, name),
+            timeout=httpx.Timeout(
+                settings.HTTP_READ_TIMEOUT_SECONDS,
+                connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+                pool=settings.HTTP_POOL_TIMEOUT_SECONDS,
+            ),
+        )
+
+    def get(self, name: str, base_url: str = "") -> httpx.AsyncClient:
+        """이름별 공유 클라이언트 (없거나 닫혀 있으면 생성)"""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create(name, base_url)
+            self._clients[name] = client
+        return client
+
+    def register(self, name: str, client: httpx.AsyncClient):
+        """이미 만든 클라이언트 등록 (벤치마크 / 로컬 실행에서 외부 API 대체 서버로 연결할 때 사용)"""
+        self._clients[name] = client
+
+    def start(self, clients: Optional[Dict[str, str]] = None):
+        """lifespan 시작 시 사용할 클라이언트를 미리 생성"""
+        for name, base_url in (clients or {}).items():
+            self.get(name, base_url)
+        logger.info(f"HTTP 클라이언트 준비 (http2={self._http2}): {list(self._clients)}")
+
+    async def aclose(self):
+        """lifespan 종료 시 모든 연결 정리"""
+        clients, self._clients = self._clients, {}
+        for name, client in clients.items():
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"HTTP 클라이언트 종료 실패 {name}: {e}")
+
+
+http_clients = HttpClientRegistry()
+
+# 외부 API 호스트별 클라이언트 이름
+KAKAO_PAY_CLIENT = "kakaopay"
+GOOGLE_OAUTH_CLIENT = "google_oauth"
+GOOGLE_API_CLIENT = "google_api"
+
+EXTERNAL_HOSTS = {
+    KAKAO_PAY_CLIENT: "https://open-api.kakaopay.com",
+    GOOGLE_OAUTH_CLIENT: "https://oauth2.googleapis.com",
+    GOOGLE_API_CLIENT: "https://www.googleapis.com",
+}
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    return http_clients.get(name, EXTERNAL_HOSTS.get(name, ""))
@@ -0,0 +1,219 @@
+import math
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# 요청 / 외부 API / 작업 시간 기본 버킷 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    """스레드별 shard에 기록하고 수집 시 합산 (락 없음)
+
+    이벤트 루프 / Motor 실행 스레드 / 캘린더 스레드 풀이 각자 자기 shard만 수정하므로
+    값 갱신에 락이 필요 없다. 수집은 각 shard를 복사(dict.copy, GIL 하에서 원자적)해서 합친다.
+    값은 워커 프로세스 단위로 집계된다.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards: List[dict] = []
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "values", None)
+        if shard is None:
+            shard = {}
+            self._local.values = shard
+            # list.append 는 원자적
+            self._shards.append(shard)
+        return shard
+
+    def _snapshots(self) -> List[dict]:
+        return [shard.copy() for shard in list(self._shards)]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def collect(self) -> Dict[LabelValues, float]:
+        totals: Dict[LabelValues, float] = defaultdict(float)
+        for snapshot in self._snapshots():
+            for labels, value in snapshot.items():
+                totals[labels] += value
+        return totals
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self.collect().items())
+        ]
+
+
+class Gauge(Counter):
+    """inc / dec 합계 또는 수집 시점에 계산하는 값 (set_function)"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._function: Optional[Callable[[], Dict[LabelValues, float]]] = None
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set_function(self, function: Callable[[], Dict[LabelValues, float]]):
+        """수집 시 호출해서 {라벨 값 tuple: 값} 을 반환하는 함수"""
+        self._function = function
+
+    def collect(self) -> Dict[LabelValues, float]:
+        totals = super().collect()
+        if self._function is not None:
+            for labels, value in self._function().items():
+                totals[labels] += value
+        return totals
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # 버킷별 개수 (마지막은 +Inf) + 합계
+            state = [0] * (len(self.buckets) + 1) + [0.0]
+            shard[labels] = state
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def collect(self) -> Dict[LabelValues, List[float]]:
+        totals: Dict[LabelValues, List[float]] = {}
+        for snapshot in self._snapshots():
+            for labels, state in snapshot.items():
+                state = list(state)
+                total = totals.get(labels)
+                if total is None:
+                    totals[labels] = state
+                else:
+                    for index, value in enumerate(state):
+                        total[index] += value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, state in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state[:-1]):
+                cumulative += count
+                bucket_labels = _format_labels(self.labelnames, labels, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Prometheus text exposition format (0.0.4)"""
+
+    content_type = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 메트릭: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def status_class(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+registry = MetricsRegistry()
+
+# HTTP 요청 (route는 경로 템플릿, status는 2xx / 4xx / 5xx)
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "처리한 HTTP 요청 수", ("route", "method", "status"))
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간", ("route", "method", "status"))
+HTTP_REQUESTS_IN_PROGRESS = registry.gauge(
+    "http_requests_in_progress", "처리 중인 HTTP 요청 수")
+
+# MongoDB 커넥션 풀 (Motor 클라이언트 이벤트 리스너, client=main / analytics)
+MONGO_POOL_CONNECTIONS = registry.gauge(
+    "mongodb_pool_connections", "MongoDB 커넥션 수 (state=open: 열린 연결, in_use: 사용 중)", ("client", "state"))
+MONGO_POOL_CHECKOUT_DURATION = registry.histogram(
+    "mongodb_pool_checkout_duration_seconds", "커넥션 풀에서 연결을 얻기까지 걸린 시간", ("client",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0))
+MONGO_POOL_CHECKOUT_FAILURES = registry.counter(
+    "mongodb_pool_checkout_failures_total", "커넥션 풀에서 연결을 얻지 못한 횟수", ("client", "reason"))
+
+# 백그라운드 작업
+SCHEDULER_JOB_DURATION = registry.histogram(
+    "scheduler_job_duration_seconds", "APScheduler 작업 실행 시간", ("job", "result"),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0))
+JOB_QUEUE_DURATION = registry.histogram(
+    "job_queue_job_duration_seconds", "작업 큐 핸들러 실행 시간 (result=done / retry / dead)", ("type", "result"),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0))
+
+# 외부 API (카카오페이 / Google), status는 2xx / 4xx / 5xx 또는 error (연결 실패, 타임아웃)
+OUTBOUND_REQUEST_DURATION = registry.histogram(
+    "outbound_request_duration_seconds", "외부 API 호출 시간 (응답 헤더 수신까지)", ("client", "status"))
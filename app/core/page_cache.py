@@ -0,0 +1,174 @@
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+from email.utils import formatdate
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # requirements.txt 에 포함, 설치되지 않은 환경에서는 gzip만 사용
+    brotli = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIRECTORY = os.path.join(os.getcwd(), "app", "templates")
+
+
+class CachedPage:
+    """미리 압축해 둔 HTML 페이지 (생성 후 변경하지 않음, 갱신 시 객체를 교체)"""
+
+    __slots__ = ("name", "variants", "etags", "last_modified", "mtime")
+
+    def __init__(self, name: str, html: str, mtime: Optional[float] = None):
+        body = html.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()[:20]
+
+        variants: Dict[str, bytes] = {"identity": body}
+        # mtime=0 -> 같은 내용이면 항상 같은 gzip 바이트 (ETag 안정)
+        variants["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, quality=11, mode=brotli.MODE_TEXT)
+
+        self.name = name
+        self.variants: Mapping[str, bytes] = MappingProxyType(variants)
+        # 강한 ETag는 인코딩별로 달라야 함
+        self.etags: Mapping[str, str] = MappingProxyType({
+            encoding: f'"{digest}"' if encoding == "identity" else f'"{digest}-{encoding}"'
+            for encoding in variants
+        })
+        self.last_modified = formatdate(mtime, usegmt=True) if mtime else None
+        self.mtime = mtime
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    encodings = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        encodings[token.strip().lower()] = quality
+    return encodings
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match는 약한 비교 (W/ 접두사 무시)
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag[2:] == etag if tag.startswith("W/") else tag == etag for tag in candidates)
+
+
+class PageCache:
+    """정적 HTML 페이지 인메모리 캐시
+
+    시작 시 템플릿을 한 번만 읽어 identity / gzip / br 변형을 미리 만들어 둔다.
+    요청 처리 시 파일 I/O와 압축이 없고, If-None-Match가 맞으면 본문 없이 304를 반환한다.
+    dev 모드(PAGE_CACHE_DEV_RELOAD)에서만 파일 변경을 감시해서 다시 읽는다.
+    """
+
+    def __init__(self, directory: str, max_age_seconds: int, dev_reload: bool):
+        self.directory = directory
+        self.max_age_seconds = max_age_seconds
+        self.dev_reload = dev_reload
+        self._pages: Dict[str, CachedPage] = {}
+        self._files: Dict[str, str] = {}
+        self._fallbacks: Dict[str, str] = {}
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def register_file(self, name: str, filename: str, fallback_html: str):
+        """템플릿 파일 페이지 등록 (파일이 없으면 fallback_html 제공)"""
+        self._files[name] = os.path.join(self.directory, filename)
+        self._fallbacks[name] = fallback_html
+        self._load_file(name)
+
+    def register_html(self, name: str, html: str):
+        self._pages[name] = CachedPage(name, html)
+
+    def _load_file(self, name: str):
+        path = self._files[name]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                html = f.read()
+            mtime = os.path.getmtime(path)
+        except OSError:
+            logger.error(f"페이지 템플릿을 찾을 수 없습니다: {path}")
+            html, mtime = self._fallbacks[name], None
+        self._pages[name] = CachedPage(name, html, mtime)
+
+    def response(self, request: Request, name: str) -> Response:
+        page = self._pages[name]
+
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        encoding = "identity"
+        for candidate in ("br", "gzip"):
+            if candidate in page.variants and accepted.get(candidate, 0) > 0:
+                encoding = candidate
+                break
+
+        headers = {
+            "ETag": page.etags[encoding],
+            "Cache-Control": f"public, max-age={self.max_age_seconds}",
+            "Vary": "Accept-Encoding",
+        }
+        if page.last_modified:
+            headers["Last-Modified"] = page.last_modified
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _etag_matches(if_none_match, page.etags[encoding]):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(
+            content=page.variants[encoding],
+            media_type="text/html; charset=utf-8",
+            headers=headers,
+        )
+
+    async def _watch(self, interval: float = 1.0):
+        while True:
+            await asyncio.sleep(interval)
+            for name, path in self._files.items():
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                if mtime != self._pages[name].mtime:
+                    self._load_file(name)
+                    logger.info(f"페이지 템플릿 다시 로드: {path}")
+
+    def start_watch(self):
+        if self.dev_reload and self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch(), name="page-cache-watch")
+
+    async def stop_watch(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+
+page_cache = PageCache(
+    TEMPLATE_DIRECTORY,
+    max_age_seconds=settings.PAGE_CACHE_MAX_AGE_SECONDS,
+    dev_reload=settings.PAGE_CACHE_DEV_RELOAD,
+)
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from cachetools import TTLCache
+from google.auth.transport.requests import Request as GoogleRequest
+from google.oauth2.credentials import Credentials
+
+from app.core.config import settings
+from app.db.session import get_database
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def build_google_credentials(user_record: dict) -> Credentials:
+    """users 문서의 Google 토큰으로 Credentials 생성 (캘린더 접근 권한 포함)"""
+    return Credentials(
+        token=user_record.get("google_access_token"),
+        refresh_token=user_record.get("google_refresh_token"),
+        token_uri="https://oauth2.googleapis.com/token",
+        client_id=settings.GOOGLE_CLIENT_ID,
+        client_secret=settings.GOOGLE_CLIENT_SECRET,
+        scopes=["openid", "email", "profile", "https://www.googleapis.com/auth/calendar"]
+    )
+
+
+class PrincipalCache:
+    """인증된 사용자 정보 캐시
+
+    - claims: access token -> 디코딩된 JWT claims (exp가 지나면 캐시에 있어도 만료 처리)
+    - principals: email -> {"user": users 문서, "credentials": Google Credentials}
+    같은 사용자의 동시 요청은 DB 조회 / Google 토큰 갱신을 한 번만 수행한다 (single-flight).
+    토큰 갱신(credentials.refresh)은 동기 HTTP 호출이므로 스레드에서 실행한다.
+    로그인 / 로그아웃 / 탈퇴 / 토큰 변경 시 invalidate() 로 제거한다.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self._claims: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self._principals: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl_seconds)
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+    async def _single_flight(self, key: tuple, factory: Callable[[], Awaitable]):
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 먼저 요청한 쪽이 취소돼도 다른 대기자에게 결과가 전달되도록 shield
+        return await asyncio.shield(future)
+
+    def get_claims(self, token: str) -> Optional[dict]:
+        claims = self._claims.get(token)
+        if claims is None:
+            return None
+        if claims.get("exp") is not None and claims["exp"] <= time.time():
+            self._claims.pop(token, None)
+            return None
+        return claims
+
+    def set_claims(self, token: str, claims: dict):
+        self._claims[token] = claims
+
+    async def _load_principal(self, email: str) -> Optional[dict]:
+        user = await get_database()["users"].find_one({"email": email})
+        if not user:
+            return None
+        principal = {"user": user, "credentials": build_google_credentials(user)}
+        self._principals[email] = principal
+        return principal
+
+    async def get_principal(self, email: str) -> Optional[dict]:
+        """캐시된 사용자 정보 (없으면 DB 조회, 사용자가 없으면 None)"""
+        principal = self._principals.get(email)
+        if principal is not None:
+            return principal
+        return await self._single_flight(("load", email), lambda: self._load_principal(email))
+
+    async def _refresh(self, email: str, credentials: Credentials):
+        if not credentials.expired:
+            # 대기 중에 다른 요청이 이미 갱신함
+            return
+        await asyncio.to_thread(credentials.refresh, GoogleRequest())
+        await get_database()["users"].update_one(
+            {"email": email},
+            {"$set": {
+                "google_access_token": credentials.token,
+                "google_refresh_token": credentials.refresh_token
+            }}
+        )
+        logger.info(f"Google 토큰 갱신: {email}")
+
+    async def refresh_credentials(self, email: str, credentials: Credentials):
+        """만료된 Google 토큰 갱신 (사용자별 한 번만 실행, 실패 시 예외)"""
+        await self._single_flight(("refresh", email), lambda: self._refresh(email, credentials))
+
+    def invalidate(self, email: Optional[str] = None, token: Optional[str] = None):
+        if email is not None:
+            self._principals.pop(email, None)
+        if token is not None:
+            self._claims.pop(token, None)
+
+
+principal_cache = PrincipalCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAXSIZE,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
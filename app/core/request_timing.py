@@ -0,0 +1,139 @@
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from pymongo import monitoring
+
+# 요청 단위 단계별 시간 (MetricsMiddleware가 요청마다 설정)
+# Motor는 실행 스레드로 contextvars를 복사하므로 CommandListener에서도 현재 요청을 알 수 있다.
+_current: contextvars.ContextVar = contextvars.ContextVar("request_timing", default=None)
+
+DB_STAGE = "db"
+
+
+class RequestTiming:
+    """요청 처리 단계별 시간
+
+    - parse: 요청 수신 ~ 엔드포인트 함수 시작 (라우팅, 의존성(인증 등), 요청 바디 검증)
+    - app: 엔드포인트 함수 실행
+    - serialize: 엔드포인트 함수 종료 ~ 응답 시작 (response_model 검증, JSON 직렬화)
+    - db / 외부 API(kakaopay, google_api, google_calendar ...): 누적 시간과 횟수 (app / parse 구간에 포함됨)
+    """
+
+    __slots__ = ("started", "endpoint_started", "endpoint_finished", "stages", "_lock")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.endpoint_started: Optional[float] = None
+        self.endpoint_finished: Optional[float] = None
+        self.stages: Dict[str, List[float]] = {}
+        # DB 명령은 여러 Motor 실행 스레드에서 동시에 기록될 수 있음
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float):
+        with self._lock:
+            entry = self.stages.get(stage)
+            if entry is None:
+                self.stages[stage] = [seconds, 1]
+            else:
+                entry[0] += seconds
+                entry[1] += 1
+
+    def breakdown(self, finished: float) -> Dict[str, dict]:
+        """{단계: {"ms": 누적 시간, "count": 횟수}} (count는 db / 외부 API만)"""
+        result = {}
+        if self.endpoint_started is not None:
+            result["parse"] = {"ms": round((self.endpoint_started - self.started) * 1000, 2)}
+            if self.endpoint_finished is not None:
+                result["app"] = {"ms": round((self.endpoint_finished - self.endpoint_started) * 1000, 2)}
+                result["serialize"] = {"ms": round((finished - self.endpoint_finished) * 1000, 2)}
+        with self._lock:
+            stages = {stage: list(entry) for stage, entry in self.stages.items()}
+        for stage, (seconds, count) in stages.items():
+            result[stage] = {"ms": round(seconds * 1000, 2), "count": count}
+        result["total"] = {"ms": round((finished - self.started) * 1000, 2)}
+        return result
+
+
+def server_timing_header(breakdown: Dict[str, dict]) -> str:
+    entries = []
+    for stage, value in breakdown.items():
+        entry = f"{stage};dur={value['ms']}"
+        if "count" in value:
+            entry += f';desc="{value["count"]}"'
+        entries.append(entry)
+    return ", ".join(entries)
+
+
+def start() -> contextvars.Token:
+    return _current.set(RequestTiming())
+
+
+def reset(token: contextvars.Token):
+    _current.reset(token)
+
+
+def current() -> Optional[RequestTiming]:
+    return _current.get()
+
+
+def record(stage: str, seconds: float):
+    """현재 요청에 단계 시간 추가 (요청 밖(스케줄러, 작업 큐)에서는 무시)"""
+    timing = _current.get()
+    if timing is not None:
+        timing.add(stage, seconds)
+
+
+class CommandTimingListener(monitoring.CommandListener):
+    """MongoDB 명령 시간 -> 현재 요청의 db 단계"""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        record(DB_STAGE, event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        record(DB_STAGE, event.duration_micros / 1_000_000)
+
+
+def _timed_endpoint(call):
+    if asyncio.iscoroutinefunction(call):
+        @functools.wraps(call)
+        async def endpoint(*args, **kwargs):
+            timing = _current.get()
+            if timing is None:
+                return await call(*args, **kwargs)
+            timing.endpoint_started = time.perf_counter()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                timing.endpoint_finished = time.perf_counter()
+    else:
+        @functools.wraps(call)
+        def endpoint(*args, **kwargs):
+            timing = _current.get()
+            if timing is None:
+                return call(*args, **kwargs)
+            timing.endpoint_started = time.perf_counter()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                timing.endpoint_finished = time.perf_counter()
+    return endpoint
+
+
+def instrument_routes(app: FastAPI):
+    """모든 APIRoute의 엔드포인트 함수 시작 / 종료 시각 기록 (parse / app / serialize 구분용)
+
+    FastAPI는 요청 시 route.dependant.call 을 호출하므로 라우터 등록이 끝난 뒤 한 번 감싼다.
+    """
+    for route in app.routes:
+        if isinstance(route, APIRoute) and not getattr(route.dependant.call, "_request_timed", False):
+            route.dependant.call = _timed_endpoint(route.dependant.call)
+            route.dependant.call._request_timed = True
@@ -1,13 +1,12 @@
 import logging
 from datetime import datetime, timedelta
 
-from google.oauth2.credentials import Credentials
 from jose import JWTError, jwt, ExpiredSignatureError
 from fastapi import HTTPException, Request, Response
 from fastapi.security import OAuth2PasswordBearer
-from google.auth.transport.requests import Request as GoogleRequest
 
 from app.core.config import settings
+from app.core.principal_cache import principal_cache
 
 # JWT 설정
 SECRET_KEY = settings.SECRET_KEY
@@ -19,9 +18,6 @@ REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 # OAuth2 설정
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-from app.db.session import get_database
-db = get_database()
-
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -62,9 +58,14 @@ def create_refresh_token(data: dict) -> str:
         raise HTTPException(status_code=500, detail=f"error : {str(e)}")
 
 async def verify_access_token(token: str) -> dict:
-    """JWT Access Token 검증"""
+    """JWT Access Token 검증 (검증된 claims는 만료 전까지 캐시)"""
+    claims = principal_cache.get_claims(token)
+    if claims is not None:
+        return claims
     try:
-        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        principal_cache.set_claims(token, claims)
+        return claims
     except ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="access token 만료")
     except JWTError:
@@ -146,11 +147,12 @@ async def get_auth_user(request: Request) -> dict:
         logger.info("이메일 쿠키가 존재하지 않습니다.")
         raise HTTPException(status_code=401, detail="로그인 한 사용자만 사용 가능합니다.")
 
-    # DB에서 사용자 정보 조회 (이메일 기준)
-    user_record = await db["users"].find_one({"email": user_email})
-    if not user_record:
+    # 사용자 정보 조회 (principal 캐시, 없으면 DB)
+    principal = await principal_cache.get_principal(user_email)
+    if not principal:
         logger.info("DB에서 사용자 정보를 찾을 수 없습니다.")
         raise HTTPException(status_code=404, detail="사용자 정보를 찾을 수 없습니다.")
+    user_record = principal["user"]
 
     # DB에서 Google OAuth2 토큰 정보 가져오기
     google_access_token = user_record.get("google_access_token")
@@ -159,41 +161,21 @@ async def get_auth_user(request: Request) -> dict:
         logger.info("DB에 Google 인증 정보가 없습니다.")
         raise HTTPException(status_code=401, detail="Google 인증 정보가 없습니다.")
 
-    # Google OAuth2 Credentials 객체 생성 (캘린더 접근 권한 포함)
-    client_id = settings.GOOGLE_CLIENT_ID
-    client_secret = settings.GOOGLE_CLIENT_SECRET
-    token_uri = "https://oauth2.googleapis.com/token"
-    scopes = ["openid", "email", "profile", "https://www.googleapis.com/auth/calendar"]
-
-    credentials = Credentials(
-        token=google_access_token,
-        refresh_token=google_refresh_token,
-        token_uri=token_uri,
-        client_id=client_id,
-        client_secret=client_secret,
-        scopes=scopes
-    )
-
-    logging.info(f"credentials =======================> {credentials}")
+    # Google OAuth2 Credentials 객체 (캐시에서 요청 간 공유)
+    credentials = principal["credentials"]
 
-    # 토큰 만료 시 자동 갱신
+    # 토큰 만료 시 자동 갱신 (사용자별 한 번만, 스레드에서 실행)
     if credentials.expired and credentials.refresh_token:
         try:
-            credentials.refresh(GoogleRequest())
-            # 갱신된 토큰 정보를 DB에 업데이트
-            await db["users"].update_one(
-                {"email": user_email},
-                {"$set": {
-                    "google_access_token": credentials.token,
-                    "google_refresh_token": credentials.refresh_token
-                }}
-            )
+            await principal_cache.refresh_credentials(user_email, credentials)
         except Exception as e:
             logger.error(f"토큰 갱신 실패: {e}")
+            principal_cache.invalidate(email=user_email)
             raise HTTPException(status_code=401, detail=f"토큰 갱신에 실패했습니다: {e}")
 
-    # 반환할 사용자 정보에 Credentials 객체와 이메일 추가
+    # 반환할 사용자 정보에 Credentials 객체와 이메일, 사용자 _id 추가 (서비스에서 users 재조회 불필요)
     user_data = {
+        "_id": user_record["_id"],
         "email": user_email,
         "credentials": credentials
     }
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Optional
+
+from app.db.session import get_database
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter:
+    """요청 처리 경로와 분리된 insert_many 배치 적재기
+
+    enqueue()는 메모리 큐에 문서를 넣기만 하고 즉시 반환한다.
+    백그라운드 flusher가 batch_size 만큼 쌓이거나 flush_interval 초가 지나면 insert_many로 한번에 저장한다.
+    Mongo가 느려 큐가 가득 차면 새 문서는 버리고 dropped 카운터만 올린다.
+    """
+
+    def __init__(self, collection_name: str, max_queue_size: int, batch_size: int, flush_interval: float):
+        self.collection_name = collection_name
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self._queue: deque = deque()
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._last_drop_log = 0.0
+
+        # 운영 확인용 카운터
+        self.stats = {
+            "enqueued": 0,
+            "dropped": 0,
+            "written": 0,
+            "failed": 0,
+            "batches": 0,
+        }
+
+    @property
+    def queue_size(self) -> int:
+        return len(self._queue)
+
+    def enqueue(self, document: dict) -> bool:
+        """문서를 큐에 적재 (가득 찬 경우 버리고 False 반환)"""
+        if len(self._queue) >= self.max_queue_size:
+            self.stats["dropped"] += 1
+            now = time.monotonic()
+            if now - self._last_drop_log > 10:
+                self._last_drop_log = now
+                logger.warning(
+                    "[%s] batch queue full (%d), dropped total: %d",
+                    self.collection_name, self.max_queue_size, self.stats["dropped"]
+                )
+            return False
+
+        self._queue.append(document)
+        self.stats["enqueued"] += 1
+        if self._batch_ready is not None and len(self._queue) >= self.batch_size:
+            self._batch_ready.set()
+        return True
+
+    async def start(self):
+        if self._task is not None:
+            return
+        self._stopping = False
+        self._batch_ready = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name=f"batch-writer:{self.collection_name}")
+
+    async def stop(self, timeout: float = 10.0):
+        """flusher 종료 후 남은 문서를 모두 저장"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._batch_ready.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout)
+        except asyncio.TimeoutError:
+            self._task.cancel()
+            logger.error("[%s] batch writer shutdown timed out, %d documents left", self.collection_name, len(self._queue))
+        finally:
+            self._task = None
+        logger.info("[%s] batch writer stopped: %s", self.collection_name, self.stats)
+
+    async def flush(self):
+        """큐에 남은 문서를 batch_size 단위로 모두 저장"""
+        while self._queue:
+            batch = []
+            while self._queue and len(batch) < self.batch_size:
+                batch.append(self._queue.popleft())
+            await self._write(batch)
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+        # 종료 시 마지막 flush
+        await self.flush()
+
+    async def _write(self, batch: list):
+        if not batch:
+            return
+        db = get_database()
+        try:
+            await db[self.collection_name].insert_many(batch, ordered=False)
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["failed"] += len(batch)
+            logger.error("[%s] failed to write batch of %d: %s", self.collection_name, len(batch), str(e))
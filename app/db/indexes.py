@@ -0,0 +1,321 @@
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.analytics.error_recorder import SAMPLE_COLLECTION as ERROR_SAMPLE_COLLECTION
+from app.analytics.error_recorder import SUMMARY_COLLECTION as ERROR_SUMMARY_COLLECTION
+from app.analytics.metrics_rollup import HOUR_COLLECTION, MINUTE_COLLECTION
+from app.core.config import settings
+from app.scheduler.job_queue import JOB_COLLECTION, JOB_DONE, JOB_PENDING, JOB_RUNNING
+from app.db.session import get_database
+from app.services.reservation_state import ACTIVE_SLOT_STATUSES
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SLOT_UNIQUE_INDEX = "designer_active_slot_unique"
+
+# 컬렉션별 인덱스 선언 (이름을 고정해서 여러 번 실행해도 동일한 결과)
+INDEXES: Dict[str, List[IndexModel]] = {
+    "reservations": [
+        # 디자이너별 예약 리스트 (reservation_list_service)
+        IndexModel(
+            [("designer_id", ASCENDING), ("reservation_date_time", ASCENDING), ("del_yn", ASCENDING)],
+            name="designer_id_reservation_date_time_del_yn",
+        ),
+        # 사용자별 예약 리스트 (get_reservations_list_by_user_id)
+        IndexModel(
+            [("user_id", ASCENDING), ("reservation_date_time", DESCENDING)],
+            name="user_id_reservation_date_time",
+        ),
+        # 디자이너별 동일 시간 예약 방지 (점유 상태인 예약만 대상, 중복 예약 방지는 이 인덱스에만 의존)
+        # partialFilterExpression 의 $in 은 MongoDB 6.0+ 이므로 상태 변경 시 함께 쓰는 active_slot 플래그 사용
+        IndexModel(
+            [("designer_id", ASCENDING), ("reservation_date_time", ASCENDING)],
+            name=SLOT_UNIQUE_INDEX,
+            unique=True,
+            partialFilterExpression={"active_slot": True},
+        ),
+        # 임시예약 만료 삭제 (TTL, expires_at 시각이 지나면 삭제)
+        IndexModel(
+            [("expires_at", ASCENDING)],
+            name="temp_reservation_expires_at_ttl",
+            expireAfterSeconds=0,
+            partialFilterExpression={"status": "임시예약"},
+        ),
+        # 결제대기 만료 처리 대상 (delete_waiting_reservations)
+        IndexModel(
+            [("payment_deadline", ASCENDING)],
+            name="waiting_payment_deadline",
+            partialFilterExpression={"status": "결제대기", "del_yn": "N"},
+        ),
+    ],
+    "designer_availability": [
+        IndexModel([("designer_id", ASCENDING), ("date", ASCENDING)], name="designer_id_date_unique", unique=True),
+    ],
+    "designers": [
+        # 배열 필드 (multikey), 목록 조회는 인메모리 캐시가 처리
+        IndexModel([("region", ASCENDING), ("available_modes", ASCENDING)], name="region_available_modes"),
+    ],
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+    ],
+    "payments": [
+        # 결제 목록 keyset 페이지네이션 (created_at, _id 내림차순, payment_repository.PAYMENT_LIST_SORT)
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="user_id_created_at_id"),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="status_created_at_id"),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+    ],
+    "metrics": [
+        # 원본 메트릭스는 METRICS_TTL_DAYS 이후 자동 삭제 (rollup에는 남아있음, BI API는 이보다 긴 구간 거부)
+        IndexModel(
+            [("timestamp", ASCENDING)],
+            name="timestamp_ttl",
+            expireAfterSeconds=settings.METRICS_TTL_DAYS * 24 * 60 * 60,
+        ),
+        IndexModel([("endpoint_category", ASCENDING), ("timestamp", ASCENDING)], name="endpoint_category_timestamp"),
+    ],
+    ERROR_SAMPLE_COLLECTION: [
+        IndexModel(
+            [("timestamp", ASCENDING)],
+            name="timestamp_ttl",
+            expireAfterSeconds=settings.ERROR_SAMPLE_TTL_DAYS * 24 * 60 * 60,
+        ),
+        IndexModel([("fingerprint", ASCENDING), ("timestamp", DESCENDING)], name="fingerprint_timestamp"),
+    ],
+    ERROR_SUMMARY_COLLECTION: [
+        IndexModel([("window_start", DESCENDING)], name="window_start"),
+        IndexModel([("fingerprint", ASCENDING), ("window_start", DESCENDING)], name="fingerprint_window_start"),
+    ],
+    JOB_COLLECTION: [
+        # 작업 점유 (대기 작업 / lease 만료 작업)
+        IndexModel([("status", ASCENDING), ("run_at", ASCENDING)], name="status_run_at"),
+        IndexModel([("status", ASCENDING), ("locked_until", ASCENDING)], name="status_locked_until"),
+        # 완료된 작업만 JOB_DONE_TTL_DAYS 이후 삭제 (dead 작업은 남김)
+        IndexModel(
+            [("finished_at", ASCENDING)],
+            name="done_finished_at_ttl",
+            expireAfterSeconds=settings.JOB_DONE_TTL_DAYS * 24 * 60 * 60,
+            partialFilterExpression={"status": JOB_DONE},
+        ),
+    ],
+    MINUTE_COLLECTION: [
+        IndexModel([("_id.bucket", ASCENDING)], name="bucket"),
+        IndexModel(
+            [("bucket", ASCENDING)],
+            name="bucket_ttl",
+            expireAfterSeconds=settings.METRICS_ROLLUP_MINUTE_TTL_DAYS * 24 * 60 * 60,
+        ),
+    ],
+    HOUR_COLLECTION: [
+        IndexModel([("_id.bucket", ASCENDING)], name="bucket"),
+        IndexModel(
+            [("bucket", ASCENDING)],
+            name="bucket_ttl",
+            expireAfterSeconds=settings.METRICS_ROLLUP_HOUR_TTL_DAYS * 24 * 60 * 60,
+        ),
+    ],
+}
+
+
+# 더 이상 쓰지 않는 인덱스 (위 인덱스로 대체됨, 있으면 삭제)
+OBSOLETE_INDEXES: Dict[str, List[str]] = {
+    "payments": ["user_id_created_at", "status_created_at", "created_at"],
+    # status $in 부분 인덱스 (MongoDB 6.0 미만에서 생성 불가) -> designer_active_slot_unique
+    "reservations": ["designer_slot_unique"],
+}
+
+# 없으면 기동을 중단하는 인덱스 (데이터 정합성을 인덱스에만 의존)
+REQUIRED_INDEXES: Dict[str, List[str]] = {
+    "reservations": [SLOT_UNIQUE_INDEX],
+}
+
+
+def _sample_query_plans() -> List[dict]:
+    """repository/service/scheduler의 주요 조회를 대표하는 쿼리 (explain 용)"""
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "name": "reservation_list_service",
+            "collection": "reservations",
+            "filter": {
+                "designer_id": ObjectId(),
+                "reservation_date_time": {"$gte": "202501010000", "$lte": "202504012359"},
+                "del_yn": "N",
+            },
+        },
+        {
+            "name": "get_reservations_list_by_user_id",
+            "collection": "reservations",
+            "filter": {"user_id": ObjectId()},
+            "sort": [("reservation_date_time", DESCENDING)],
+        },
+        {
+            "name": "delete_waiting_reservations",
+            "collection": "reservations",
+            "filter": {"status": "결제대기", "del_yn": "N", "payment_deadline": {"$lt": now}},
+        },
+        {
+            "name": "get_user_by_email",
+            "collection": "users",
+            "filter": {"email": "explain@harmari"},
+        },
+        {
+            "name": "list_payments(user_id)",
+            "collection": "payments",
+            "filter": {"user_id": "explain"},
+            "sort": [("created_at", DESCENDING), ("_id", DESCENDING)],
+        },
+        {
+            "name": "list_payments(status)",
+            "collection": "payments",
+            "filter": {"status": "completed"},
+            "sort": [("created_at", DESCENDING), ("_id", DESCENDING)],
+        },
+        {
+            "name": "list_payments(cursor)",
+            "collection": "payments",
+            "filter": {
+                "$or": [
+                    {"created_at": {"$lt": now}},
+                    {"created_at": now, "_id": {"$lt": ObjectId()}},
+                ],
+            },
+            "sort": [("created_at", DESCENDING), ("_id", DESCENDING)],
+        },
+        {
+            "name": "job_queue_claim",
+            "collection": JOB_COLLECTION,
+            "filter": {
+                "$or": [
+                    {"status": JOB_PENDING, "run_at": {"$lte": now}},
+                    {"status": JOB_RUNNING, "locked_until": {"$lt": now}},
+                ],
+            },
+            "sort": [("run_at", ASCENDING)],
+        },
+        {
+            "name": "metrics_analyzer",
+            "collection": "metrics",
+            "filter": {"timestamp": {"$gte": now}},
+        },
+    ]
+
+
+def _find_stages(plan, stage_name: str) -> bool:
+    """explain 결과에서 stage_name 단계가 있는지 재귀 탐색"""
+    if isinstance(plan, dict):
+        if plan.get("stage") == stage_name:
+            return True
+        return any(_find_stages(value, stage_name) for value in plan.values())
+    if isinstance(plan, list):
+        return any(_find_stages(item, stage_name) for item in plan)
+    return False
+
+
+async def _sync_ttl(db, collection_name: str, model: IndexModel, existing: dict):
+    """보관 기간 설정이 바뀐 TTL 인덱스는 collMod 로 expireAfterSeconds 만 변경
+
+    create_indexes 는 같은 이름에 옵션만 다른 인덱스를 IndexOptionsConflict 로 거부하므로
+    설정을 바꿔도 기존 TTL이 그대로 남는다.
+    """
+    name = model.document["name"]
+    expire = model.document.get("expireAfterSeconds")
+    current = existing.get(name)
+    if expire is None or current is None or current.get("expireAfterSeconds") in (None, expire):
+        return
+    await db.command({"collMod": collection_name, "index": {"name": name, "expireAfterSeconds": expire}})
+    logger.info("TTL 변경 %s.%s: %s -> %s초", collection_name, name, current.get("expireAfterSeconds"), expire)
+
+
+async def backfill_active_slot(db):
+    """active_slot 필드가 없는 기존 예약에 채워넣음 (슬롯 unique 인덱스 생성 전)"""
+    await db["reservations"].update_many(
+        {"active_slot": {"$exists": False}, "del_yn": "N", "status": {"$in": ACTIVE_SLOT_STATUSES}},
+        {"$set": {"active_slot": True}},
+    )
+    await db["reservations"].update_many({"active_slot": {"$exists": False}}, {"$set": {"active_slot": False}})
+
+
+async def verify_required_indexes(db=None):
+    """필수 인덱스가 없으면 예외 (생성 실패: 서버 버전 / 기존 중복 데이터)"""
+    db = db if db is not None else get_database()
+    missing = []
+    for collection_name, names in REQUIRED_INDEXES.items():
+        existing = await db[collection_name].index_information()
+        missing.extend(f"{collection_name}.{name}" for name in names if name not in existing)
+    if missing:
+        raise RuntimeError(
+            f"필수 인덱스가 없습니다: {missing} (인덱스 생성 실패 로그 확인, 중복 예약 데이터가 있으면 정리 후 재시작)"
+        )
+
+
+async def ensure_indexes(db=None):
+    """선언된 인덱스 생성 (이미 있으면 no-op, TTL 보관 기간 변경은 반영)"""
+    db = db if db is not None else get_database()
+    await backfill_active_slot(db)
+    for collection_name, models in INDEXES.items():
+        try:
+            existing = await db[collection_name].index_information()
+        except PyMongoError:
+            existing = {}
+        for model in models:
+            try:
+                await _sync_ttl(db, collection_name, model, existing)
+                await db[collection_name].create_indexes([model])
+            except OperationFailure as e:
+                # 같은 이름/키로 옵션이 다른 인덱스가 있거나, unique 위반 데이터가 있는 경우
+                logger.warning(
+                    "인덱스 생성 실패 %s.%s: %s", collection_name, model.document["name"], str(e)
+                )
+
+    for collection_name, names in OBSOLETE_INDEXES.items():
+        try:
+            existing = await db[collection_name].index_information()
+            for name in names:
+                if name in existing:
+                    await db[collection_name].drop_index(name)
+                    logger.info("사용하지 않는 인덱스 삭제 %s.%s", collection_name, name)
+        except PyMongoError as e:
+            logger.warning("인덱스 삭제 실패 %s: %s", collection_name, str(e))
+
+
+async def verify_query_plans(db=None) -> List[str]:
+    """주요 쿼리를 explain 해서 COLLSCAN 이면 경고 (INDEX_PLAN_CHECK=fail 이면 예외)"""
+    db = db if db is not None else get_database()
+    collscans = []
+    for query in _sample_query_plans():
+        cursor = db[query["collection"]].find(query["filter"])
+        if query.get("sort"):
+            cursor = cursor.sort(query["sort"])
+        try:
+            explain = await cursor.explain()
+        except OperationFailure as e:
+            logger.warning("explain 실패 %s: %s", query["name"], str(e))
+            continue
+
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        if _find_stages(winning_plan, "COLLSCAN"):
+            collscans.append(query["name"])
+            logger.warning("COLLSCAN 쿼리 발견: %s (%s)", query["name"], query["collection"])
+
+    if collscans and settings.INDEX_PLAN_CHECK == "fail":
+        raise RuntimeError(f"인덱스를 사용하지 않는 쿼리가 있습니다: {collscans}")
+    return collscans
+
+
+async def bootstrap_indexes():
+    """애플리케이션 시작 시 인덱스 생성 + 쿼리 플랜 검증"""
+    try:
+        await ensure_indexes()
+        # 중복 예약 방지 인덱스가 없으면 기동 중단 (RuntimeError는 아래에서 잡지 않음)
+        await verify_required_indexes()
+        if settings.INDEX_PLAN_CHECK != "off":
+            await verify_query_plans()
+    except PyMongoError as e:
+        # DB 연결 문제로 서버 기동이 막히지 않도록 로그만 남김
+        logger.error("인덱스 bootstrap 실패: %s", str(e))
@@ -1,14 +1,143 @@
+import importlib
 import logging
+from typing import List
+
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from pymongo.read_preferences import read_pref_mode_from_name, make_read_preference
 from app.core.config import settings
+from app.core.metrics_registry import MONGO_POOL_CHECKOUT_DURATION, MONGO_POOL_CHECKOUT_FAILURES, \
+    MONGO_POOL_CONNECTIONS
+from app.core.request_timing import CommandTimingListener
+from app.analytics.query_profiler import QueryProfilerListener, query_profiler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """커넥션 풀 이벤트 -> /metrics (Motor 실행 스레드에서 호출됨)"""
+
+    def __init__(self, client_name: str):
+        self.client_name = client_name
+
+    def connection_created(self, event):
+        MONGO_POOL_CONNECTIONS.inc(self.client_name, "open")
+
+    def connection_closed(self, event):
+        MONGO_POOL_CONNECTIONS.dec(self.client_name, "open")
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_CONNECTIONS.inc(self.client_name, "in_use")
+        MONGO_POOL_CHECKOUT_DURATION.observe(event.duration, self.client_name)
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_CONNECTIONS.dec(self.client_name, "in_use")
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_CHECKOUT_FAILURES.inc(self.client_name, str(event.reason))
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+
+# 압축 방식별 필요한 패키지 (zlib은 표준 라이브러리)
+COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def available_compressors(names: str) -> List[str]:
+    """설정한 압축 방식 중 패키지가 설치된 것만 (없는 방식을 넘기면 서버 협상 전에 pymongo가 실패)"""
+    compressors = []
+    for name in [name.strip() for name in names.split(",") if name.strip()]:
+        module = COMPRESSOR_MODULES.get(name)
+        if module is None:
+            logger.warning("지원하지 않는 MongoDB 압축 방식: %s", name)
+            continue
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            logger.warning("MongoDB 압축 %s 사용 불가 (%s 패키지 없음)", name, module)
+            continue
+        compressors.append(name)
+    return compressors
+
+
+def client_options(max_pool_size: int, socket_timeout_ms: int, compressors: List[str]) -> dict:
+    """AsyncIOMotorClient 공통 옵션 (풀 / 타임아웃 / 압축)"""
+    options = {
+        "maxPoolSize": max_pool_size,
+        "minPoolSize": min(settings.MONGO_MIN_POOL_SIZE, max_pool_size),
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        # 풀이 가득 찼을 때 연결을 기다리는 최대 시간 (초과 시 WaitQueueTimeoutError)
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        # 0이면 제한 없음
+        "socketTimeoutMS": socket_timeout_ms,
+    }
+    if compressors:
+        options["compressors"] = compressors
+    return options
+
+
+def event_listeners(client_name: str) -> list:
+    listeners = [PoolMetricsListener(client_name), CommandTimingListener()]
+    if settings.SLOW_QUERY_PROFILER_ENABLED:
+        listeners.append(QueryProfilerListener(query_profiler, client_name))
+    return listeners
+
+
+def analytics_read_preference():
+    """BI / 분석 조회 read preference (maxStalenessSeconds: 이보다 뒤처진 secondary는 제외, -1이면 제한 없음)"""
+    mode = read_pref_mode_from_name(settings.MONGO_ANALYTICS_READ_PREFERENCE)
+    if mode == 0:
+        # primary 는 max_staleness 를 지정할 수 없음
+        return make_read_preference(mode, None)
+    return make_read_preference(mode, None, settings.MONGO_ANALYTICS_MAX_STALENESS_SECONDS)
+
+
 try:
     logger.info("Connecting to the database...")
-    client = AsyncIOMotorClient(settings.DATABASE_URL)
+    compressors = available_compressors(settings.MONGO_COMPRESSORS)
+    client = AsyncIOMotorClient(
+        settings.DATABASE_URL,
+        appname="harmari",
+        event_listeners=event_listeners("main"),
+        **client_options(settings.MONGO_MAX_POOL_SIZE, settings.MONGO_SOCKET_TIMEOUT_MS, compressors),
+    )
     database = client[settings.DATABASE_NAME]
+
+    # BI 집계가 예약 / 결제 요청의 커넥션 풀과 primary를 점유하지 않도록 별도 풀 + secondary 우선 조회
+    if settings.MONGO_ANALYTICS_SEPARATE_CLIENT:
+        analytics_client = AsyncIOMotorClient(
+            settings.DATABASE_URL,
+            appname="harmari-analytics",
+            event_listeners=event_listeners("analytics"),
+            **client_options(
+                settings.MONGO_ANALYTICS_MAX_POOL_SIZE, settings.MONGO_ANALYTICS_SOCKET_TIMEOUT_MS, compressors
+            ),
+        )
+    else:
+        analytics_client = client
+    analytics_database = analytics_client.get_database(
+        settings.DATABASE_NAME, read_preference=analytics_read_preference()
+    )
     logger.info("Database connection established successfully. DB Name: %s", settings.DATABASE_NAME)
 except Exception as e:
     logger.error("Failed to connect to the database: %s", e)
@@ -18,3 +147,8 @@ except Exception as e:
 def get_database():
     # logger.info("get_database() called")
     return database
+
+
+def get_analytics_database():
+    """BI / 분석 조회 전용 (읽기만, secondary에서 최대 MONGO_ANALYTICS_MAX_STALENESS_SECONDS 지연된 데이터일 수 있음)"""
+    return analytics_database
@@ -10,14 +10,26 @@ from fastapi.responses import JSONResponse, FileResponse
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 
-from app.api import test, reservation, auth, user, designer, bi, introduce, guide
+from app.api import test, reservation, auth, user, designer, bi, introduce, guide, images, metrics
+from app.core import request_timing
 from app.core.config import settings
-from app.db.session import get_database
+from app.core.http_client import EXTERNAL_HOSTS, http_clients
+from app.core.page_cache import page_cache
+from app.services.image_service import image_store
+from app.db.indexes import bootstrap_indexes
+from app.repository.designer_cache import designer_catalog
+from app.services.google_calendar_client import calendar_client
+from app.scheduler.job_queue import job_queue
+# 작업 큐 핸들러 등록 (calendar.create_event / calendar.delete_event)
+import app.services.calendar_sync_service  # noqa: F401
 # 결제
 from app.api.payment.router import router as payment_router
 from app.scheduler.schedulers import start_scheduler
 from app.middleware.cors_middleware import CorsMiddleware
-from app.middleware.metrics_middleware import MetricsMiddleware
+from app.middleware.metrics_middleware import MetricsMiddleware, metrics_writer
+from app.analytics.error_recorder import error_recorder
+from app.analytics.query_profiler import query_profiler
+from app.services.click_event_service import click_writer
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -29,10 +41,33 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 애플리케이션 시작 시 실행
+    await bootstrap_indexes()
+    http_clients.start(EXTERNAL_HOSTS)
+    await image_store.load()
+    await metrics_writer.start()
+    await error_recorder.start()
+    await click_writer.start()
+    query_profiler.start()
+    designer_catalog.start_watch()
+    # dev 모드에서만 템플릿 변경 감시
+    page_cache.start_watch()
     start_scheduler()
+    job_queue.start()
     # logger.info("Scheduler started on application startup.")
     yield  # 이 시점 이후에 애플리케이션 실행
     # 애플리케이션 종료 시 실행
+    await designer_catalog.stop_watch()
+    await page_cache.stop_watch()
+    # 처리 중인 작업 마무리 (남은 작업은 DB에 남아 재시작 후 처리)
+    await job_queue.stop()
+    # 큐에 남아있는 메트릭스 flush
+    await metrics_writer.stop()
+    await error_recorder.stop()
+    await click_writer.stop()
+    await query_profiler.stop()
+    # 외부 API keep-alive 연결 정리
+    await http_clients.aclose()
+    calendar_client.shutdown()
     # logger.info("Application shutdown.")
 
 
@@ -40,38 +75,20 @@ app = FastAPI(title="할머리?머리하실?", description="API Documentation",
 
 
 
-db = get_database()
-
 # 미들웨어 설정
 app.add_middleware(CorsMiddleware) # type: ignore
 app.add_middleware(MetricsMiddleware) # type: ignore
 
-# 에러 로깅
+# 에러 로깅 (fingerprint별 집계 후 요약 + 샘플만 배치 적재)
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    # 에러 정보 생성
-    error_info = {
-        "path": request.url.path,
-        "method": request.method,
-        "headers": dict(request.headers),
-        "error_message": str(exc),
-        "timestamp": settings.CURRENT_DATETIME,
-    }
-
-    # MongoDB에 에러 저장
-    try:
-        db["error"].insert_one(error_info)
-    except Exception as db_exc:
-        logger.error("Failed to log error to MongoDB: %s", str(db_exc))
-
-    # 시스템 콘솔에 로그 출력
-    logger.error(
-        "ERROR::::::::::: %s\nPath: %s\nMethod: %s\nHeaders: %s\nTimestamp: %s",
-        str(exc),
-        request.url.path,
-        request.method,
-        dict(request.headers),
-        settings.CURRENT_DATETIME,
+    error_recorder.record(
+        path=request.url.path,
+        method=request.method,
+        status_code=500,
+        message=str(exc),
+        headers=request.headers,
+        error_type=type(exc).__name__,
     )
 
     # 클라이언트로 응답
@@ -85,31 +102,13 @@ async def global_exception_handler(request: Request, exc: Exception):
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    # 에러 정보 생성
-    error_info = {
-        "path": request.url.path,
-        "method": request.method,
-        "headers": dict(request.headers),
-        "status_code": exc.status_code,
-        "error_message": exc.detail,
-        "timestamp": settings.CURRENT_DATETIME,
-    }
-
-    # MongoDB에 에러 저장
-    try:
-        db["error"].insert_one(error_info)
-    except Exception as db_exc:
-        logger.error("Failed to log HTTPException to MongoDB: %s", str(db_exc))
-
-    # 시스템 콘솔에 로그 출력
-    logger.error(
-        "HTTPException ::::::::: %s\nPath: %s\nMethod: %s\nHeaders: %s\nStatus: %s\nTimestamp: %s",
-        exc.detail,
-        request.url.path,
-        request.method,
-        dict(request.headers),
-        exc.status_code,
-        settings.CURRENT_DATETIME,
+    error_recorder.record(
+        path=request.url.path,
+        method=request.method,
+        status_code=exc.status_code,
+        message=str(exc.detail),
+        headers=request.headers,
+        error_type="HTTPException",
     )
 
     # 클라이언트로 응답
@@ -126,7 +125,8 @@ images_directory = os.path.join(os.getcwd(), "images")
 if not os.path.exists(images_directory):
     os.makedirs(images_directory)
 
-# 외부에서 '/static'경로로 접근할 수 있음 -> images 폴더
+# 외부에서 '/static'경로로 접근할 수 있음 -> images 폴더 (기존 URL 호환)
+# 새 페이지는 /images/manifest 의 content-hash URL (파생본, immutable 캐시) 사용
 app.mount("/static", StaticFiles(directory=os.path.join(os.getcwd(), "images")), name="static")
 
 # endpoint 설정하는 부분 하단에 import 후 추가
@@ -139,13 +139,13 @@ app.include_router(designer.designer_router, prefix="/designers", tags=["designe
 app.include_router(bi.router, prefix="/bi", tags=["BI"])
 app.include_router(introduce.router, prefix="/introduce", tags=["introduce"])
 app.include_router(guide.router, prefix="/guide", tags=["guide"])
+app.include_router(images.router, prefix="/images", tags=["images"])
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 
 # 결제 
 app.include_router(payment_router)
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    return """
+page_cache.register_html("home", """
     <html>
         <head>
             <title>Home</title>
@@ -156,8 +156,15 @@ async def root():
             <p><a href="/bi/dashboard">bi</a></p>
         </body>
     </html>
-    """
+    """)
+
+@app.get("/", response_class=HTMLResponse)
+async def root(request: Request):
+    return page_cache.response(request, "home")
 
 @app.get("/favicon.ico", include_in_schema=False)
 async def favicon():
     return FileResponse("favicon.ico")
+
+# 모든 라우트 등록 후: 엔드포인트 함수 실행 구간 기록 (Server-Timing parse / app / serialize)
+request_timing.instrument_routes(app)
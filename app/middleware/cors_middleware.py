@@ -1,7 +1,5 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
-from starlette.responses import Response
-from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from app.core.config import settings
 import logging
 
@@ -9,9 +7,9 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class CorsMiddleware(BaseHTTPMiddleware):
+class CorsMiddleware:
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
+        self.app = app
         # 여러 URL이 있을 경우 쉼표로 구분하여 설정값을 읽음
         self.allowed_origins = [url.strip() for url in settings.FRONTEND_URL.split(",")]
         self.allow_methods = ["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"]
@@ -20,26 +18,45 @@ class CorsMiddleware(BaseHTTPMiddleware):
         self.allow_credentials = True
         self.max_age = 3600
 
-    async def dispatch(self, request: Request, call_next):
+        # origin을 제외한 CORS 헤더는 요청마다 동일하므로 미리 만들어둠
+        self.static_headers = {
+            "Access-Control-Allow-Methods": ", ".join(self.allow_methods),
+            "Access-Control-Allow-Headers": ", ".join(self.allow_headers),
+            "Access-Control-Expose-Headers": ", ".join(self.expose_headers),
+            "Access-Control-Allow-Credentials": str(self.allow_credentials).lower(),
+            "Access-Control-Max-Age": str(self.max_age),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         # 클라이언트의 origin 헤더를 확인
-        origin = request.headers.get("origin")
+        origin = Headers(scope=scope).get("origin")
         chosen_origin = origin if origin in self.allowed_origins else self.allowed_origins[0]
-        request.state.client_origin = chosen_origin  # 필요 시 앱에서 사용
+        # request.state.client_origin 으로 앱에서 사용
+        scope.setdefault("state", {})["client_origin"] = chosen_origin
+
+        # preflight OPTIONS 요청은 앱에 진입하지 않고 바로 응답
+        if scope["method"] == "OPTIONS":
+            message = {"type": "http.response.start", "status": 200, "headers": []}
+            self.set_cors_headers(message, chosen_origin)
+            MutableHeaders(scope=message)["Content-Length"] = "0"
+            await send(message)
+            await send({"type": "http.response.body", "body": b""})
+            return
 
-        # logger.info("Request cookies: %s", request.cookies)
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                self.set_cors_headers(message, chosen_origin)
+            await send(message)
 
-        # preflight OPTIONS 요청인 경우, 빈 응답을 생성합니다.
-        if request.method == "OPTIONS":
-            response = Response(status_code=200)
-        else:
-            response = await call_next(request)
+        await self.app(scope, receive, send_wrapper)
 
+    def set_cors_headers(self, message: Message, origin: str):
         # CORS 헤더 설정
-        response.headers["Access-Control-Allow-Origin"] = chosen_origin
-        response.headers["Access-Control-Allow-Methods"] = ", ".join(self.allow_methods)
-        response.headers["Access-Control-Allow-Headers"] = ", ".join(self.allow_headers)
-        response.headers["Access-Control-Expose-Headers"] = ", ".join(self.expose_headers)
-        response.headers["Access-Control-Allow-Credentials"] = str(self.allow_credentials).lower()
-        response.headers["Access-Control-Max-Age"] = str(self.max_age)
-
-        return response
+        headers = MutableHeaders(scope=message)
+        headers["Access-Control-Allow-Origin"] = origin
+        for key, value in self.static_headers.items():
+            headers[key] = value
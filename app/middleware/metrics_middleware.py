@@ -1,91 +1,178 @@
 import time
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from app.db.session import get_database
-from app.core.config import settings
-from typing import Optional
 import json
+import logging
 from datetime import datetime
-from fastapi.encoders import jsonable_encoder  # new import
-
-class MetricsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
-        # 요청 바디 캡처 (결제, 예약 등 중요 데이터)
-        request_body: Optional[dict] = None
-        if request.method in ["POST", "PUT", "PATCH"]:
-            try:
-                raw_body = await request.body()
-                request_body = json.loads(raw_body)
-            except:
-                request_body = None
-        
-        # 응답 처리
+from typing import Optional
+
+import pytz
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.batch_writer import BatchWriter
+from app.core.config import settings
+from app.core import request_timing
+from app.core.metrics_registry import HTTP_REQUEST_DURATION, HTTP_REQUESTS, HTTP_REQUESTS_IN_PROGRESS, status_class
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+kst = pytz.timezone("Asia/Seoul")
+
+# 요청마다 insert_one 하지 않고 배치로 모아서 저장
+metrics_writer = BatchWriter(
+    "metrics",
+    max_queue_size=settings.METRICS_QUEUE_MAX_SIZE,
+    batch_size=settings.METRICS_BATCH_SIZE,
+    flush_interval=settings.METRICS_FLUSH_INTERVAL_SECONDS,
+)
+
+# 요청 바디를 캡처하는 메서드 (결제, 예약 등 중요 데이터)
+BODY_CAPTURE_METHODS = ("POST", "PUT", "PATCH")
+
+# 요청 문서를 저장하지 않는 경로 (Prometheus scrape)
+SKIP_STORE_PATHS = ("/metrics",)
+
+
+def route_template(scope: Scope, root_path: str) -> str:
+    """라우팅된 경로 템플릿 (/reservation/{id} 형태, 라벨 개수가 경로 수만큼으로 제한됨)"""
+    route = scope.get("route")
+    if route is not None and getattr(route, "path", None):
+        return route.path
+    mounted = scope.get("root_path", "")
+    if mounted != root_path:
+        # StaticFiles 등 mount
+        return f"{mounted[len(root_path):]}/{{path}}"
+    return "<unmatched>"
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.max_body_capture = settings.METRICS_BODY_CAPTURE_BYTES
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        response_status = 500
+        root_path = scope.get("root_path", "")
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        timing_token = request_timing.start()
+        timing = request_timing.current()
+        # 단계별 시간은 응답 시작 시점 기준 (Server-Timing 헤더와 저장 문서가 같은 값)
+        stages = None
+
+        # 요청 바디는 앱으로 그대로 흘려보내고, 앞부분(max_body_capture 바이트)만 복사해둠
+        body_prefix = bytearray()
+        body_state = {"size": 0, "complete": False}
+        capture_body = scope["method"] in BODY_CAPTURE_METHODS
+
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                body_state["size"] += len(chunk)
+                remaining = self.max_body_capture - len(body_prefix)
+                if remaining > 0 and chunk:
+                    body_prefix.extend(chunk[:remaining])
+                if not message.get("more_body", False):
+                    body_state["complete"] = True
+            return message
+
+        async def send_wrapper(message: Message):
+            nonlocal response_status, stages
+            if message["type"] == "http.response.start":
+                response_status = message["status"]
+                stages = timing.breakdown(time.perf_counter())
+                if settings.SERVER_TIMING_ENABLED:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", request_timing.server_timing_header(stages))
+            await send(message)
+
         try:
-            response = await call_next(request)
-            response_status = response.status_code
-        except Exception as e:
-            response_status = 500
-            raise e
+            await self.app(scope, receive_wrapper if capture_body else receive, send_wrapper)
         finally:
-            process_time = time.time() - start_time
-            
-            # 현재 시간을 datetime 객체로 가져오기 (convert from string if necessary)
-            current_time_str = settings.CURRENT_DATETIME
-            current_time = datetime.fromisoformat(current_time_str) if isinstance(current_time_str, str) else current_time_str
-            
-            # 상세 메트릭스 수집
-            path_parts = request.url.path.split('/')
-            endpoint_category = path_parts[1] if len(path_parts) > 1 else 'root'
-            
-            metrics_data = {
-                # 기본 요청 정보
-                "timestamp": current_time,
-                "path": request.url.path,
-                "endpoint_category": endpoint_category,
-                "method": request.method,
-                "status_code": response_status,
-                "process_time_ms": round(process_time * 1000, 2),
-                
-                # 클라이언트 정보
-                "client_info": {
-                    "ip": request.client.host if request.client else None,
-                    "user_agent": request.headers.get("user-agent"),
-                    "referer": request.headers.get("referer"),
-                    "accept_language": request.headers.get("accept-language"),
-                },
-                
-                # 요청 상세
-                "request_details": {
-                    "query_params": dict(request.query_params),
-                    "headers": dict(request.headers),
-                    "cookies": dict(request.cookies),
-                    "body": request_body if request_body else None,
-                },
-                
-                # 성능 메트릭스
-                "performance": {
-                    "total_time_ms": round(process_time * 1000, 2),
-                    "time_of_day": current_time.strftime("%H:%M"),
-                    "day_of_week": current_time.strftime("%A"),
-                },
-                
-                # 비즈니스 메트릭스
-                "business_metrics": {
-                    "is_payment_endpoint": endpoint_category == "payment",
-                    "is_reservation_endpoint": endpoint_category == "reservation",
-                    "is_auth_endpoint": endpoint_category == "auth",
-                    "is_error": response_status >= 400,
-                    "is_success": 200 <= response_status < 300,
-                }
+            process_time = time.perf_counter() - start_time
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            request_timing.reset(timing_token)
+            if stages is None:
+                stages = timing.breakdown(time.perf_counter())
+            labels = (route_template(scope, root_path), scope["method"], status_class(response_status))
+            HTTP_REQUESTS.inc(*labels)
+            HTTP_REQUEST_DURATION.observe(process_time, *labels)
+
+            if settings.METRICS_STORE_REQUESTS and scope["path"] not in SKIP_STORE_PATHS:
+                try:
+                    request_body = self.parse_body(body_prefix, body_state) if capture_body else None
+                    metrics_writer.enqueue(
+                        self.build_metrics(scope, response_status, process_time, request_body, stages))
+                except Exception as e:
+                    logger.error(f"Failed to log metrics: {str(e)}")
+
+    def parse_body(self, body_prefix: bytearray, body_state: dict) -> Optional[dict]:
+        # 바디 전체가 캡처 한도 안에 들어온 경우에만 JSON 파싱
+        if not body_prefix or not body_state["complete"] or body_state["size"] > self.max_body_capture:
+            return None
+        try:
+            body = json.loads(body_prefix)
+        except ValueError:
+            return None
+        return body if isinstance(body, dict) else None
+
+    def build_metrics(self, scope: Scope, response_status: int, process_time: float, request_body: Optional[dict],
+                      stages: Optional[dict] = None) -> dict:
+        request = Request(scope)
+        current_time = datetime.now(kst)
+
+        # 상세 메트릭스 수집
+        path = scope["path"]
+        path_parts = path.split('/')
+        endpoint_category = path_parts[1] if len(path_parts) > 1 else 'root'
+        client = scope.get("client")
+
+        return {
+            # 기본 요청 정보 (timestamp는 BSON date로 저장)
+            "timestamp": current_time,
+            "path": path,
+            "endpoint_category": endpoint_category,
+            "method": scope["method"],
+            "status_code": response_status,
+            "process_time_ms": round(process_time * 1000, 2),
+
+            # 클라이언트 정보
+            "client_info": {
+                "ip": client[0] if client else None,
+                "user_agent": request.headers.get("user-agent"),
+                "referer": request.headers.get("referer"),
+                "accept_language": request.headers.get("accept-language"),
+            },
+
+            # 요청 상세
+            "request_details": {
+                "query_params": dict(request.query_params),
+                "headers": dict(request.headers),
+                "cookies": dict(request.cookies),
+                "body": request_body if request_body else None,
+            },
+
+            # 성능 메트릭스
+            "performance": {
+                "total_time_ms": round(process_time * 1000, 2),
+                "time_of_day": current_time.strftime("%H:%M"),
+                "day_of_week": current_time.strftime("%A"),
+                # 단계별 시간 {parse / app / serialize / db / 외부 API / total: {"ms", "count"}}
+                "stages": stages,
+            },
+
+            # 비즈니스 메트릭스
+            "business_metrics": {
+                "is_payment_endpoint": endpoint_category == "payment",
+                "is_reservation_endpoint": endpoint_category == "reservation",
+                "is_auth_endpoint": endpoint_category == "auth",
+                "is_error": response_status >= 400,
+                "is_success": 200 <= response_status < 300,
             }
-            
-            # MongoDB에 저장
-            db = get_database()
-            try:
-                db["metrics"].insert_one(jsonable_encoder(metrics_data))
-            except Exception as e:
-                print(f"Failed to log metrics: {str(e)}")
-                
-        return response
+        }
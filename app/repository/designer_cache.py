@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+from cachetools import TTLCache
+from pymongo.errors import OperationFailure, PyMongoError
+
+from app.core.config import settings
+from app.db.session import get_database
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+# 상담료 bitset 버킷 크기 (원)
+FEE_BUCKET_SIZE = 10000
+
+
+def normalize_modes(available_modes) -> List[str]:
+    """available_modes 배열(신규) / "대면, 비대면" 문자열(마이그레이션 전) 모두 배열로 변환"""
+    if not available_modes:
+        return []
+    if isinstance(available_modes, str):
+        available_modes = available_modes.split(",")
+    return [str(mode).strip() for mode in available_modes if str(mode).strip()]
+
+
+def _iter_bits(bits: int):
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class FeeIndex:
+    """상담료 -> 디자이너 bitset (FEE_BUCKET_SIZE 단위 버킷)"""
+
+    def __init__(self, fees: List[Optional[int]]):
+        self.fees = fees
+        self.buckets: Dict[int, int] = {}
+        self.any = 0
+        for position, fee in enumerate(fees):
+            if fee is None:
+                continue
+            self.buckets[fee // FEE_BUCKET_SIZE] = self.buckets.get(fee // FEE_BUCKET_SIZE, 0) | (1 << position)
+            self.any |= 1 << position
+
+    def range(self, min_fee: Optional[int], max_fee: Optional[int]) -> int:
+        if min_fee is None and max_fee is None:
+            return self.any
+        low = min_fee if min_fee is not None else float("-inf")
+        high = max_fee if max_fee is not None else float("inf")
+
+        bits = 0
+        for bucket, bucket_bits in self.buckets.items():
+            bucket_low = bucket * FEE_BUCKET_SIZE
+            bucket_high = bucket_low + FEE_BUCKET_SIZE - 1
+            if bucket_high < low or bucket_low > high:
+                continue
+            if low <= bucket_low and bucket_high <= high:
+                # 버킷 전체가 범위 안
+                bits |= bucket_bits
+            else:
+                # 경계 버킷은 개별 확인
+                for position in _iter_bits(bucket_bits):
+                    if low <= self.fees[position] <= high:
+                        bits |= 1 << position
+        return bits
+
+
+class DesignerCatalog:
+    """디자이너 전체 목록 인메모리 캐시
+
+    디자이너 수는 적고 거의 바뀌지 않으므로 전체를 메모리에 올려두고
+    지역 / 상담 방식 / 상담료 버킷별 bitset을 만들어 필터 조합을 비트 AND로 계산한다.
+    TTL이 지나거나 invalidate() (change stream 또는 명시적 호출)로 버전이 바뀌면 다시 읽는다.
+    필터 조합별 결과는 같은 버전 안에서 최대 results_maxsize 개까지 메모이즈한다 (다시 로드하면 비움).
+    """
+
+    def __init__(self, ttl_seconds: float, results_maxsize: int):
+        self.ttl_seconds = ttl_seconds
+        self._designers: List[dict] = []
+        self._by_id: Dict[str, dict] = {}
+        self._region_bits: Dict[str, int] = {}
+        self._mode_bits: Dict[str, int] = {}
+        self._face_fees = FeeIndex([])
+        self._non_face_fees = FeeIndex([])
+        # 지역 조합 / 상담료 범위가 요청마다 달라질 수 있으므로 개수 제한
+        self._results: TTLCache = TTLCache(maxsize=results_maxsize, ttl=ttl_seconds)
+        self._version = 0
+        self._loaded_version = -1
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def invalidate(self):
+        """다음 조회 시 DB에서 다시 로드"""
+        self._version += 1
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_version == self._version
+            and time.monotonic() - self._loaded_at < self.ttl_seconds
+        )
+
+    async def _ensure_loaded(self):
+        if self._is_fresh():
+            return
+        async with self._lock:
+            if self._is_fresh():
+                return
+            version = self._version
+            designers = await get_database()["designers"].find({}).to_list(length=None)
+            self._build_index(designers)
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+            logger.info(f"디자이너 캐시 로드: {len(designers)} 건")
+
+    def _build_index(self, designers: List[dict]):
+        region_bits: Dict[str, int] = {}
+        mode_bits: Dict[str, int] = {}
+        for position, designer in enumerate(designers):
+            designer["available_modes"] = normalize_modes(designer.get("available_modes"))
+            bit = 1 << position
+            region = designer.get("region")
+            region_bits[region] = region_bits.get(region, 0) | bit
+            for mode in designer["available_modes"]:
+                mode_bits[mode.casefold()] = mode_bits.get(mode.casefold(), 0) | bit
+
+        self._designers = designers
+        self._by_id = {str(designer["_id"]): designer for designer in designers}
+        self._region_bits = region_bits
+        self._mode_bits = mode_bits
+        self._face_fees = FeeIndex([designer.get("face_consulting_fee") for designer in designers])
+        self._non_face_fees = FeeIndex([designer.get("non_face_consulting_fee") for designer in designers])
+        self._results.clear()
+
+    async def get(self, designer_id: str) -> Optional[dict]:
+        await self._ensure_loaded()
+        return self._by_id.get(designer_id.lower())
+
+    async def find(self,
+                   region: Optional[List[str]],
+                   available_modes: Optional[str],
+                   min_consulting_fee: Optional[int],
+                   max_consulting_fee: Optional[int]) -> List[dict]:
+        await self._ensure_loaded()
+
+        key = (
+            tuple(sorted(region)) if region else None,
+            available_modes,
+            min_consulting_fee,
+            max_consulting_fee,
+        )
+        cached = self._results.get(key)
+        if cached is not None:
+            return cached
+
+        bits = self._filter_bits(region, available_modes, min_consulting_fee, max_consulting_fee)
+        result = [self._designers[position] for position in _iter_bits(bits)]
+        self._results[key] = result
+        return result
+
+    def _filter_bits(self,
+                     region: Optional[List[str]],
+                     available_modes: Optional[str],
+                     min_fee: Optional[int],
+                     max_fee: Optional[int]) -> int:
+        # 지역 ("서울 전체" 또는 미지정이면 전체 지역)
+        regions = settings.DESIGNER_REGIONS if not region or "서울 전체" in region else region
+        bits = 0
+        for name in regions:
+            bits |= self._region_bits.get(name, 0)
+
+        # 상담 방식 (대소문자 무시)
+        if available_modes:
+            bits &= self._mode_bits.get(available_modes.casefold(), 0)
+
+        # 상담료 (대면/비대면 선택 시 해당 상담료, 아니면 둘 중 하나라도 범위 안)
+        if min_fee is None and max_fee is None:
+            return bits
+        if available_modes == "대면":
+            return bits & self._face_fees.range(min_fee, max_fee)
+        if available_modes == "비대면":
+            return bits & self._non_face_fees.range(min_fee, max_fee)
+        return bits & (self._face_fees.range(min_fee, max_fee) | self._non_face_fees.range(min_fee, max_fee))
+
+    async def _watch(self):
+        try:
+            async with get_database()["designers"].watch() as stream:
+                async for _ in stream:
+                    self.invalidate()
+        except OperationFailure as e:
+            # replica set이 아니면 change stream 사용 불가 -> TTL로만 갱신
+            logger.info(f"designers change stream 사용 불가, TTL 갱신만 사용: {e}")
+        except PyMongoError as e:
+            logger.warning(f"designers change stream 종료: {e}")
+
+    def start_watch(self):
+        if self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch(), name="designer-catalog-watch")
+
+    async def stop_watch(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+
+designer_catalog = DesignerCatalog(
+    ttl_seconds=settings.DESIGNER_CACHE_TTL_SECONDS,
+    results_maxsize=settings.DESIGNER_CACHE_RESULTS_MAXSIZE,
+)
@@ -0,0 +1,70 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from bson import ObjectId
+from cachetools import TTLCache
+from pymongo import DESCENDING
+
+from app.core.config import settings
+
+# 목록 정렬 순서 (indexes.py의 payments 인덱스와 동일해야 함)
+PAYMENT_LIST_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+# 필터별 전체 건수 캐시 (count_documents는 필터 범위를 모두 읽음)
+_count_cache: TTLCache = TTLCache(maxsize=1000, ttl=settings.PAYMENT_COUNT_CACHE_SECONDS)
+
+
+class InvalidCursorError(ValueError):
+    """해석할 수 없는 cursor 토큰"""
+
+
+def encode_cursor(payment: dict) -> str:
+    """마지막 결제의 (created_at, _id) -> 불투명 cursor 토큰"""
+    raw = json.dumps({"c": payment["created_at"].isoformat(), "i": str(payment["_id"])}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        return datetime.fromisoformat(data["c"]), ObjectId(data["i"])
+    except Exception:
+        raise InvalidCursorError("유효하지 않은 cursor 입니다.")
+
+
+async def find_payments_page(db, filter_query: dict, size: int, cursor: Optional[str]) -> Tuple[List[dict], Optional[str]]:
+    """(created_at, _id) keyset 페이지 조회 -> (결제 목록, 다음 cursor)
+
+    skip 없이 인덱스에서 cursor 위치부터 size + 1 건만 읽으므로 몇 번째 페이지든 비용이 같다.
+    """
+    query = dict(filter_query)
+    if cursor:
+        created_at, last_id = decode_cursor(cursor)
+        query["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": last_id}},
+        ]
+
+    payments = await db.payments.find(query).sort(PAYMENT_LIST_SORT).limit(size + 1).to_list(length=size + 1)
+    next_cursor = encode_cursor(payments[size - 1]) if len(payments) > size else None
+    return payments[:size], next_cursor
+
+
+async def count_payments(db, filter_query: dict) -> Tuple[int, bool]:
+    """(전체 건수, 추정치 여부)
+
+    필터가 없으면 컬렉션 메타데이터 기반 estimated_document_count,
+    있으면 count_documents 결과를 PAYMENT_COUNT_CACHE_SECONDS 동안 캐시한다.
+    """
+    if not filter_query:
+        return await db.payments.estimated_document_count(), True
+
+    key = tuple(sorted(filter_query.items()))
+    total = _count_cache.get(key)
+    if total is None:
+        total = await db.payments.count_documents(filter_query)
+        _count_cache[key] = total
+    return total, False
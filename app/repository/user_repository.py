@@ -16,6 +16,11 @@ async def get_user_by_email(email: str) -> UserDetailResponse:
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다.")
 
+    return to_user_detail(user)
+
+
+def to_user_detail(user: dict) -> UserDetailResponse:
+    """users 문서 -> UserDetailResponse"""
     return UserDetailResponse(
         user_id=str(user["_id"]),
         email=user["email"],
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ReturnDocument
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.core.metrics_registry import JOB_QUEUE_DURATION
+from app.db.session import get_database
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+JOB_COLLECTION = "jobs"
+
+# 작업 상태
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_DEAD = "dead"
+
+JobHandler = Callable[[dict], Awaitable[None]]
+DeadHandler = Callable[[dict, str], Awaitable[None]]
+
+
+class PermanentJobError(Exception):
+    """재시도해도 성공할 수 없는 실패 (바로 dead 처리)"""
+
+
+class JobQueue:
+    """MongoDB 기반 비동기 작업 큐 (외부 API 부수효과용)
+
+    - enqueue()는 jobs 컬렉션에 문서를 넣기만 하므로 요청 처리 시간에 외부 API 지연이 포함되지 않는다.
+    - 워커는 find_one_and_update로 작업을 하나씩 점유한다 (여러 프로세스가 떠 있어도 중복 실행 없음).
+      점유 후 lease 시간 안에 끝나지 않으면 (프로세스 종료 등) 다른 워커가 다시 가져간다.
+    - 실패 시 지수 backoff(+jitter)로 run_at을 미뤄 재시도하고, max_attempts를 넘기거나
+      PermanentJobError면 dead 상태로 남긴다 (dead-letter, 수동 확인용).
+    - concurrency_key(사용자 이메일 등)별 동시 실행 수를 프로세스 단위로 제한한다.
+    """
+
+    def __init__(self,
+                 workers: int,
+                 per_key_concurrency: int,
+                 max_attempts: int,
+                 backoff_base_seconds: float,
+                 backoff_max_seconds: float,
+                 lease_seconds: float,
+                 poll_interval_seconds: float):
+        self.workers = workers
+        self.per_key_concurrency = per_key_concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.lease_seconds = lease_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._dead_handlers: Dict[str, DeadHandler] = {}
+        self._running_keys: Dict[str, int] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    def register(self, job_type: str, handler: JobHandler, on_dead: Optional[DeadHandler] = None):
+        """작업 처리 함수 등록 (on_dead: 재시도를 모두 실패했을 때 호출)"""
+        self._handlers[job_type] = handler
+        if on_dead is not None:
+            self._dead_handlers[job_type] = on_dead
+
+    async def enqueue(self,
+                      job_type: str,
+                      payload: dict,
+                      concurrency_key: Optional[str] = None,
+                      delay_seconds: float = 0) -> str:
+        now = datetime.now(timezone.utc)
+        job = {
+            "type": job_type,
+            "payload": payload,
+            "concurrency_key": concurrency_key,
+            "status": JOB_PENDING,
+            "attempts": 0,
+            "max_attempts": self.max_attempts,
+            "run_at": now + timedelta(seconds=delay_seconds),
+            "created_at": now,
+            "updated_at": now,
+        }
+        result = await get_database()[JOB_COLLECTION].insert_one(job)
+        self._wakeup.set()
+        return str(result.inserted_id)
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max_seconds, self.backoff_base_seconds * (2 ** (attempts - 1)))
+        return delay * random.uniform(0.5, 1.0)
+
+    async def _claim(self) -> Optional[dict]:
+        now = datetime.now(timezone.utc)
+        saturated = [key for key, count in self._running_keys.items() if count >= self.per_key_concurrency]
+        query = {
+            "$or": [
+                {"status": JOB_PENDING, "run_at": {"$lte": now}},
+                # lease 만료 (워커가 죽은 경우)
+                {"status": JOB_RUNNING, "locked_until": {"$lt": now}},
+            ],
+            "type": {"$in": list(self._handlers)},
+        }
+        if saturated:
+            query["concurrency_key"] = {"$nin": saturated}
+
+        return await get_database()[JOB_COLLECTION].find_one_and_update(
+            query,
+            {
+                "$set": {
+                    "status": JOB_RUNNING,
+                    "locked_by": self.worker_id,
+                    "locked_until": now + timedelta(seconds=self.lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _finish(self, job: dict, error: Optional[Exception] = None, permanent: bool = False):
+        now = datetime.now(timezone.utc)
+        collection = get_database()[JOB_COLLECTION]
+        owner = {"_id": job["_id"], "status": JOB_RUNNING, "locked_by": self.worker_id}
+
+        if error is None:
+            await collection.update_one(
+                owner,
+                {"$set": {"status": JOB_DONE, "finished_at": now, "updated_at": now},
+                 "$unset": {"locked_by": "", "locked_until": ""}},
+            )
+            return
+
+        if permanent or job["attempts"] >= job.get("max_attempts", self.max_attempts):
+            logger.error(f"작업 dead 처리 {job['type']} {job['_id']} (시도 {job['attempts']}회): {error}")
+            await collection.update_one(
+                owner,
+                {"$set": {"status": JOB_DEAD, "last_error": str(error), "finished_at": now, "updated_at": now},
+                 "$unset": {"locked_by": "", "locked_until": ""}},
+            )
+            on_dead = self._dead_handlers.get(job["type"])
+            if on_dead is not None:
+                try:
+                    await on_dead(job["payload"], str(error))
+                except Exception as e:
+                    logger.error(f"dead 처리 콜백 실패 {job['type']} {job['_id']}: {e}")
+            return
+
+        delay = self._backoff(job["attempts"])
+        logger.warning(f"작업 실패 {job['type']} {job['_id']} (시도 {job['attempts']}회), {delay:.1f}초 후 재시도: {error}")
+        await collection.update_one(
+            owner,
+            {"$set": {"status": JOB_PENDING, "last_error": str(error),
+                      "run_at": now + timedelta(seconds=delay), "updated_at": now},
+             "$unset": {"locked_by": "", "locked_until": ""}},
+        )
+
+    async def _run(self, job: dict):
+        key = job.get("concurrency_key")
+        if key is not None:
+            self._running_keys[key] = self._running_keys.get(key, 0) + 1
+        try:
+            handler = self._handlers[job["type"]]
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(handler(job["payload"]), timeout=self.lease_seconds)
+            except PermanentJobError as e:
+                JOB_QUEUE_DURATION.observe(time.perf_counter() - started, job["type"], "dead")
+                await self._finish(job, e, permanent=True)
+            except Exception as e:
+                dead = job["attempts"] >= job.get("max_attempts", self.max_attempts)
+                JOB_QUEUE_DURATION.observe(time.perf_counter() - started, job["type"], "dead" if dead else "retry")
+                await self._finish(job, e)
+            else:
+                JOB_QUEUE_DURATION.observe(time.perf_counter() - started, job["type"], "done")
+                await self._finish(job)
+        finally:
+            if key is not None:
+                self._running_keys[key] -= 1
+                if self._running_keys[key] <= 0:
+                    del self._running_keys[key]
+
+    async def _worker(self, index: int):
+        while not self._stopping:
+            # 조회 전에 clear 해야 조회 직후 들어온 enqueue 알림을 놓치지 않음
+            self._wakeup.clear()
+            try:
+                job = await self._claim()
+            except PyMongoError as e:
+                logger.error(f"작업 조회 실패 (worker {index}): {e}")
+                job = None
+
+            if job is None:
+                # 새 작업이 enqueue 되거나 poll 주기가 지날 때까지 대기
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._run(job)
+            except PyMongoError as e:
+                # 상태 갱신 실패 -> lease 만료 후 재실행됨
+                logger.error(f"작업 상태 갱신 실패 {job['type']} {job['_id']}: {e}")
+
+    def start(self):
+        if self._tasks:
+            return
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._worker(index), name=f"job-worker-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"작업 큐 워커 시작: {self.workers}개 ({list(self._handlers)})")
+
+    async def stop(self, timeout: float = 10.0):
+        """진행 중인 작업은 timeout까지 기다리고, 남은 작업은 DB에 남아 재시작 후 처리"""
+        self._stopping = True
+        self._wakeup.set()
+        if not self._tasks:
+            return
+        done, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks = []
+
+
+job_queue = JobQueue(
+    workers=settings.JOB_WORKERS,
+    per_key_concurrency=settings.JOB_PER_KEY_CONCURRENCY,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    backoff_base_seconds=settings.JOB_BACKOFF_BASE_SECONDS,
+    backoff_max_seconds=settings.JOB_BACKOFF_MAX_SECONDS,
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+    poll_interval_seconds=settings.JOB_POLL_INTERVAL_SECONDS,
+)
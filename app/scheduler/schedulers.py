@@ -1,8 +1,12 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
+import functools
 import logging
+import time
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from app.core.config import settings
+from app.core.metrics_registry import SCHEDULER_JOB_DURATION
 from app.db.session import get_database
+from app.analytics.metrics_rollup import rollup_metrics
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -10,57 +14,61 @@ logging.basicConfig(level=logging.INFO)
 
 db = get_database()
 
-async def delete_temp_reservations():
 
-    # '임시예약' 상태이며 update_at이 현재로부터 1시간보다 이전인 예약 데이터 삭제처리
-    # logger.info("delete_temp_reservations start")
+def timed_job(func):
+    """작업 실행 시간 기록 (/metrics scheduler_job_duration_seconds)"""
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        result = "error"
+        try:
+            value = await func(*args, **kwargs)
+            result = "ok"
+            return value
+        finally:
+            SCHEDULER_JOB_DURATION.observe(time.perf_counter() - started, func.__name__, result)
+    return wrapper
 
-    # 현재 시간
-    now = datetime.fromisoformat(settings.CURRENT_DATETIME)
-    # 1시간 전 시간 계산
-    threshold = now - timedelta(hours=1)
-    threshold_str = threshold.isoformat()
 
-    delete_filter = {
-        "status": "임시예약",
-        "update_at": {"$lt": threshold_str}
-    }
+async def backfill_reservation_deadlines():
 
-    # 삭제 전 조건에 맞는 id조회
-    matching_docs = await db["reservations"].find(delete_filter, {"_id": 1}).to_list(length=None)
-    deleted_ids = [doc["_id"] for doc in matching_docs]
-    # logger.info(f"[{now.isoformat()}] 삭제할 _id들: {deleted_ids}")
+    # 만료 시각(date) 필드가 없는 기존 임시예약/결제대기 데이터에 update_at 기준으로 채워넣음
+    # 임시예약은 TTL 인덱스(expires_at)가, 결제대기는 delete_waiting_reservations가 처리
+    hold = settings.TEMP_RESERVATION_HOLD_MINUTES * 60 * 1000
+    waiting = settings.PAYMENT_WAITING_HOURS * 60 * 60 * 1000
+    base_date = {"$dateFromString": {"dateString": "$update_at", "onError": "$$NOW", "onNull": "$$NOW"}}
 
-    result = await db["reservations"].delete_many(delete_filter)
-    # logger.info(
-    #     f"[{now.isoformat()}] {result.deleted_count}건 임시예약 데이터 삭제."
-    # )
+    await db["reservations"].update_many(
+        {"status": "임시예약", "expires_at": {"$exists": False}},
+        [{"$set": {"expires_at": {"$add": [base_date, hold]}}}]
+    )
+    await db["reservations"].update_many(
+        {"status": "결제대기", "del_yn": "N", "payment_deadline": {"$exists": False}},
+        [{"$set": {"payment_deadline": {"$add": [base_date, waiting]}}}]
+    )
 
 
 async def delete_waiting_reservations():
 
-    # '결제대기' 상태이며 update_at이 현재로부터 24시간 이전인 예약 데이터 삭제 처리
+    # '결제대기' 상태이며 payment_deadline이 지난 예약 데이터 예약취소 처리
+    # payment_deadline 부분 인덱스로 대상만 조회하며 update_many 한번으로 처리
 
     # logger.info("delete_waiting_reservations start")
-    # 현재 시간
-    now = datetime.fromisoformat(settings.CURRENT_DATETIME)
-    # 24시간 전 시간 계산
-    threshold = now - timedelta(hours=24)
-    threshold_str = threshold.isoformat()
+    now = datetime.now(timezone.utc)
 
-    delete_filter = {
+    expire_filter = {
         "status": "결제대기",
-        "update_at": {"$lt": threshold_str},
-        "del_yn": "N"
+        "del_yn": "N",
+        "payment_deadline": {"$lt": now}
     }
 
-    # 업데이트 전에 조건에 맞는 _id 조회
-    matching_docs = await db["reservations"].find(delete_filter, {"_id": 1}).to_list(length=None)
-    update_ids = [doc["_id"] for doc in matching_docs]
-    # logger.info(f"[{now.isoformat()}] 예약대기 _ids: {update_ids}")
-
-    # 조건에 맞는 문서들의 del_yn을 "Y"로 업데이트
-    result = await db["reservations"].update_many(delete_filter, {"$set": {"status": "예약취소"}})
+    result = await db["reservations"].update_many(
+        expire_filter,
+        {
+            "$set": {"status": "예약취소", "active_slot": False, "update_at": settings.CURRENT_DATETIME},
+            "$unset": {"payment_deadline": ""}
+        }
+    )
     # logger.info(f"[{now.isoformat()}] {result.modified_count}건 예약대기 데이터 예약취소처리.")
 
 
@@ -68,17 +76,27 @@ async def delete_waiting_reservations():
 scheduler = AsyncIOScheduler()
 
 # 스케줄 추가영역
+# 임시예약 만료는 expires_at TTL 인덱스가 처리하므로 기존 데이터 보정만 시작 시 1회 실행
+scheduler.add_job(
+    timed_job(backfill_reservation_deadlines),
+    'date',
+    run_date=datetime.now(),
+    misfire_grace_time=None
+)
 scheduler.add_job(
-    delete_temp_reservations,
+    timed_job(delete_waiting_reservations),
     'interval',
     minutes=5,
     next_run_time=datetime.now()
 )
+# BI 대시보드용 메트릭스 rollup (watermark 이후 구간만 증분 집계)
 scheduler.add_job(
-    delete_waiting_reservations,
+    timed_job(rollup_metrics),
     'interval',
-    minutes=5,
-    next_run_time=datetime.now()
+    minutes=1,
+    next_run_time=datetime.now(),
+    max_instances=1,
+    coalesce=True
 )
 
 def start_scheduler():
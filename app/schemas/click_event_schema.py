@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class ClickEvent(BaseModel):
+    event_type: str = Field(..., min_length=1, max_length=100)
+    button_location: str = Field(..., min_length=1, max_length=100)
+    user_agent: Optional[str] = Field(None, max_length=1000)
+    referrer: Optional[str] = Field(None, max_length=2000)
+    # 클라이언트가 재전송할 때 중복 제거용 (선택)
+    event_id: Optional[str] = Field(None, max_length=64)
+
+
+class ClickEventBatchResponse(BaseModel):
+    status: str
+    accepted: int
+    duplicates: int
+    rejected: int
@@ -13,7 +13,7 @@ class Designer(BaseModel):
     face_consulting_fee: int
     non_face_consulting_fee: int
     introduction: str
-    available_modes: str
+    available_modes: List[str]
     create_at: datetime
     update_at: datetime
 
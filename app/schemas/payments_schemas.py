@@ -54,7 +54,9 @@ class PaymentCancelRequest(BaseModel):
 
 # 결제 목록 조회 응답 스키마
 class PaymentListResponse(BaseModel):
-    total: int = Field(..., description="전체 결제 수")
+    total: Optional[int] = Field(None, description="전체 결제 수 (include_total=false 이면 None)")
+    total_is_estimate: bool = Field(False, description="total이 추정치인지 여부 (필터 없는 경우)")
     payments: List[PaymentResponse] = Field(..., description="결제 목록")
     page: int = Field(..., description="현재 페이지")
-    size: int = Field(..., description="페이지 크기") 
\ No newline at end of file
+    size: int = Field(..., description="페이지 크기")
+    next_cursor: Optional[str] = Field(None, description="다음 페이지 cursor (마지막 페이지면 None)") 
\ No newline at end of file
@@ -39,6 +39,8 @@ class ReservationCreateResponse(BaseModel):
     status: str
     google_meet_link: str
     google_calendar_url: str
+    # 캘린더 이벤트 생성 상태 (pending -> done / failed), 대면 예약은 None
+    calendar_sync_status: Optional[str] = None
 
 
 class ReservationDetail(BaseModel):
@@ -49,6 +51,7 @@ class ReservationDetail(BaseModel):
     reservation_date_time: str
     consulting_fee: int
     google_meet_link: Optional[str] = None
+    calendar_sync_status: Optional[str] = None
     status: str
     create_at: str
     update_at: str
@@ -69,4 +72,16 @@ class GoogleMeetLinkResponse(BaseModel):
 
 class PayReadyRequest(BaseModel):
     designer_id: str
-    reservation_date_time: str
\ No newline at end of file
+    reservation_date_time: str
+
+class AvailabilityDay(BaseModel):
+    date: str
+    # 비트 i = 10:00 + 30분*i 슬롯 예약 가능 여부
+    free_bitmap: int
+    free_slots: List[str]
+
+
+class AvailabilityResponse(BaseModel):
+    designer_id: str
+    slot_minutes: int
+    days: List[AvailabilityDay]
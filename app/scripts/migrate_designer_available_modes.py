@@ -0,0 +1,38 @@
+# designers.available_modes 를 "대면, 비대면" 문자열에서 ["대면", "비대면"] 배열로 변환
+# 실행: python -m app.scripts.migrate_designer_available_modes
+import asyncio
+import logging
+
+from app.db.session import get_database
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def migrate():
+    db = get_database()
+    result = await db["designers"].update_many(
+        {"available_modes": {"$type": "string"}},
+        [
+            {
+                "$set": {
+                    "available_modes": {
+                        "$filter": {
+                            "input": {
+                                "$map": {
+                                    "input": {"$split": ["$available_modes", ","]},
+                                    "in": {"$trim": {"input": "$$this"}},
+                                }
+                            },
+                            "cond": {"$ne": ["$$this", ""]},
+                        }
+                    }
+                }
+            }
+        ],
+    )
+    logger.info(f"available_modes 배열 변환: {result.modified_count} 건")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
@@ -0,0 +1,81 @@
+# metrics / click_events 의 timestamp 를 ISO 문자열(settings.CURRENT_DATETIME)에서 BSON date로 변환
+# rollup / BI 조회 / TTL 인덱스는 date 타입만 대상으로 하므로, 변환 전 메트릭스는 대시보드에서 빠지고 만료되지 않음
+# 변환 후 rollup watermark를 가장 오래된 변환 문서 시각으로 되돌려 다음 rollup 실행 때 과거 구간도 집계되게 함
+# 실행: python -m app.scripts.migrate_metrics_timestamps
+import asyncio
+import logging
+from datetime import timezone
+
+from app.analytics.metrics_rollup import STATE_COLLECTION
+from app.db.session import get_database
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# "2025-02-01T12:34:56.123456+09:00" -> 마이크로초를 뺀 "2025-02-01T12:34:56+09:00"
+# ($dateFromString 이 밀리초보다 긴 소수 초를 받지 못하는 경우 대비)
+WITHOUT_FRACTION = {
+    "$concat": [
+        {"$substrCP": ["$timestamp", 0, 19]},
+        {"$substrCP": ["$timestamp", {"$subtract": [{"$strLenCP": "$timestamp"}, 6]}, 6]},
+    ]
+}
+
+
+# timestamp 가 ISO 문자열로 저장된 적이 있는 컬렉션
+COLLECTIONS = ("metrics", "click_events")
+
+
+async def convert_timestamps(db, collection_name: str) -> int:
+    """collection_name 의 문자열 timestamp -> date, 변환 건수 반환"""
+    result = await db[collection_name].update_many(
+        {"timestamp": {"$type": "string"}},
+        [
+            {
+                "$set": {
+                    "timestamp": {
+                        "$dateFromString": {
+                            "dateString": "$timestamp",
+                            # 변환 불가 형식은 그대로 두고 아래에서 건수만 로그
+                            "onError": {"$dateFromString": {"dateString": WITHOUT_FRACTION, "onError": "$timestamp"}},
+                        }
+                    }
+                }
+            }
+        ],
+    )
+    logger.info(f"{collection_name} timestamp date 변환: {result.modified_count} 건")
+
+    remaining = await db[collection_name].count_documents({"timestamp": {"$type": "string"}})
+    if remaining:
+        logger.warning(f"변환하지 못한 {collection_name} timestamp: {remaining} 건")
+    return result.modified_count
+
+
+async def migrate():
+    db = get_database()
+    # 변환할 문서 중 가장 오래된 시각 (문자열은 ISO 형식이라 정렬 순서 = 시간 순서, 오프셋은 모두 +09:00)
+    oldest = await db["metrics"].find_one(
+        {"timestamp": {"$type": "string"}}, {"timestamp": 1}, sort=[("timestamp", 1)]
+    )
+
+    modified = {collection_name: await convert_timestamps(db, collection_name) for collection_name in COLLECTIONS}
+
+    # metrics rollup 은 watermark 이후만 집계하므로 과거 구간을 다시 집계하도록 되돌림
+    if oldest is None or not modified["metrics"]:
+        return
+    converted = await db["metrics"].find_one(
+        {"_id": oldest["_id"], "timestamp": {"$type": "date"}}, {"timestamp": 1}
+    )
+    if converted is None:
+        return
+    # motor는 tz 정보가 없는 UTC datetime을 반환함
+    start = converted["timestamp"].replace(second=0, microsecond=0, tzinfo=timezone.utc)
+    state = await db[STATE_COLLECTION].find_one({"_id": "metrics"})
+    if state and state["watermark"].replace(tzinfo=timezone.utc) > start:
+        await db[STATE_COLLECTION].update_one({"_id": "metrics"}, {"$set": {"watermark": start}})
+        logger.info(f"metrics rollup watermark -> {start.isoformat()} (다음 rollup 실행 시 과거 구간 집계)")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
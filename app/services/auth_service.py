@@ -1,6 +1,7 @@
 import httpx
 from fastapi import HTTPException
 from app.core.config import settings
+from app.core.http_client import GOOGLE_API_CLIENT, GOOGLE_OAUTH_CLIENT, get_http_client
 
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
@@ -27,18 +28,17 @@ async def get_google_access_token(code: str) -> dict:
     """Google OAuth Access Token 요청"""
     try:
         # Google OAuth Access Token 요청
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "client_id": settings.GOOGLE_CLIENT_ID,
-                    "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                    "code": code,
-                    "redirect_uri": settings.GOOGLE_REDIRECT_URI,
-                    "grant_type": "authorization_code",
-                },
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
+        response = await get_http_client(GOOGLE_OAUTH_CLIENT).post(
+            GOOGLE_TOKEN_URL,
+            data={
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                "code": code,
+                "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+                "grant_type": "authorization_code",
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
         if response.status_code != 200:
             raise HTTPException(status_code=400, detail=f"Access Token을 가져올 수 없습니다: {response.text}")
         return response.json()
@@ -48,11 +48,10 @@ async def get_google_access_token(code: str) -> dict:
 async def get_google_user_info(access_token: str) -> dict:
     """Google 사용자 정보 요청"""
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                GOOGLE_USERINFO_URL,
-                headers={"Authorization": f"Bearer {access_token}"},
-            )
+        response = await get_http_client(GOOGLE_API_CLIENT).get(
+            GOOGLE_USERINFO_URL,
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
         if response.status_code != 200:
             raise HTTPException(status_code=400, detail=f"사용자 정보 오류: {response.text}")
         return response.json()
@@ -0,0 +1,226 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+import pytz
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.db.session import get_database
+from app.schemas.reservation_schema import AvailabilityDay, AvailabilityResponse
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+db = get_database()
+collection = db["designer_availability"]
+
+kst = pytz.timezone("Asia/Seoul")
+
+# 예약 가능 시간: 10:00 ~ 20:00, 30분 단위 (21 슬롯)
+FIRST_SLOT_HOUR = 10
+SLOT_MINUTES = 30
+SLOT_COUNT = 21
+FULL_MASK = (1 << SLOT_COUNT) - 1
+
+# 최대 조회 기간 (일)
+MAX_RANGE_DAYS = 93
+
+# 슬롯을 확정 점유하는 상태 (booked 비트), 만료 시각이 있는 상태 (holds)
+BOOKED_STATUSES = ("예약완료", "이용완료")
+HOLD_STATUSES = ("임시예약", "결제대기")
+
+
+def slot_index(reservation_date_time: str) -> Optional[int]:
+    """'YYYYMMDDHHMM' -> 슬롯 번호 (10:00 = 0 ... 20:00 = 20)"""
+    try:
+        hour = int(reservation_date_time[8:10])
+        minute = int(reservation_date_time[10:12])
+    except (TypeError, ValueError):
+        return None
+    if minute % SLOT_MINUTES != 0:
+        return None
+    index = (hour - FIRST_SLOT_HOUR) * (60 // SLOT_MINUTES) + minute // SLOT_MINUTES
+    return index if 0 <= index < SLOT_COUNT else None
+
+
+def slot_time(index: int) -> str:
+    """슬롯 번호 -> 'HHMM'"""
+    minutes = FIRST_SLOT_HOUR * 60 + index * SLOT_MINUTES
+    return f"{minutes // 60:02d}{minutes % 60:02d}"
+
+
+def _slot_key(designer_id, reservation_date_time: str):
+    index = slot_index(reservation_date_time)
+    if index is None:
+        return None, None
+    return {"designer_id": ObjectId(str(designer_id)), "date": reservation_date_time[:8]}, index
+
+
+async def _update_day(key: dict, update: dict):
+    """availability 문서에 hook 변경 반영
+
+    문서가 없으면(아직 조회되지 않은 날짜이거나 _materialize_days 가 진행 중) update가 아무것도 바꾸지 않는다.
+    진행 중인 _materialize_days 가 이 예약 변경 전의 reservations를 읽었다면 그 값이 그대로 저장되므로,
+    hook은 예약 변경 후에 호출된다는 점을 이용해 그날을 다시 계산해서 만들고 같은 변경을 한번 더 적용한다.
+    (먼저 만들어진 문서가 있으면 $setOnInsert 는 무시되고, 재적용으로 이 슬롯은 항상 최신 상태가 됨)
+    """
+    result = await collection.update_one(key, update)
+    if result.matched_count == 0:
+        await _materialize_days(key["designer_id"], [key["date"]])
+        await collection.update_one(key, update)
+
+
+async def mark_hold(designer_id, reservation_date_time: str, expires_at: datetime):
+    """임시예약/결제대기: 만료 시각까지만 유효한 점유"""
+    key, index = _slot_key(designer_id, reservation_date_time)
+    if key is None:
+        return
+    try:
+        await _update_day(key, {"$set": {f"holds.{index}": expires_at}})
+    except Exception as e:
+        logger.error(f"availability hold 갱신 실패 {key} {index}: {e}")
+
+
+async def mark_booked(designer_id, reservation_date_time: str):
+    """예약완료: booked 비트 설정"""
+    key, index = _slot_key(designer_id, reservation_date_time)
+    if key is None:
+        return
+    try:
+        await _update_day(key, {"$bit": {"booked": {"or": 1 << index}}, "$unset": {f"holds.{index}": ""}})
+    except Exception as e:
+        logger.error(f"availability booked 갱신 실패 {key} {index}: {e}")
+
+
+async def release_slot(designer_id, reservation_date_time: str):
+    """예약취소: booked 비트와 hold 모두 해제"""
+    key, index = _slot_key(designer_id, reservation_date_time)
+    if key is None:
+        return
+    try:
+        await _update_day(
+            key,
+            {"$bit": {"booked": {"and": FULL_MASK ^ (1 << index)}}, "$unset": {f"holds.{index}": ""}}
+        )
+    except Exception as e:
+        logger.error(f"availability 해제 실패 {key} {index}: {e}")
+
+
+async def apply_reservation_status(reservation: Dict):
+    """예약 문서의 현재 상태를 availability에 반영"""
+    designer_id = reservation.get("designer_id")
+    reservation_date_time = reservation.get("reservation_date_time")
+    if not designer_id or not reservation_date_time:
+        return
+
+    status = reservation.get("status")
+    if status in BOOKED_STATUSES:
+        await mark_booked(designer_id, reservation_date_time)
+    elif status == "임시예약" and reservation.get("expires_at"):
+        await mark_hold(designer_id, reservation_date_time, reservation["expires_at"])
+    elif status == "결제대기" and reservation.get("payment_deadline"):
+        await mark_hold(designer_id, reservation_date_time, reservation["payment_deadline"])
+    else:
+        await release_slot(designer_id, reservation_date_time)
+
+
+async def _materialize_days(designer_obj_id: ObjectId, dates: List[str]) -> Dict[str, dict]:
+    """availability 문서가 없는 날짜를 reservations에서 한번에 계산해서 생성"""
+    reservations = await db["reservations"].find(
+        {
+            "designer_id": designer_obj_id,
+            "reservation_date_time": {"$gte": dates[0] + "0000", "$lte": dates[-1] + "2359"},
+            "del_yn": "N",
+            "status": {"$in": list(BOOKED_STATUSES + HOLD_STATUSES)},
+        },
+        {"reservation_date_time": 1, "status": 1, "expires_at": 1, "payment_deadline": 1},
+    ).to_list(length=None)
+
+    days = {date: {"designer_id": designer_obj_id, "date": date, "booked": 0, "holds": {}} for date in dates}
+    for reservation in reservations:
+        day = days.get(reservation["reservation_date_time"][:8])
+        index = slot_index(reservation["reservation_date_time"])
+        if day is None or index is None:
+            continue
+        if reservation["status"] in BOOKED_STATUSES:
+            day["booked"] |= 1 << index
+        else:
+            expires_at = reservation.get("expires_at") or reservation.get("payment_deadline")
+            if expires_at:
+                day["holds"][str(index)] = expires_at
+
+    # 동시에 hook이 반영한 값을 덮어쓰지 않도록 $setOnInsert (hook은 문서가 없을 때 직접 다시 만들고 재적용, _update_day)
+    await collection.bulk_write(
+        [
+            UpdateOne(
+                {"designer_id": designer_obj_id, "date": date},
+                {"$setOnInsert": {"booked": day["booked"], "holds": day["holds"]}},
+                upsert=True,
+            )
+            for date, day in days.items()
+        ],
+        ordered=False,
+    )
+    return days
+
+
+async def get_availability(designer_id: str, start_date: str, end_date: str) -> AvailabilityResponse:
+    try:
+        designer_obj_id = ObjectId(designer_id)
+    except Exception:
+        raise ValueError("designer_id가 올바르지 않습니다.")
+
+    try:
+        start = datetime.strptime(start_date, "%Y%m%d").date()
+        end = datetime.strptime(end_date, "%Y%m%d").date()
+    except ValueError:
+        raise ValueError("날짜는 'YYYYMMDD' 형식이어야 합니다.")
+    if end < start:
+        raise ValueError("end_date는 start_date 이후여야 합니다.")
+    if (end - start).days >= MAX_RANGE_DAYS:
+        raise ValueError(f"조회 기간은 최대 {MAX_RANGE_DAYS}일입니다.")
+
+    dates = [(start + timedelta(days=offset)).strftime("%Y%m%d") for offset in range((end - start).days + 1)]
+
+    docs = await collection.find(
+        {"designer_id": designer_obj_id, "date": {"$gte": dates[0], "$lte": dates[-1]}},
+        {"date": 1, "booked": 1, "holds": 1},
+    ).to_list(length=None)
+    days = {doc["date"]: doc for doc in docs}
+
+    missing = [date for date in dates if date not in days]
+    if missing:
+        days.update(await _materialize_days(designer_obj_id, missing))
+
+    # motor는 tz 정보 없는 UTC datetime을 반환하므로 naive UTC로 비교
+    now_utc = datetime.now(timezone.utc).replace(tzinfo=None)
+    # 예약은 현재+30분 이후만 가능
+    bookable_from = datetime.now(kst) + timedelta(minutes=30)
+    today = bookable_from.strftime("%Y%m%d")
+
+    result = []
+    for date in dates:
+        day = days[date]
+        held = 0
+        for index, expires_at in (day.get("holds") or {}).items():
+            if expires_at.replace(tzinfo=None) > now_utc:
+                held |= 1 << int(index)
+        free = FULL_MASK & ~day.get("booked", 0) & ~held
+
+        if date < today:
+            free = 0
+        elif date == today:
+            for index in range(SLOT_COUNT):
+                if slot_time(index) <= bookable_from.strftime("%H%M"):
+                    free &= ~(1 << index)
+
+        result.append(
+            AvailabilityDay(
+                date=date,
+                free_bitmap=free,
+                free_slots=[slot_time(index) for index in range(SLOT_COUNT) if free & (1 << index)],
+            )
+        )
+
+    return AvailabilityResponse(designer_id=designer_id, slot_minutes=SLOT_MINUTES, days=result)
@@ -0,0 +1,155 @@
+import logging
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from google.auth.exceptions import RefreshError
+from googleapiclient.errors import HttpError
+
+from app.core.principal_cache import build_google_credentials, principal_cache
+from app.db.session import get_database
+from app.scheduler.job_queue import PermanentJobError, job_queue
+from app.services.google_calendar_client import calendar_client
+from app.services.google_service import add_event_to_user_calendar, delete_google_calendar_event, event_links
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+db = get_database()
+
+CREATE_EVENT_JOB = "calendar.create_event"
+DELETE_EVENT_JOB = "calendar.delete_event"
+
+# reservations.calendar_sync_status
+SYNC_PENDING = "pending"
+SYNC_DONE = "done"
+SYNC_FAILED = "failed"
+
+# 재시도해도 결과가 같은 응답 (408 timeout, 429 rate limit 제외)
+RETRYABLE_CLIENT_ERRORS = (408, 429)
+
+
+def calendar_event_id(reservation_id: str) -> str:
+    """예약 id로 고정된 이벤트 id (base32hex 문자만 허용 -> ObjectId hex 사용)"""
+    return str(reservation_id).lower()
+
+
+async def enqueue_calendar_create(reservation_id, user_email: str):
+    await job_queue.enqueue(
+        CREATE_EVENT_JOB,
+        {"reservation_id": str(reservation_id), "email": user_email},
+        concurrency_key=user_email,
+    )
+
+
+async def enqueue_calendar_delete(event_id: str, user_email: str):
+    await job_queue.enqueue(
+        DELETE_EVENT_JOB,
+        {"event_id": event_id, "email": user_email},
+        concurrency_key=user_email,
+    )
+
+
+async def _load_credentials(email: str):
+    user = await db["users"].find_one(
+        {"email": email}, {"google_access_token": 1, "google_refresh_token": 1}
+    )
+    if not user or not user.get("google_access_token") or not user.get("google_refresh_token"):
+        raise PermanentJobError(f"Google 인증 정보가 없습니다: {email}")
+    return build_google_credentials(user)
+
+
+async def _save_refreshed_token(email: str, credentials, previous_token: str):
+    # 실행 중 AuthorizedHttp가 access token을 갱신했으면 DB에 반영
+    if credentials.token and credentials.token != previous_token:
+        await db["users"].update_one(
+            {"email": email},
+            {"$set": {"google_access_token": credentials.token,
+                      "google_refresh_token": credentials.refresh_token}},
+        )
+        principal_cache.invalidate(email=email)
+
+
+def _raise_for_google_error(e: Exception):
+    if isinstance(e, RefreshError):
+        raise PermanentJobError(f"Google 토큰 갱신 실패: {e}")
+    if isinstance(e, HttpError) and 400 <= e.resp.status < 500 and e.resp.status not in RETRYABLE_CLIENT_ERRORS:
+        raise PermanentJobError(f"Google API 요청 오류 {e.resp.status}: {e}")
+    raise e
+
+
+async def create_calendar_event(payload: dict):
+    reservation_id = ObjectId(payload["reservation_id"])
+    reservation = await db["reservations"].find_one({"_id": reservation_id})
+    if not reservation or reservation.get("del_yn") != "N" or reservation.get("status") == "예약취소":
+        logger.info(f"취소된 예약, 캘린더 생성 생략: {reservation_id}")
+        return
+    if reservation.get("google_event_id"):
+        return
+
+    designer = await db["designers"].find_one({"_id": reservation["designer_id"]}) or {}
+    credentials = await _load_credentials(payload["email"])
+    previous_token = credentials.token
+    event_id = calendar_event_id(payload["reservation_id"])
+
+    try:
+        event_id, event_html_link, meet_link = await add_event_to_user_calendar(
+            payload["email"],
+            credentials=credentials,
+            event_date=reservation["reservation_date_time"],
+            designer_name=designer.get("name"),
+            designer_introduction=designer.get("introduction"),
+            designer_region=designer.get("region"),
+            designer_specialist=designer.get("specialties"),
+            designer_shop_address=designer.get("shop_address"),
+            mode=reservation.get("mode"),
+            event_id=event_id,
+        )
+    except HttpError as e:
+        if e.resp.status != 409:
+            _raise_for_google_error(e)
+        # 이전 시도에서 이미 생성됨 (응답 전에 실패한 경우)
+        event_id, event_html_link, meet_link = event_links(
+            await calendar_client.get_event(credentials, event_id)
+        )
+    except Exception as e:
+        _raise_for_google_error(e)
+    finally:
+        await _save_refreshed_token(payload["email"], credentials, previous_token)
+
+    result = await db["reservations"].update_one(
+        {"_id": reservation_id, "status": {"$ne": "예약취소"}},
+        {
+            "$set": {
+                "google_event_id": event_id,
+                "google_calendar_url": event_html_link,
+                "google_meet_link": meet_link,
+                "calendar_sync_status": SYNC_DONE,
+            }
+        },
+    )
+    if result.matched_count == 0:
+        # 이벤트 생성 중 예약이 취소됨 -> 생성한 이벤트 삭제
+        await enqueue_calendar_delete(event_id, payload["email"])
+
+
+async def mark_calendar_create_failed(payload: dict, error: str):
+    await db["reservations"].update_one(
+        {"_id": ObjectId(payload["reservation_id"])},
+        {"$set": {"calendar_sync_status": SYNC_FAILED, "calendar_sync_error": error,
+                  "calendar_sync_failed_at": datetime.now(timezone.utc)}},
+    )
+
+
+async def delete_calendar_event(payload: dict):
+    credentials = await _load_credentials(payload["email"])
+    previous_token = credentials.token
+    try:
+        await delete_google_calendar_event(payload["event_id"], credentials=credentials)
+    except Exception as e:
+        _raise_for_google_error(e)
+    finally:
+        await _save_refreshed_token(payload["email"], credentials, previous_token)
+
+
+job_queue.register(CREATE_EVENT_JOB, create_calendar_event, on_dead=mark_calendar_create_failed)
+job_queue.register(DELETE_EVENT_JOB, delete_calendar_event)
@@ -0,0 +1,116 @@
+import json
+import logging
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import pytz
+from cachetools import TTLCache
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.db.batch_writer import BatchWriter
+from app.schemas.click_event_schema import ClickEvent, ClickEventBatchResponse
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+kst = pytz.timezone("Asia/Seoul")
+
+# 클릭 이벤트는 요청 경로에서 바로 쓰지 않고 모아서 insert_many
+click_writer = BatchWriter(
+    "click_events",
+    max_queue_size=settings.CLICK_EVENT_QUEUE_MAX_SIZE,
+    batch_size=settings.CLICK_EVENT_BATCH_SIZE,
+    flush_interval=settings.CLICK_EVENT_FLUSH_INTERVAL_SECONDS,
+)
+
+# 같은 사용자(ip + user agent)의 같은 버튼 연속 클릭은 한 번만 기록
+_recent_clicks: TTLCache = TTLCache(maxsize=100000, ttl=settings.CLICK_EVENT_DEDUP_SECONDS)
+
+
+class ClickEventPayloadError(ValueError):
+    """요청 본문을 이벤트 목록으로 해석할 수 없는 경우"""
+
+
+def parse_click_events(body: bytes) -> List:
+    """JSON 배열 / 단일 JSON 객체 / NDJSON 본문 -> 원본 이벤트 목록
+
+    sendBeacon은 문자열 본문을 text/plain으로 보내므로 Content-Type 대신 본문 형태로 판단한다.
+    """
+    text = body.decode("utf-8", errors="replace").strip()
+    if not text:
+        return []
+    try:
+        payload = json.loads(text)
+    except json.JSONDecodeError:
+        # NDJSON (한 줄에 이벤트 하나)
+        payload = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                payload.append(json.loads(line))
+            except json.JSONDecodeError:
+                raise ClickEventPayloadError("JSON 배열 또는 NDJSON 형식이어야 합니다.")
+
+    if isinstance(payload, dict):
+        payload = [payload]
+    if not isinstance(payload, list):
+        raise ClickEventPayloadError("JSON 배열 또는 NDJSON 형식이어야 합니다.")
+    if len(payload) > settings.CLICK_EVENT_MAX_BATCH:
+        raise ClickEventPayloadError(f"한 번에 최대 {settings.CLICK_EVENT_MAX_BATCH}개까지 전송할 수 있습니다.")
+    return payload
+
+
+def _dedup_key(event: ClickEvent, ip_address: Optional[str], user_agent: Optional[str]) -> Tuple:
+    if event.event_id:
+        return ("id", event.event_id)
+    return ("click", ip_address, event.user_agent or user_agent, event.event_type, event.button_location)
+
+
+def record_click_events(raw_events: List,
+                        ip_address: Optional[str],
+                        user_agent: Optional[str],
+                        url: str) -> ClickEventBatchResponse:
+    """검증 + 중복 제거 후 배치 적재 큐에 넣음 (I/O 없음)"""
+    accepted = duplicates = rejected = 0
+    # metrics / error_samples 와 같이 BSON date로 저장 (기간 조회 / TTL 가능)
+    timestamp = datetime.now(kst)
+
+    for raw in raw_events:
+        try:
+            event = ClickEvent.model_validate(raw)
+        except ValidationError:
+            rejected += 1
+            continue
+
+        key = _dedup_key(event, ip_address, user_agent)
+        if key in _recent_clicks:
+            duplicates += 1
+            continue
+        _recent_clicks[key] = True
+
+        click_data = {
+            "event_type": event.event_type,
+            "button_location": event.button_location,
+            "user_agent": event.user_agent or user_agent,
+            "referrer": event.referrer,
+            "ip_address": ip_address,
+            "timestamp": timestamp,
+            "url": url
+        }
+        if event.event_id:
+            click_data["event_id"] = event.event_id
+
+        if click_writer.enqueue(click_data):
+            accepted += 1
+        else:
+            rejected += 1
+
+    return ClickEventBatchResponse(
+        status="success" if rejected == 0 else "partial",
+        accepted=accepted,
+        duplicates=duplicates,
+        rejected=rejected,
+    )
@@ -31,7 +31,7 @@ async def get_designer_list(region: Optional[List[str]], available_modes: Option
             face_consulting_fee=designer.get("face_consulting_fee", 0),
             non_face_consulting_fee=designer.get("non_face_consulting_fee", 0),
             introduction=designer.get("introduction", ""),
-            available_modes=designer.get("available_modes", "")
+            available_modes=", ".join(designer.get("available_modes", []))
         )
         result.append(designer_result)
 
@@ -43,8 +43,7 @@ async def get_designer(designer_id: str) -> DesignerResponse:
     designer = await get_designer_by_designer_id(designer_id)
     if not designer:
         raise ValueError("디자이너 정보가 없습니다.")
-    
-    designer = designer[0]
+
     designer_result = DesignerResponse(
         id=str(designer.get("_id", "")),
         name=designer.get("name", ""),
@@ -55,6 +54,6 @@ async def get_designer(designer_id: str) -> DesignerResponse:
         face_consulting_fee=designer.get("face_consulting_fee", 0),
         non_face_consulting_fee=designer.get("non_face_consulting_fee", 0),
         introduction=designer.get("introduction", ""),
-        available_modes=designer.get("available_modes", "")
+        available_modes=", ".join(designer.get("available_modes", []))
     )
     return designer_result
\ No newline at end of file
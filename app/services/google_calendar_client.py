@@ -0,0 +1,107 @@
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+
+import google_auth_httplib2
+import httplib2
+from google.oauth2.credentials import Credentials
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
+from googleapiclient.errors import HttpError
+
+from app.core import request_timing
+from app.core.config import settings
+from app.core.metrics_registry import OUTBOUND_REQUEST_DURATION, status_class
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class GoogleCalendarClient:
+    """Google Calendar API async facade
+
+    - discovery 문서는 googleapiclient에 포함된 정적 문서를 한 번만 읽어 서비스 객체를 한 번만 만든다.
+      (build()는 호출할 때마다 discovery 문서를 읽고 파싱함)
+    - 사용자별 credentials는 요청 실행 시 AuthorizedHttp로 전달한다.
+      httplib2.Http는 thread-safe 하지 않으므로 호출마다 새로 만든다.
+    - 동기 .execute()는 크기가 제한된 스레드 풀에서 실행해서 이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(self, max_workers: int, timeout_seconds: float):
+        self.max_workers = max_workers
+        self.timeout_seconds = timeout_seconds
+        self._service = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def service(self):
+        if self._service is None:
+            document = json.loads(discovery_cache.get_static_doc("calendar", "v3"))
+            # 요청별 http를 execute(http=...)로 넘기므로 빌드 시에는 인증 없는 http 사용
+            self._service = build_from_document(document, http=httplib2.Http())
+        return self._service
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="google-calendar")
+        return self._executor
+
+    def _authorized_http(self, credentials: Credentials):
+        # 만료된 access token은 AuthorizedHttp가 실행 스레드 안에서 refresh
+        return google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http(timeout=self.timeout_seconds))
+
+    async def _execute(self, request, credentials: Credentials) -> dict:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        status = "error"
+        try:
+            result = await loop.run_in_executor(
+                self.executor, partial(request.execute, http=self._authorized_http(credentials))
+            )
+            status = "2xx"
+            return result
+        except HttpError as e:
+            status = status_class(e.resp.status)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            OUTBOUND_REQUEST_DURATION.observe(elapsed, "google_calendar", status)
+            request_timing.record("google_calendar", elapsed)
+
+    async def insert_event(self, credentials: Credentials, body: dict,
+                           calendar_id: str = "primary", conference_data_version: int = 1) -> dict:
+        request = self.service.events().insert(
+            calendarId=calendar_id, body=body, conferenceDataVersion=conference_data_version
+        )
+        return await self._execute(request, credentials)
+
+    async def get_event(self, credentials: Credentials, event_id: str, calendar_id: str = "primary") -> dict:
+        request = self.service.events().get(calendarId=calendar_id, eventId=event_id)
+        return await self._execute(request, credentials)
+
+    async def update_event(self, credentials: Credentials, event_id: str, body: dict,
+                           calendar_id: str = "primary", conference_data_version: int = 1) -> dict:
+        request = self.service.events().update(
+            calendarId=calendar_id, eventId=event_id, body=body, conferenceDataVersion=conference_data_version
+        )
+        return await self._execute(request, credentials)
+
+    async def delete_event(self, credentials: Credentials, event_id: str, calendar_id: str = "primary"):
+        request = self.service.events().delete(calendarId=calendar_id, eventId=event_id)
+        return await self._execute(request, credentials)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+calendar_client = GoogleCalendarClient(
+    max_workers=settings.GOOGLE_CALENDAR_MAX_WORKERS,
+    timeout_seconds=settings.GOOGLE_CALENDAR_TIMEOUT_SECONDS,
+)
@@ -2,10 +2,12 @@ from google.oauth2 import service_account
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
 import os.path
 from app.core.config import settings
+from app.services.google_calendar_client import calendar_client
 import logging
 from google.oauth2 import service_account
 
@@ -23,9 +25,7 @@ DESIGNER_EMAIL = "hsc890125@gmail.com"
 
 def get_service_account_credentials(access_token: str):
     try:
-        creds = Credentials(token=access_token, scopes=SCOPES)
-        service = build("calendar", "v3", credentials=creds)
-        return service
+        return Credentials(token=access_token, scopes=SCOPES)
     except Exception as e:
         logger.error(f"서비스 계쩡 자격 증명 로드 실패: {e}")
         return None
@@ -39,7 +39,12 @@ async def add_event_to_user_calendar(user_email: str,
                                      designer_region: str, 
                                      designer_specialist: str, 
                                      designer_shop_address: str,
-                                     mode: str):
+                                     mode: str,
+                                     event_id: Optional[str] = None):
+    """이벤트 생성 후 (event_id, htmlLink, meet 링크) 반환, 실패 시 예외 (작업 큐에서 재시도)
+
+    event_id를 지정하면 재시도로 같은 이벤트가 중복 생성되지 않는다 (이미 있으면 409).
+    """
 
     logging.info(f"credentials ============ add_event_to_user_calendar ===========> {credentials}")
 
@@ -54,8 +59,6 @@ async def add_event_to_user_calendar(user_email: str,
         event_date_obj = event_date
 
     try:
-        service = build("calendar", "v3", credentials=credentials)
-
         # DESIGNER_EMAIL은 추후 디자이너id로 eamil 조회해와서 하는걸로 수정
         event_body = {
             "summary": "블리스 헤어 상담소",
@@ -97,26 +100,26 @@ async def add_event_to_user_calendar(user_email: str,
             },
         }
 
+        if event_id:
+            event_body["id"] = event_id
+
         # '비대면' 모드일 때만 Google Meet 링크 생성
         if mode == '비대면':
             event_body["conferenceData"] = {
                 "createRequest": {
                     "conferenceSolutionKey": {"type": "hangoutsMeet"},
-                    "requestId": "unique-request-id"
+                    "requestId": event_id or "unique-request-id"
                 }
             }
 
-        created_event = service.events().insert(
-            calendarId="primary",
+        created_event = await calendar_client.insert_event(
+            credentials,
             body=event_body,
-            conferenceDataVersion=1
-        ).execute()
+            calendar_id="primary",
+            conference_data_version=1
+        )
 
-        event_id = created_event.get("id")
-        event_html_link = created_event.get("htmlLink")
-        conference_data = created_event.get("conferenceData", {})
-        entry_points = conference_data.get("entryPoints", [])
-        meet_link = entry_points[0].get("uri") if entry_points else None
+        event_id, event_html_link, meet_link = event_links(created_event)
 
         logger.info(f"Event created: {event_html_link}")
         logger.info(f"Google Meet Link: {meet_link}")
@@ -125,14 +128,21 @@ async def add_event_to_user_calendar(user_email: str,
 
     except Exception as e:
         logger.error(f"캘린더에 이벤트 추가 중 오류 발생: {e}")
-        return None
+        raise
 
 
-def update_event_with_meet_link(event_id):
+def event_links(event: dict) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """캘린더 이벤트 -> (event_id, htmlLink, meet 링크)"""
+    conference_data = event.get("conferenceData", {})
+    entry_points = conference_data.get("entryPoints", [])
+    meet_link = entry_points[0].get("uri") if entry_points else None
+    return event.get("id"), event.get("htmlLink"), meet_link
+
+
+async def update_event_with_meet_link(event_id, access_token: str):
     try:
-        creds = get_service_account_credentials()
-        service = build('calendar', 'v3', credentials=creds)
-        event = service.events().get(calendarId=DESIGNER_EMAIL, eventId=event_id).execute()
+        creds = get_service_account_credentials(access_token)
+        event = await calendar_client.get_event(creds, event_id, calendar_id=DESIGNER_EMAIL)
 
         # Google Meet 링크 자동 생성
         event['conferenceData'] = {
@@ -142,12 +152,13 @@ def update_event_with_meet_link(event_id):
             }
         }
 
-        updated_event = service.events().update(
-            calendarId=DESIGNER_EMAIL,
-            eventId=event_id,
+        updated_event = await calendar_client.update_event(
+            creds,
+            event_id,
             body=event,
-            conferenceDataVersion=1
-        ).execute()
+            calendar_id=DESIGNER_EMAIL,
+            conference_data_version=1
+        )
 
         # Google Meet 링크 확인
         meet_link = updated_event.get('conferenceData', {}).get('entryPoints', [])[0].get('uri', '')
@@ -161,14 +172,14 @@ def update_event_with_meet_link(event_id):
         return None
 
 
-def delete_google_calendar_event(event_id, credentials:Credentials):
-    service = build('calendar', 'v3', credentials=credentials)
-
+async def delete_google_calendar_event(event_id, credentials:Credentials):
+    """이벤트 삭제 (이미 없으면 성공으로 처리), 그 외 실패는 예외 (작업 큐에서 재시도)"""
     try:
-        # 이벤트가 존재하는지 확인
-        event = service.events().get(calendarId='primary', eventId=event_id).execute()
-        if event:
-            service.events().delete(calendarId='primary', eventId=event_id).execute()
-            logger.info('--------------------------------구글캘린더 이벤트 삭제: %s' % event_id)
-    except Exception as e:
-        logger.error(f"이벤트 삭제 중 오류 발생: {e}")
\ No newline at end of file
+        await calendar_client.delete_event(credentials, event_id, calendar_id='primary')
+        logger.info('--------------------------------구글캘린더 이벤트 삭제: %s' % event_id)
+    except HttpError as e:
+        if e.resp.status in (404, 410):
+            logger.info(f"이미 삭제된 이벤트: {event_id}")
+            return
+        logger.error(f"이벤트 삭제 중 오류 발생: {e}")
+        raise
\ No newline at end of file
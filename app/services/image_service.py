@@ -0,0 +1,192 @@
+import asyncio
+import hashlib
+import logging
+import mimetypes
+import os
+from typing import Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+try:
+    from PIL import Image
+except ImportError:  # requirements.txt 에 포함, 없으면 원본만 제공 (content-hash URL, 캐시 헤더, Range는 그대로 동작)
+    Image = None
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+IMAGE_SOURCE_DIRECTORY = os.path.join(os.getcwd(), "images")
+SOURCE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".gif")
+
+# 협상 우선순위 (앞쪽이 더 작음)
+FORMAT_MIME_TYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+}
+
+
+def _available_formats() -> List[str]:
+    """Pillow가 저장할 수 있는 파생 포맷 (avif는 Pillow 11.2+ 또는 pillow-avif-plugin 필요)"""
+    if Image is None:
+        return []
+    Image.init()
+    return [image_format for image_format in FORMAT_MIME_TYPES if image_format.upper() in Image.SAVE]
+
+
+class SourceImage:
+    __slots__ = ("name", "path", "content_hash", "mime_type", "width")
+
+    def __init__(self, name: str, path: str, content_hash: str, mime_type: str, width: Optional[int]):
+        self.name = name
+        self.path = path
+        self.content_hash = content_hash
+        self.mime_type = mime_type
+        self.width = width
+
+
+class ImageStore:
+    """images/ 원본 -> 리사이즈 / WebP / AVIF 파생 이미지 디스크 캐시
+
+    - URL에 원본 내용 해시가 들어가므로 (/images/{hash}/{variant}/{name}) 응답은 immutable로 캐시한다.
+      원본이 바뀌면 해시가 바뀌어 새 URL이 된다.
+    - 파생 이미지는 처음 요청될 때 (IMAGE_PREGENERATE 면 시작 시) 스레드에서 만들어 디스크에 저장하고,
+      같은 파생 이미지를 동시에 요청해도 한 번만 만든다.
+    - 포맷은 Accept 헤더로 협상한다 (avif > webp > 원본 포맷).
+    """
+
+    def __init__(self, source_directory: str, cache_directory: str, widths: Tuple[int, ...]):
+        self.source_directory = source_directory
+        self.cache_directory = cache_directory
+        self.widths = tuple(sorted(widths))
+        self.formats = _available_formats()
+        self._by_hash: Dict[str, SourceImage] = {}
+        self._by_name: Dict[str, SourceImage] = {}
+        self._building: Dict[str, asyncio.Future] = {}
+
+    def _scan(self) -> Dict[str, SourceImage]:
+        images = {}
+        if not os.path.isdir(self.source_directory):
+            return images
+        for name in sorted(os.listdir(self.source_directory)):
+            path = os.path.join(self.source_directory, name)
+            if not name.lower().endswith(SOURCE_EXTENSIONS) or not os.path.isfile(path):
+                continue
+            with open(path, "rb") as f:
+                content_hash = hashlib.sha256(f.read()).hexdigest()[:16]
+            width = None
+            if Image is not None:
+                try:
+                    with Image.open(path) as image:
+                        width = image.width
+                except Exception as e:
+                    logger.warning(f"이미지 정보 확인 실패 {name}: {e}")
+            mime_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+            images[name] = SourceImage(name, path, content_hash, mime_type, width)
+        return images
+
+    async def load(self):
+        """원본 목록 / 해시 계산 (시작 시 1회)"""
+        images = await asyncio.to_thread(self._scan)
+        self._by_name = images
+        self._by_hash = {image.content_hash: image for image in images.values()}
+        logger.info(f"이미지 {len(images)}개 로드 (파생 포맷: {self.formats or '없음'})")
+        if Image is None:
+            logger.warning("Pillow 미설치: 이미지 리사이즈 / WebP / AVIF 파생본 비활성화 (pip install -r requirements.txt)")
+
+        if settings.IMAGE_PREGENERATE and Image is not None:
+            for image in images.values():
+                for width in self.widths:
+                    for image_format in self.formats:
+                        await self.derivative(image, width, image_format)
+
+    def get(self, content_hash: str) -> Optional[SourceImage]:
+        return self._by_hash.get(content_hash)
+
+    def snap_width(self, width: Optional[int]) -> Optional[int]:
+        """요청 너비를 허용된 너비로 맞춤 (캐시 파일 수 제한)"""
+        if width is None:
+            return None
+        for allowed in self.widths:
+            if width <= allowed:
+                return allowed
+        return self.widths[-1]
+
+    def negotiate(self, accept: str) -> Optional[str]:
+        """Accept 헤더 기준으로 제공 가능한 가장 작은 포맷 (없으면 None = 원본 포맷)"""
+        accept = accept.lower()
+        for image_format in self.formats:
+            if FORMAT_MIME_TYPES[image_format] in accept:
+                return image_format
+        return None
+
+    def url_for(self, name: str, width: Optional[int] = None) -> Optional[str]:
+        image = self._by_name.get(name)
+        if image is None:
+            return None
+        variant = f"w{self.snap_width(width)}" if width else "orig"
+        return f"/images/{image.content_hash}/{variant}/{image.name}"
+
+    def manifest(self) -> Dict[str, dict]:
+        result = {}
+        for name, image in self._by_name.items():
+            # Pillow가 없으면 리사이즈 불가 -> 원본만
+            widths = [width for width in self.widths if image.width and width < image.width]
+            result[name] = {
+                "url": self.url_for(name),
+                "width": image.width,
+                "srcset": ", ".join(f"{self.url_for(name, width)} {width}w" for width in widths),
+            }
+        return result
+
+    def _render(self, image: SourceImage, width: Optional[int], image_format: Optional[str], target: str):
+        with Image.open(image.path) as source:
+            # resize 결과 이미지는 format 이 None 이므로 원본 포맷을 먼저 읽어둠 (.jpg 파일에 PNG 저장 방지)
+            source_format = source.format
+            if width and source.width > width:
+                height = round(source.height * width / source.width)
+                source = source.resize((width, height), Image.LANCZOS)
+            save_format = (image_format or source_format or "PNG").upper()
+            if save_format in ("WEBP", "AVIF") and source.mode not in ("RGB", "RGBA"):
+                source = source.convert("RGBA")
+            options = {"quality": settings.IMAGE_QUALITY} if save_format in ("WEBP", "AVIF", "JPEG") else {"optimize": True}
+            temp = f"{target}.{os.getpid()}.tmp"
+            source.save(temp, format=save_format, **options)
+        # 완성된 파일만 보이도록 rename
+        os.replace(temp, target)
+
+    async def derivative(self, image: SourceImage, width: Optional[int], image_format: Optional[str]) -> Tuple[str, str]:
+        """(파일 경로, MIME 타입) - 원본 그대로면 원본 경로"""
+        if Image is None or (width is None and image_format is None):
+            return image.path, image.mime_type
+        if width is not None and image.width and width >= image.width:
+            width = None
+            if image_format is None:
+                return image.path, image.mime_type
+
+        extension = image_format or os.path.splitext(image.name)[1].lstrip(".").lower()
+        target = os.path.join(
+            self.cache_directory, image.content_hash, f"{f'w{width}' if width else 'orig'}.{extension}"
+        )
+        mime_type = FORMAT_MIME_TYPES.get(image_format) or image.mime_type
+        if os.path.exists(target):
+            return target, mime_type
+
+        future = self._building.get(target)
+        if future is None:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            future = asyncio.ensure_future(asyncio.to_thread(self._render, image, width, image_format, target))
+            self._building[target] = future
+            future.add_done_callback(lambda _: self._building.pop(target, None))
+        try:
+            await asyncio.shield(future)
+        except Exception as e:
+            logger.error(f"파생 이미지 생성 실패 {image.name} w={width} {image_format}: {e}")
+            return image.path, image.mime_type
+        return target, mime_type
+
+
+image_store = ImageStore(
+    IMAGE_SOURCE_DIRECTORY,
+    cache_directory=settings.IMAGE_CACHE_DIR,
+    widths=tuple(settings.IMAGE_WIDTHS),
+)
@@ -1,8 +1,8 @@
 from typing import Optional
 import httpx
-import ssl
 from fastapi import HTTPException
 from app.core.config import settings
+from app.core.http_client import KAKAO_PAY_CLIENT, get_http_client
 
 class KakaoPayService:
     def __init__(self):
@@ -12,6 +12,11 @@ class KakaoPayService:
             "Content-Type": "application/json"
         }
         self.redirect_host = settings.KAKAO_PAY_REDIRECT_URL  
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # 애플리케이션 공유 클라이언트 (keep-alive 연결 재사용)
+        return get_http_client(KAKAO_PAY_CLIENT)
         
 
     # 결제 준비 API    
@@ -41,19 +46,18 @@ class KakaoPayService:
         if vat_amount is not None:
             payload["vat_amount"] = str(vat_amount) # 부가세 금액
             
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.api_host}/online/v1/payment/ready", # 결제 준비 API 엔드포인트
-                    json=payload,
-                    headers=self.headers
-                )
+        try:
+            response = await self.client.post(
+                f"{self.api_host}/online/v1/payment/ready", # 결제 준비 API 엔드포인트
+                json=payload,
+                headers=self.headers
+            )
 
-                
-                response.raise_for_status() # 응답 상태 코드 확인
-                return response.json() # 응답 바디 반환
-            except httpx.HTTPError as e:
-                raise HTTPException(status_code=400, detail=f"카카오페이 API 호출 실패: {str(e)}") # 예외 처리
+            
+            response.raise_for_status() # 응답 상태 코드 확인
+            return response.json() # 응답 바디 반환
+        except httpx.HTTPError as e:
+            raise HTTPException(status_code=400, detail=f"카카오페이 API 호출 실패: {str(e)}") # 예외 처리
 
 
 
@@ -69,14 +73,13 @@ class KakaoPayService:
                 "pg_token": pg_token
             }
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_host}/online/v1/payment/approve",
-                    json=payload,
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self.client.post(
+                f"{self.api_host}/online/v1/payment/approve",
+                json=payload,
+                headers=self.headers
+            )
+            response.raise_for_status()
+            return response.json()
         except Exception as e:
             raise
 
@@ -98,14 +101,13 @@ class KakaoPayService:
             "cancel_reason": cancel_reason
         }
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.api_host}/online/v1/payment/cancel",
-                    json=payload,
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPError as e:
-                raise HTTPException(status_code=400, detail=f"카카오페이 결제 취소 실패: {str(e)}") 
+        try:
+            response = await self.client.post(
+                f"{self.api_host}/online/v1/payment/cancel",
+                json=payload,
+                headers=self.headers
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPError as e:
+            raise HTTPException(status_code=400, detail=f"카카오페이 결제 취소 실패: {str(e)}") 
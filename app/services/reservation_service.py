@@ -1,11 +1,11 @@
+import asyncio
 import logging
 from fastapi import Request
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import pytz
 from dateutil.relativedelta import relativedelta
 from pymongo.errors import DuplicateKeyError
-from pymongo import ReturnDocument
 
 from bson import ObjectId
 
@@ -14,7 +14,10 @@ from app.schemas.reservation_schema import DayList, ReservationListRequest, Rese
     ReservationCreateResponse, ReservationCreateRequest, ReservationDetail, ReservationSimple, GoogleMeetLinkResponse, \
     PayReadyRequest
 from app.db.session import get_database
-from app.services.google_service import add_event_to_user_calendar, update_event_with_meet_link, delete_google_calendar_event
+from app.services.calendar_sync_service import SYNC_PENDING, enqueue_calendar_create, enqueue_calendar_delete
+from app.services.availability_service import apply_reservation_status, mark_hold, release_slot
+from app.services.reservation_state import CANCELED, TEMPORARY, InvalidTransitionError, ReservationConflictError, \
+    ReservationNotFoundError, transition, transition_from
 
 db = get_database()
 collection = db["reservations"]
@@ -22,11 +25,20 @@ collection = db["reservations"]
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-current_time_str = settings.CURRENT_DATETIME
-
 kst = pytz.timezone("Asia/Seoul")
 
 
+def _reservation_detail(reservation: Dict) -> ReservationDetail:
+    return ReservationDetail(
+        **{
+            **reservation,
+            "id": str(reservation["_id"]),
+            "user_id": str(reservation["user_id"]),
+            "designer_id": str(reservation["designer_id"]),
+        }
+    )
+
+
 async def reservation_list_service(request: ReservationListRequest) -> ReservationListResponse:
     try:
         designer_obj_id = ObjectId(request.designer_id)
@@ -127,30 +139,27 @@ async def reservation_create_service(request: ReservationCreateRequest, login_us
         logger.error(f"Invalid designer_id: {request.designer_id} - {e}")
         raise ValueError("designer_id가 올바르지 않습니다.")
 
-    designer = await db["designers"].find_one({"_id": designer_obj_id})
-    if not designer:
-        logger.error(f"디자이너를 찾을 수 없음: {request.designer_id}")
-        raise ValueError("해당 designer_id에 해당하는 디자이너가 존재하지 않습니다.")
-    
     try:
         user_obj_id = ObjectId(request.user_id)
     except Exception as e:
         logger.error(f"Invalid user_id: {request.user_id} - {e}")
         raise ValueError("user_id가 올바르지 않습니다.")
 
+    if not request.reservation_id:
+        raise ValueError("임시예약 id가 필요합니다.")
 
-    user = await db["users"].find_one({"_id": user_obj_id})
+    # 디자이너 / 사용자 존재 확인은 서로 독립적이므로 동시에 조회
+    designer, user = await asyncio.gather(
+        db["designers"].find_one({"_id": designer_obj_id}, {"_id": 1}),
+        db["users"].find_one({"_id": user_obj_id}, {"_id": 1}),
+    )
+    if not designer:
+        logger.error(f"디자이너를 찾을 수 없음: {request.designer_id}")
+        raise ValueError("해당 designer_id에 해당하는 디자이너가 존재하지 않습니다.")
     if not user:
         logger.error(f"사용자를 찾을 수 없음: {request.user_id}")
         raise ValueError("해당 user_id에 해당하는 사용자가 존재하지 않습니다.")
 
-    # 디자이너 정보 조회
-    designer_name = designer.get("name")
-    designer_introduction = designer.get("introduction")
-    designer_region = designer.get("region")
-    designer_specialist = designer.get("specialties")
-    designer_shop_address = designer.get("shop_address")
-
     # 예약 데이터 업데이트/삽입 시 사용할 데이터 준비
     update_data = {
         "designer_id": designer_obj_id,
@@ -159,65 +168,41 @@ async def reservation_create_service(request: ReservationCreateRequest, login_us
         "consulting_fee": fee,
         "google_meet_link": request.google_meet_link.strip() if request.google_meet_link.strip() else None,
         "mode": request.mode,
-        "status": request.status,
-        "update_at": current_time_str,
         "del_yn": "N"
     }
+    if request.mode != "대면":
+        # 캘린더 이벤트 생성 작업 완료 시 done / 재시도 모두 실패 시 failed
+        update_data["calendar_sync_status"] = SYNC_PENDING
 
     # 무조건 임시예약이 생성된다는 전제로 만들어야함
-    if request.reservation_id:
-        result = await collection.find_one_and_update(
-            {"_id": ObjectId(request.reservation_id), "status": "임시예약"},
-            {"$set": update_data},
-            return_document=ReturnDocument.AFTER
+    # 임시예약 -> 요청 상태 변경 (TTL(expires_at) 해제, 결제대기면 payment_deadline 설정)
+    try:
+        previous, result = await transition_from(
+            request.reservation_id, request.status, from_statuses=[TEMPORARY], extra_set=update_data
         )
-        if result:
-            new_id = result["_id"]
-        else:
-            raise ValueError("해당 임시예약이 존재하지 않습니다.")
-    else:
-        raise ValueError("임시예약 id가 필요합니다.")
-
+    except (ReservationNotFoundError, InvalidTransitionError):
+        raise ValueError("해당 임시예약이 존재하지 않습니다.")
+    new_id = result["_id"]
     logger.info(f"Reservation created/updated with id: {new_id}")
 
-    # 구글 캘린더에 이벤트 추가 (대면예약의 경우 로직 건너뜀)
+    # 구글 캘린더 이벤트는 작업 큐에서 생성 (대면예약의 경우 로직 건너뜀)
+    # 완료되면 google_event_id / google_calendar_url / google_meet_link 가 예약에 저장됨
     user_email = login_user.get("email")
     logger.info(f"user_email::::::::::: {user_email}")
 
-    event_id = None
     event_html_link = ""
     meet_link = ""
-    
-    if login_user and request.mode != "대면":
-        event_date = datetime.strptime(dt_str, "%Y%m%d%H%M")
-        event_id, event_html_link, meet_link = await add_event_to_user_calendar(
-            user_email,
-            credentials=login_user.get("credentials"),
-            event_date=event_date,
-            designer_name=designer_name,
-            designer_introduction=designer_introduction,
-            designer_region=designer_region,
-            designer_specialist=designer_specialist,
-            designer_shop_address=designer_shop_address,
-            mode=request.mode
-        )
 
-        if event_id is None or event_html_link is None or meet_link is None:
-            raise ValueError("Google Calendar 이벤트 생성에 실패했습니다.")
-
-        # 이벤트 ID를 데이터베이스에 저장
-        await collection.update_one(
-            {"_id": new_id},
-            {
-                "$set": {
-                    "google_event_id": event_id,
-                    "google_calendar_url": event_html_link,
-                    "google_meet_link": meet_link
-                }
-            }
-        )
+    # 디자이너 예약 가능 슬롯 갱신과 캘린더 작업 등록은 서로 독립적이므로 동시에 처리
+    follow_ups = [apply_reservation_status(result)]
+    if (previous.get("designer_id"), previous.get("reservation_date_time")) != (designer_obj_id, dt_str):
+        # 임시예약과 다른 디자이너 / 시간으로 확정된 경우 임시예약 hold 해제 (만료까지 기다리지 않음)
+        follow_ups.append(release_slot(previous.get("designer_id"), previous.get("reservation_date_time")))
+    if login_user and request.mode != "대면":
+        follow_ups.append(enqueue_calendar_create(new_id, user_email))
     else:
         logger.info("대면: 구글 캘린더 추가 로직 생략")
+    await asyncio.gather(*follow_ups)
 
     response = ReservationCreateResponse(
         reservation_id = str(new_id),
@@ -227,7 +212,8 @@ async def reservation_create_service(request: ReservationCreateRequest, login_us
         mode=request.mode,
         status=request.status,
         google_calendar_url=event_html_link,
-        google_meet_link=meet_link
+        google_meet_link=meet_link,
+        calendar_sync_status=update_data.get("calendar_sync_status")
     )
     return response
 
@@ -260,55 +246,23 @@ async def get_reservation_by_id(reservation_id: str) -> Optional[ReservationDeta
     if not reservation:
         logger.error(f"예약을 찾을 수 없습니다. reservation_id: {reservation_id}")
         raise ValueError("예약을 찾을 수 없습니다.")
-    
 
-    if reservation:
-        return ReservationDetail(
-            **{
-                **reservation,
-                "id": str(reservation["_id"]),
-                "user_id": str(reservation["user_id"]),
-                "designer_id": str(reservation["designer_id"]),
-            }
-        )
+    return _reservation_detail(reservation)
 
 
 async def update_reservation_status(reservation_id: str, user: dict) -> Optional[ReservationDetail]:
-    # 예약 ID로 예약 정보 조회
-    reservation = await collection.find_one({"_id": ObjectId(reservation_id)})
+    # 예약취소 상태 변경 (조회 + 변경 + 변경 후 조회를 find_one_and_update 1회로)
+    reservation = await transition(reservation_id, CANCELED)
 
-    if not reservation :
-        logger.error(f"예약을 찾을 수 없습니다. reservation_id: {reservation_id}")
-        raise ValueError("예약을 찾을 수 없습니다.")
-    
-
-    new_status = "예약취소"
-    # 상태 업데이트
-    await collection.update_one(
-        {"_id": ObjectId(reservation_id)},
-        {
-            "$set": {
-                "status": new_status,
-                "update_at": current_time_str,
-            },
-            "$unset": {"google_meet_link": ""}
-        }
-    )
+    # 슬롯 해제와 캘린더 이벤트 삭제 작업 등록은 동시에 처리
+    # (이벤트 생성 작업이 아직 대기 중이면 생성 작업이 취소 상태를 보고 건너뜀)
+    follow_ups = [apply_reservation_status(reservation)]
     google_event_id = reservation.get("google_event_id")
     if google_event_id:
-        delete_google_calendar_event(google_event_id, credentials=user.get("credentials"))
-        
+        follow_ups.append(enqueue_calendar_delete(google_event_id, user.get("email")))
+    await asyncio.gather(*follow_ups)
 
-    # 업데이트된 예약 정보 반환
-    updated_reservation = await collection.find_one({"_id": ObjectId(reservation_id)})
-    return ReservationDetail(
-        **{
-            **updated_reservation,
-            "id": str(updated_reservation["_id"]),
-            "user_id": str(updated_reservation["user_id"]),
-            "designer_id": str(updated_reservation["designer_id"]),
-        }
-    )
+    return _reservation_detail(reservation)
 
 
 async def generate_google_meet_link_service(reservation_id: str) -> GoogleMeetLinkResponse:
@@ -327,71 +281,54 @@ async def generate_google_meet_link_service(reservation_id: str) -> GoogleMeetLi
 
 
 async def reservation_pay_ready_service(request: PayReadyRequest, login_user: Dict) -> dict:
+    try:
+        designer_obj_id = ObjectId(request.designer_id)
+    except Exception as e:
+        logger.error(f"Invalid designer_id: {request.designer_id} - {e}")
+        raise ValueError("designer_id가 올바르지 않습니다.")
 
-    existing = await collection.find_one({
-        "designer_id": ObjectId(request.designer_id),
-        "reservation_date_time": request.reservation_date_time,
-        "del_yn" : "N",
-        "status": {"$in": ["예약완료","결제대기","임시예약"]}
-    })
-    if existing:
-        raise ValueError("동일시간에 이미 예약이 존재합니다. 다른 시간을 선택해주세요.")
+    # get_auth_user 가 principal 캐시의 사용자 _id를 넘겨주므로 보통은 users 조회 없음
+    user_email = login_user.get("email")
+    user_id = login_user.get("_id")
+    if user_id is None:
+        find_user = await db["users"].find_one({"email": user_email}, {"_id": 1})
+        if not find_user:
+            logger.error(f"사용자를 찾을 수 없음: {user_email}")
+            raise ValueError("사용자 정보를 찾을 수 없습니다.")
+        user_id = find_user["_id"]
 
     new_id = ObjectId()
 
-    user_email = login_user.get("email")
-    find_user = await db["users"].find_one({"email": user_email})
-    user_id = find_user.get("_id")
-
-    await collection.update_one(
-        {"_id": new_id},
-        {"$set": {
+    # 중복 체크 없이 바로 insert, 동일 슬롯은 unique 부분 인덱스(designer_active_slot_unique)가 막아줌
+    # (인덱스가 없으면 기동 시 bootstrap_indexes 가 실패함)
+    expires_at = datetime.now(timezone.utc) + timedelta(minutes=settings.TEMP_RESERVATION_HOLD_MINUTES)
+    try:
+        await collection.insert_one({
+            "_id": new_id,
             "status": "임시예약",
-            "designer_id": request.designer_id,
+            "designer_id": designer_obj_id,
             "reservation_date_time": request.reservation_date_time,
-            "user_id": str(user_id),
-            "create_at": current_time_str,
-            "update_at": current_time_str,
-        }},
-        upsert=True
-    )
+            "user_id": user_id,
+            "create_at": settings.CURRENT_DATETIME,
+            "update_at": settings.CURRENT_DATETIME,
+            "del_yn": "N",
+            "active_slot": True,
+            # TTL 인덱스로 자동 삭제되는 시각
+            "expires_at": expires_at,
+        })
+    except DuplicateKeyError:
+        logger.info(f"예약 슬롯 충돌: {request.designer_id} {request.reservation_date_time}")
+        raise ReservationConflictError("동일시간에 이미 예약이 존재합니다. 다른 시간을 선택해주세요.")
+
+    # 만료 시각이 있는 hold로 반영 (TTL 삭제 시 별도 처리 없이 만료됨)
+    await mark_hold(designer_obj_id, request.reservation_date_time, expires_at)
 
     logger.info(f"Reservation pay_ready created with id: {new_id}")
     return {"_id": str(new_id)}
 
 
 async def update_just_status(reservation_id: str, reservation_status: str) -> Optional[ReservationDetail]:
-    reservation = await collection.find_one({"_id": ObjectId(reservation_id)})
-
-    if not reservation:
-        logger.error(f"예약을 찾을 수 없습니다. reservation_id: {reservation_id}")
-        raise ValueError("예약을 찾을 수 없습니다.")
-
-    # 예약 상태 검증 (유효한 상태 목록)
-    valid_statuses = ["예약완료", "결제대기", "예약취소", "이용완료"]
-    if reservation_status not in valid_statuses:
-        logger.error(f"올바르지 않은 예약 상태: {reservation_status}")
-        raise ValueError(f"status는 {valid_statuses} 중 하나여야 합니다.")
-
-    # 상태 업데이트
-    await collection.update_one(
-        {"_id": ObjectId(reservation_id)},
-        {
-            "$set": {
-                "status": reservation_status,
-                "update_at": current_time_str,
-            },
-            "$unset": {"google_meet_link": ""}
-        }
-    )
-
-    # 업데이트된 예약 정보 반환
-    updated_reservation = await collection.find_one({"_id": ObjectId(reservation_id)})
-    return ReservationDetail(
-        **{
-            **updated_reservation,
-            "id": str(updated_reservation["_id"]),
-            "user_id": str(updated_reservation["user_id"]),
-            "designer_id": str(updated_reservation["designer_id"]),
-        }
-    )
+    # 상태 검증 / 변경 / 변경 후 조회를 find_one_and_update 1회로 (허용 전이는 reservation_state.TRANSITIONS)
+    reservation = await transition(reservation_id, reservation_status)
+    await apply_reservation_status(reservation)
+    return _reservation_detail(reservation)
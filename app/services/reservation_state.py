@@ -0,0 +1,142 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.db.session import get_database
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+db = get_database()
+collection = db["reservations"]
+
+# 예약 상태
+TEMPORARY = "임시예약"
+PAYMENT_WAITING = "결제대기"
+CONFIRMED = "예약완료"
+CANCELED = "예약취소"
+COMPLETED = "이용완료"
+
+# 슬롯을 점유하는 예약 상태 (active_slot=True, unique 부분 인덱스 designer_active_slot_unique 대상)
+ACTIVE_SLOT_STATUSES = [CONFIRMED, PAYMENT_WAITING, TEMPORARY]
+
+# 허용되는 상태 전이 (현재 상태 -> 변경 가능한 상태)
+# 같은 상태(예약완료 -> 예약완료 등)는 재요청을 변경 없이 성공 처리하기 위함 (결제 기한 등은 그대로 유지)
+TRANSITIONS: Dict[str, FrozenSet[str]] = {
+    TEMPORARY: frozenset({PAYMENT_WAITING, CONFIRMED, CANCELED}),
+    PAYMENT_WAITING: frozenset({PAYMENT_WAITING, CONFIRMED, CANCELED}),
+    CONFIRMED: frozenset({CONFIRMED, CANCELED, COMPLETED}),
+    CANCELED: frozenset({CANCELED}),
+    COMPLETED: frozenset(),
+}
+
+
+class ReservationNotFoundError(ValueError):
+    """예약이 없는 경우"""
+
+
+class InvalidTransitionError(ValueError):
+    """현재 상태에서 요청한 상태로 바꿀 수 없는 경우"""
+
+
+class ReservationConflictError(ValueError):
+    """같은 디자이너, 같은 시간에 이미 예약이 있는 경우"""
+
+
+def allowed_sources(target: str) -> List[str]:
+    """target 상태로 바꿀 수 있는 현재 상태 목록"""
+    return [source for source, targets in TRANSITIONS.items() if target in targets]
+
+
+def _status_update(target: str, extra_set: Optional[dict], extra_unset: Iterable[str]) -> dict:
+    fields = {
+        "status": target,
+        "active_slot": target in ACTIVE_SLOT_STATUSES,
+        "update_at": settings.CURRENT_DATETIME,
+    }
+    unset = {"expires_at": ""}
+    if target == PAYMENT_WAITING:
+        # payment_deadline 이후 스케줄러가 예약취소 처리
+        fields["payment_deadline"] = datetime.now(timezone.utc) + timedelta(hours=settings.PAYMENT_WAITING_HOURS)
+    else:
+        unset["payment_deadline"] = ""
+    if target == CANCELED:
+        unset["google_meet_link"] = ""
+
+    if extra_set:
+        fields.update(extra_set)
+    for field in extra_unset:
+        unset[field] = ""
+    for field in fields:
+        unset.pop(field, None)
+    return {"$set": fields, "$unset": unset}
+
+
+def _applied(document: dict, update: dict) -> dict:
+    """변경 전 문서에 _status_update 결과($set / $unset, 최상위 필드만)를 적용한 문서"""
+    after = {key: value for key, value in document.items() if key not in update["$unset"]}
+    after.update(update["$set"])
+    return after
+
+
+async def transition(reservation_id,
+                     target: str,
+                     from_statuses: Optional[Iterable[str]] = None,
+                     extra_set: Optional[dict] = None,
+                     extra_unset: Iterable[str] = ()) -> dict:
+    """예약 상태 변경 (find_one_and_update 1회, 변경 후 문서 반환)"""
+    _, reservation = await transition_from(reservation_id, target, from_statuses, extra_set, extra_unset)
+    return reservation
+
+
+async def transition_from(reservation_id,
+                          target: str,
+                          from_statuses: Optional[Iterable[str]] = None,
+                          extra_set: Optional[dict] = None,
+                          extra_unset: Iterable[str] = ()) -> Tuple[dict, dict]:
+    """예약 상태 변경 (find_one_and_update 1회, (변경 전 문서, 변경 후 문서) 반환)
+
+    현재 상태 검증과 변경을 한 번의 원자적 요청으로 처리한다.
+    변경 전 문서를 받아 같은 $set / $unset 을 적용해서 변경 후 문서를 만든다
+    (extra_set 으로 디자이너 / 시간이 바뀌면 호출하는 쪽에서 이전 슬롯을 해제할 수 있도록).
+    from_statuses 로 허용 상태를 더 좁힐 수 있다 (예: 임시예약에서만 확정).
+    실패한 경우에만 원인(없음 / 잘못된 전이)을 구분하기 위해 한 번 더 조회한다.
+    이미 target 상태이고 같은 상태 전이가 허용되면 변경 없이 현재 문서를 반환한다.
+    """
+    sources = allowed_sources(target)
+    if not sources:
+        targets = [status for status in TRANSITIONS if allowed_sources(status)]
+        raise InvalidTransitionError(f"status는 {targets} 중 하나여야 합니다.")
+    if from_statuses is not None:
+        sources = [source for source in sources if source in set(from_statuses)]
+
+    try:
+        reservation_obj_id = ObjectId(str(reservation_id))
+    except Exception:
+        raise ReservationNotFoundError("예약을 찾을 수 없습니다.")
+
+    update = _status_update(target, extra_set, extra_unset)
+    try:
+        previous = await collection.find_one_and_update(
+            {"_id": reservation_obj_id, "status": {"$in": [source for source in sources if source != target]}},
+            update,
+            return_document=ReturnDocument.BEFORE,
+        )
+    except DuplicateKeyError:
+        raise ReservationConflictError("동일시간에 이미 예약이 존재합니다. 다른 시간을 선택해주세요.")
+    if previous is not None:
+        return previous, _applied(previous, update)
+
+    current = await collection.find_one({"_id": reservation_obj_id})
+    if current is None:
+        logger.error(f"예약을 찾을 수 없습니다. reservation_id: {reservation_id}")
+        raise ReservationNotFoundError("예약을 찾을 수 없습니다.")
+    if current.get("status") == target and target in sources:
+        return current, current
+    logger.error(f"허용되지 않는 예약 상태 변경: {reservation_id} {current.get('status')} -> {target}")
+    raise InvalidTransitionError(f"'{current.get('status')}' 상태에서 '{target}'(으)로 변경할 수 없습니다.")
@@ -9,10 +9,13 @@ from app.core.security import (
 )
 from app.schemas.user_schema import UserCreateRequest, UserCreateResponse
 from app.core.config import settings
+from app.core.principal_cache import principal_cache
 
 async def authenticate_user(user_info: dict, response: Response) -> dict:
     """OAuth 인증 후 기존 회원 여부 확인 및 로그인 처리"""
     email = user_info["email"]
+    # 재로그인 시 상태 / Google 토큰이 바뀌므로 캐시 제거
+    principal_cache.invalidate(email=email)
     print("사용자 생성 요청: ", user_info)
 
     try:
@@ -95,6 +98,12 @@ async def logout_user(request: Request, response: Response):
         response.delete_cookie(key="refresh_token")
         response.delete_cookie(key="access_token")
 
+        # 캐시된 인증 정보 제거
+        principal_cache.invalidate(
+            email=request.cookies.get("email"),
+            token=request.cookies.get("access_token")
+        )
+
         return {"message": "로그아웃 완료"}
 
     except HTTPException as e:
@@ -106,6 +115,7 @@ async def withdraw_user(email: str, response: Response):
     """회원 탈퇴 - 사용자 정보 삭제 및 쿠키 제거"""
     try:
         await delete_user(email)
+        principal_cache.invalidate(email=email)
         clear_auth_cookies(response)
 
         return {"message": "회원 탈퇴가 완료되었습니다."}
@@ -0,0 +1,171 @@
+"""요청마다 새 httpx.AsyncClient vs 공유 클라이언트 (keep-alive) 비교
+
+로컬에 자체 서명 인증서로 TLS 서버를 띄워 외부 API(카카오페이, Google)를 대신한다.
+매 요청마다 TCP + TLS handshake를 하는 기존 방식과 app.core.http_client 레지스트리의
+공유 클라이언트를 같은 요청 수로 비교한다.
+
+    python -m benchmarks.http_client_pool --requests 200 --concurrency 10
+"""
+import argparse
+import asyncio
+import datetime
+import ipaddress
+import json
+import os
+import ssl
+import statistics
+import tempfile
+import time
+
+import httpx
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+RESPONSE_BODY = json.dumps({"tid": "T1234567890", "next_redirect_pc_url": "https://localhost/"}).encode()
+
+
+def _write_self_signed_cert(directory: str):
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName([x509.DNSName("localhost"), x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]),
+            critical=False,
+        )
+        .sign(key, hashes.SHA256())
+    )
+    cert_path = os.path.join(directory, "cert.pem")
+    key_path = os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+    return cert_path, key_path
+
+
+class StandInServer:
+    """HTTP/1.1 keep-alive를 지원하는 최소 TLS 서버 (연결 수 / handshake 수 집계)"""
+
+    def __init__(self, cert_path: str, key_path: str, latency: float):
+        self.ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self.ssl_context.load_cert_chain(cert_path, key_path)
+        self.latency = latency
+        self.connections = 0
+        self.server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                if length:
+                    await reader.readexactly(length)
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(RESPONSE_BODY)).encode() + b"\r\n\r\n" + RESPONSE_BODY
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ssl.SSLError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0, ssl=self.ssl_context)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+async def _run(label: str, total: int, concurrency: int, call) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            await call()
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "mode": label,
+        "requests": total,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+    }
+
+
+async def main(total: int, concurrency: int, latency: float):
+    with tempfile.TemporaryDirectory() as directory:
+        cert_path, key_path = _write_self_signed_cert(directory)
+        server = StandInServer(cert_path, key_path, latency)
+        port = await server.start()
+        url = f"https://127.0.0.1:{port}/online/v1/payment/ready"
+        verify = ssl.create_default_context(cafile=cert_path)
+        payload = {"cid": "TC0ONETIME", "partner_order_id": "1", "total_amount": "30000"}
+
+        # 기존 방식: 요청마다 새 클라이언트
+        async def fresh_client():
+            async with httpx.AsyncClient(verify=verify) as client:
+                (await client.post(url, json=payload)).raise_for_status()
+
+        server.connections = 0
+        fresh = await _run("new client per request", total, concurrency, fresh_client)
+        fresh["tls_handshakes"] = server.connections
+
+        # 공유 클라이언트: app.core.http_client 와 같은 설정 (연결 수 제한 + keep-alive)
+        shared_client = httpx.AsyncClient(
+            verify=verify,
+            timeout=httpx.Timeout(10.0, connect=5.0, pool=5.0),
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        )
+
+        async def pooled_client():
+            (await shared_client.post(url, json=payload)).raise_for_status()
+
+        server.connections = 0
+        pooled = await _run("shared pooled client", total, concurrency, pooled_client)
+        pooled["tls_handshakes"] = server.connections
+        await shared_client.aclose()
+        await server.stop()
+
+    print(json.dumps([fresh, pooled], indent=2, ensure_ascii=False))
+    print(f"speedup: {fresh['elapsed_s'] / pooled['elapsed_s']:.2f}x, "
+          f"handshakes {fresh['tls_handshakes']} -> {pooled['tls_handshakes']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="서버 응답 지연 (초)")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.latency))
@@ -0,0 +1,4 @@
+"""주요 API 부하 테스트 (실제 app.main:app + 로컬 MongoDB / 카카오페이 / Google 대체 서버)
+
+    python -m benchmarks.load --concurrency 20 --requests 500 --output load-report.json
+"""
@@ -0,0 +1,329 @@
+"""주요 API 부하 테스트
+
+실제 app.main:app (lifespan 포함)을 httpx.ASGITransport로 호출한다.
+카카오페이 / Google은 benchmarks.load.fakes 의 로컬 ASGI 서버로 대체하고,
+MongoDB는 로컬 mongod (DATABASE_* 설정, --database 로 DB 이름 지정) 또는 --fake-mongo (mongomock-motor, 인프로세스)를 사용한다.
+
+시나리오별 RPS, p50 / p95 / p99, 요청당 DB 명령 수를 JSON으로 출력한다 (릴리스 간 diff 용).
+요청당 DB 명령 수는 요청을 처리한 컨텍스트에서 보낸 명령만 센다 (메트릭스 적재 / 작업 큐 등 백그라운드 제외).
+--fake-mongo 는 명령 모니터링이 없어서 db_round_trips 가 null 이다.
+
+    python -m benchmarks.load --concurrency 20 --requests 500 --output load-report.json
+    python -m benchmarks.load --fake-mongo --requests 100 --baseline load-report.json
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict
+from datetime import datetime, timezone
+
+import httpx
+from pymongo import monitoring
+
+from benchmarks.load.fakes import ExternalStats, FakeCalendarClient, asgi_client, create_google_app, \
+    create_kakao_pay_app
+from benchmarks.load.seed import SeedVolumes, seed
+
+REPORT_SCHEMA_VERSION = 1
+
+# 현재 요청이 보낸 MongoDB 명령 수 (Motor가 실행 스레드로 contextvars를 복사하므로 요청별로 집계됨)
+_request_commands: contextvars.ContextVar = contextvars.ContextVar("request_commands", default=None)
+
+
+class RequestCommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.lock = threading.Lock()
+
+    def started(self, event):
+        counter = _request_commands.get()
+        if counter is not None:
+            with self.lock:
+                counter[0] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# app 모듈이 import 시점에 MongoClient를 만들기 때문에 그 전에 등록
+command_counter = RequestCommandCounter()
+monitoring.register(command_counter)
+
+
+class Context:
+    """시나리오 간에 넘겨주는 상태 (pay_ready -> create -> payments ready -> approve)"""
+
+    def __init__(self, client: httpx.AsyncClient, data, rng: random.Random):
+        self.client = client
+        self.data = data
+        self.rng = rng
+        self.holds = []
+        self.created = []
+        self.ready_payments = []
+
+    def user(self):
+        index = self.rng.randrange(len(self.data.user_ids))
+        return self.data.user_ids[index], {"Cookie": f"email={self.data.user_emails[index]}"}
+
+
+async def designers_list(ctx: Context) -> httpx.Response:
+    params = {"region": ctx.rng.choice(["서울 전체", "서울 강남구", "경기 성남시"])} if ctx.rng.random() < 0.5 else None
+    return await ctx.client.get("/designers/", params=params)
+
+
+async def reservation_list(ctx: Context) -> httpx.Response:
+    return await ctx.client.post("/reservation/list", json={"designer_id": str(ctx.rng.choice(ctx.data.designer_ids))})
+
+
+async def reservation_pay_ready(ctx: Context) -> httpx.Response:
+    designer_id, reservation_date_time = ctx.data.free_slots.pop()
+    user_id, headers = ctx.user()
+    response = await ctx.client.get(
+        "/reservation/pay_ready",
+        params={"designer_id": str(designer_id), "reservation_date_time": reservation_date_time},
+        headers=headers,
+    )
+    if response.status_code == 200:
+        ctx.holds.append((response.json()["_id"], designer_id, reservation_date_time, user_id, headers))
+    return response
+
+
+async def reservation_create(ctx: Context) -> httpx.Response:
+    reservation_id, designer_id, reservation_date_time, user_id, headers = ctx.holds.pop()
+    response = await ctx.client.post("/reservation/create", headers=headers, json={
+        "reservation_id": reservation_id,
+        "designer_id": str(designer_id),
+        "user_id": str(user_id),
+        "reservation_date_time": reservation_date_time,
+        "consulting_fee": "30000",
+        "google_meet_link": "",
+        "mode": ctx.rng.choices(["대면", "비대면"], weights=[7, 3])[0],
+        "status": "결제대기",
+    })
+    if response.status_code == 200:
+        ctx.created.append((reservation_id, str(user_id)))
+    return response
+
+
+async def payments_ready(ctx: Context) -> httpx.Response:
+    reservation_id, user_id = ctx.created.pop()
+    response = await ctx.client.post("/payments/ready", json={
+        "reservation_id": reservation_id,
+        "user_id": user_id,
+        "payment_method": "카카오페이",
+        "amount": 30000,
+    })
+    if response.status_code == 200:
+        body = response.json()
+        ctx.ready_payments.append((body["payment_id"], body["tid"]))
+    return response
+
+
+async def payments_approve(ctx: Context) -> httpx.Response:
+    payment_id, tid = ctx.ready_payments.pop()
+    return await ctx.client.post("/payments/approve", json={"tid": tid, "pg_token": "benchmark", "order_id": payment_id})
+
+
+# (이름, 호출) - 앞 시나리오의 결과를 뒤 시나리오가 사용하므로 순서대로 실행
+SCENARIOS = [
+    ("GET /designers/", designers_list),
+    ("POST /reservation/list", reservation_list),
+    ("GET /reservation/pay_ready", reservation_pay_ready),
+    ("POST /reservation/create", reservation_create),
+    ("POST /payments/ready", payments_ready),
+    ("POST /payments/approve", payments_approve),
+]
+
+
+def _percentile(values, percent: float) -> float:
+    # nearest-rank
+    return values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+
+
+async def run_scenario(ctx: Context, name: str, call, total: int, concurrency: int, count_commands: bool) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    statuses = Counter()
+    commands = []
+
+    async def one():
+        async with semaphore:
+            counter = [0]
+            token = _request_commands.set(counter)
+            started = time.perf_counter()
+            try:
+                status = (await call(ctx)).status_code
+            except IndexError:
+                # 앞 시나리오가 실패해서 사용할 입력이 없음
+                status = "no_input"
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            finally:
+                _request_commands.reset(token)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[str(status)] += 1
+            commands.append(counter[0])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "name": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": sum(count for status, count in statuses.items() if not status.startswith("2")),
+        "status_codes": dict(sorted(statuses.items())),
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(total / elapsed, 1),
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+        "p50_ms": round(_percentile(latencies, 50), 2),
+        "p95_ms": round(_percentile(latencies, 95), 2),
+        "p99_ms": round(_percentile(latencies, 99), 2),
+        "max_ms": round(latencies[-1], 2),
+        "db_round_trips": round(sum(commands) / len(commands), 2) if count_commands else None,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _print_comparison(report: dict, baseline_path: str):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {scenario["name"]: scenario for scenario in json.load(f)["scenarios"]}
+    print(f"{'scenario':<28}{'rps':>18}{'p95_ms':>20}{'p99_ms':>20}{'db_round_trips':>18}", file=sys.stderr)
+    for scenario in report["scenarios"]:
+        before = baseline.get(scenario["name"])
+        if before is None:
+            continue
+        columns = []
+        for key, width in (("rps", 18), ("p95_ms", 20), ("p99_ms", 20), ("db_round_trips", 18)):
+            old, new = before.get(key), scenario.get(key)
+            columns.append(f"{old} -> {new}".rjust(width) if old is not None and new is not None else "-".rjust(width))
+        print(f"{scenario['name']:<28}{''.join(columns)}", file=sys.stderr)
+
+
+async def main(args):
+    # 모든 app 모듈이 같은 db 객체를 쓰도록 app import 전에 교체
+    from app.db import session
+    if args.fake_mongo:
+        session.client = session.analytics_client = AsyncMongoMockClient()
+        session.database = session.analytics_database = session.client[args.database]
+
+    from app.core.http_client import GOOGLE_API_CLIENT, GOOGLE_OAUTH_CLIENT, KAKAO_PAY_CLIENT, http_clients
+    from app.main import app
+    import app.services.calendar_sync_service as calendar_sync_service
+    import app.services.google_service as google_service
+    from app.repository.designer_cache import designer_catalog
+    if args.fake_mongo:
+        # mongomock은 change stream 미지원 (TTL 갱신만 사용)
+        designer_catalog.start_watch = lambda: None
+
+    external_latency = args.external_latency_ms / 1000
+    external_stats = ExternalStats()
+    kakao_pay_app = create_kakao_pay_app(external_latency, external_stats)
+    google_app = create_google_app(external_latency, external_stats)
+    http_clients.register(KAKAO_PAY_CLIENT, asgi_client(kakao_pay_app, "https://open-api.kakaopay.com"))
+    http_clients.register(GOOGLE_OAUTH_CLIENT, asgi_client(google_app, "https://oauth2.googleapis.com"))
+    http_clients.register(GOOGLE_API_CLIENT, asgi_client(google_app, "https://www.googleapis.com"))
+    fake_calendar = FakeCalendarClient(asgi_client(google_app, "https://www.googleapis.com"))
+    calendar_sync_service.calendar_client = fake_calendar
+    google_service.calendar_client = fake_calendar
+
+    rng = random.Random(args.seed)
+    volumes = SeedVolumes(args.designers, args.users, args.reservations, args.payments, args.metrics)
+    started = time.perf_counter()
+    data = await seed(session.database, volumes, rng)
+    print(f"seed 완료 ({time.perf_counter() - started:.1f}s): {asdict(volumes)}", file=sys.stderr)
+
+    scenarios = [(name, call) for name, call in SCENARIOS if not args.scenario or name in args.scenario]
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+            ctx = Context(client, data, rng)
+            # 캐시 / 연결 풀 준비 (결과 제외)
+            for _ in range(args.warmup):
+                await designers_list(ctx)
+                await reservation_list(ctx)
+
+            results = []
+            for name, call in scenarios:
+                result = await run_scenario(ctx, name, call, args.requests, args.concurrency,
+                                            count_commands=not args.fake_mongo)
+                print(f"{name}: {result['rps']} rps, p95 {result['p95_ms']}ms, errors {result['errors']}", file=sys.stderr)
+                results.append(result)
+
+    report = {
+        "schema_version": REPORT_SCHEMA_VERSION,
+        "meta": {
+            "git_commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": "mongomock" if args.fake_mongo else "mongod",
+            "concurrency": args.concurrency,
+            "requests_per_scenario": args.requests,
+            "external_latency_ms": args.external_latency_ms,
+            "seed": args.seed,
+            "volumes": asdict(volumes),
+        },
+        "scenarios": results,
+        "external_calls": external_stats.as_dict(),
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    if args.baseline:
+        _print_comparison(report, args.baseline)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    parser.add_argument("--requests", type=int, default=500, help="시나리오별 요청 수")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--scenario", action="append", help="실행할 시나리오 이름 (여러 번 지정 가능, 기본 전체)")
+    parser.add_argument("--database", default="harmari_benchmark", help="시드 데이터를 만들 DB 이름 (기존 데이터 삭제됨)")
+    parser.add_argument("--fake-mongo", action="store_true", help="mongod 대신 mongomock-motor 사용")
+    parser.add_argument("--external-latency-ms", type=float, default=50.0, help="카카오페이 / Google 대체 서버 응답 지연")
+    parser.add_argument("--designers", type=int, default=SeedVolumes.designers)
+    parser.add_argument("--users", type=int, default=SeedVolumes.users)
+    parser.add_argument("--reservations", type=int, default=SeedVolumes.reservations)
+    parser.add_argument("--payments", type=int, default=SeedVolumes.payments)
+    parser.add_argument("--metrics", type=int, default=SeedVolumes.metrics)
+    parser.add_argument("--seed", type=int, default=42, help="난수 seed (같은 seed면 같은 데이터 / 요청 순서)")
+    parser.add_argument("--output", help="JSON 리포트 파일 (기본 stdout)")
+    parser.add_argument("--baseline", help="비교할 이전 리포트 (차이를 stderr에 출력)")
+    args = parser.parse_args()
+
+    if "bench" not in args.database:
+        parser.error("--database 이름에 'bench'가 포함되어야 합니다 (시드 시 기존 데이터를 삭제함)")
+    # app.core.config 가 읽기 전에 DB 이름 지정
+    os.environ["DATABASE_NAME"] = args.database
+    if args.fake_mongo:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            parser.error("--fake-mongo 는 mongomock-motor 가 필요합니다 (pip install mongomock-motor)")
+        # mongomock은 explain 미지원
+        os.environ["INDEX_PLAN_CHECK"] = "off"
+
+    asyncio.run(main(args))
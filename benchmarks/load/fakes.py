@@ -0,0 +1,156 @@
+"""카카오페이 / Google API 로컬 대체 서버 (ASGI, 네트워크 없이 httpx.ASGITransport로 연결)"""
+import asyncio
+import uuid
+from collections import Counter
+from datetime import datetime
+
+import httplib2
+import httpx
+from fastapi import FastAPI, Request, Response
+from googleapiclient.errors import HttpError
+
+
+class ExternalStats:
+    """대체 서버가 받은 요청 수 (리포트용)"""
+
+    def __init__(self):
+        self.calls = Counter()
+
+    def as_dict(self) -> dict:
+        return dict(sorted(self.calls.items()))
+
+
+def create_kakao_pay_app(latency: float, stats: ExternalStats) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/online/v1/payment/ready")
+    async def ready(request: Request):
+        stats.calls["kakaopay.ready"] += 1
+        await asyncio.sleep(latency)
+        tid = f"T{uuid.uuid4().hex[:18]}"
+        return {
+            "tid": tid,
+            "next_redirect_app_url": f"https://fake.kakaopay/app/{tid}",
+            "next_redirect_mobile_url": f"https://fake.kakaopay/mobile/{tid}",
+            "next_redirect_pc_url": f"https://fake.kakaopay/pc/{tid}",
+            "created_at": datetime.now().replace(microsecond=0).isoformat(),
+        }
+
+    @app.post("/online/v1/payment/approve")
+    async def approve(request: Request):
+        stats.calls["kakaopay.approve"] += 1
+        await asyncio.sleep(latency)
+        body = await request.json()
+        now = datetime.now().replace(microsecond=0).isoformat()
+        return {
+            "aid": f"A{uuid.uuid4().hex[:18]}",
+            "tid": body["tid"],
+            "cid": body["cid"],
+            "partner_order_id": body["partner_order_id"],
+            "partner_user_id": body["partner_user_id"],
+            "payment_method_type": "MONEY",
+            "amount": {"total": 30000, "tax_free": 0, "vat": 2727},
+            "created_at": now,
+            "approved_at": now,
+        }
+
+    return app
+
+
+def create_google_app(latency: float, stats: ExternalStats) -> FastAPI:
+    app = FastAPI()
+    events = {}
+
+    @app.post("/token")
+    async def token():
+        stats.calls["google.token"] += 1
+        await asyncio.sleep(latency)
+        return {"access_token": f"ya29.{uuid.uuid4().hex}", "expires_in": 3599, "token_type": "Bearer"}
+
+    @app.get("/oauth2/v2/userinfo")
+    async def userinfo():
+        stats.calls["google.userinfo"] += 1
+        await asyncio.sleep(latency)
+        return {"email": "benchmark@example.com", "name": "benchmark", "picture": ""}
+
+    @app.post("/calendar/v3/calendars/{calendar_id}/events")
+    async def insert_event(calendar_id: str, request: Request):
+        stats.calls["google.calendar.insert"] += 1
+        await asyncio.sleep(latency)
+        body = await request.json()
+        event_id = body.get("id") or uuid.uuid4().hex
+        if event_id in events:
+            return Response(status_code=409)
+        event = {
+            **body,
+            "id": event_id,
+            "htmlLink": f"https://fake.google/calendar/event?eid={event_id}",
+            "hangoutLink": f"https://meet.fake.google/{event_id[:10]}",
+        }
+        events[event_id] = event
+        return event
+
+    @app.get("/calendar/v3/calendars/{calendar_id}/events/{event_id}")
+    async def get_event(calendar_id: str, event_id: str):
+        stats.calls["google.calendar.get"] += 1
+        await asyncio.sleep(latency)
+        if event_id not in events:
+            return Response(status_code=404)
+        return events[event_id]
+
+    @app.put("/calendar/v3/calendars/{calendar_id}/events/{event_id}")
+    async def update_event(calendar_id: str, event_id: str, request: Request):
+        stats.calls["google.calendar.update"] += 1
+        await asyncio.sleep(latency)
+        if event_id not in events:
+            return Response(status_code=404)
+        events[event_id].update(await request.json())
+        return events[event_id]
+
+    @app.delete("/calendar/v3/calendars/{calendar_id}/events/{event_id}")
+    async def delete_event(calendar_id: str, event_id: str):
+        stats.calls["google.calendar.delete"] += 1
+        await asyncio.sleep(latency)
+        if events.pop(event_id, None) is None:
+            return Response(status_code=410)
+        return Response(status_code=204)
+
+    return app
+
+
+def asgi_client(app: FastAPI, base_url: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=base_url)
+
+
+class FakeCalendarClient:
+    """GoogleCalendarClient와 같은 메서드를 Google 대체 서버로 호출
+
+    googleapiclient는 httplib2로 직접 연결하므로 ASGI 대체 서버로 보낼 수 없어서
+    calendar_client 자리에 대신 넣는다 (credentials는 사용하지 않음).
+    """
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+
+    async def _request(self, method: str, path: str, body: dict = None) -> dict:
+        response = await self.client.request(method, f"/calendar/v3/calendars/{path}", json=body)
+        if response.status_code >= 400:
+            raise HttpError(httplib2.Response({"status": response.status_code}), b"")
+        return response.json() if response.content else {}
+
+    async def insert_event(self, credentials, body: dict, calendar_id: str = "primary",
+                           conference_data_version: int = 1) -> dict:
+        return await self._request("POST", f"{calendar_id}/events", body)
+
+    async def get_event(self, credentials, event_id: str, calendar_id: str = "primary") -> dict:
+        return await self._request("GET", f"{calendar_id}/events/{event_id}")
+
+    async def update_event(self, credentials, event_id: str, body: dict, calendar_id: str = "primary",
+                           conference_data_version: int = 1) -> dict:
+        return await self._request("PUT", f"{calendar_id}/events/{event_id}", body)
+
+    async def delete_event(self, credentials, event_id: str, calendar_id: str = "primary"):
+        return await self._request("DELETE", f"{calendar_id}/events/{event_id}")
+
+    def shutdown(self):
+        pass
@@ -0,0 +1,163 @@
+"""부하 테스트용 데이터 생성 (운영 데이터와 비슷한 분포)"""
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
+
+import pytz
+from bson import ObjectId
+
+kst = pytz.timezone("Asia/Seoul")
+
+REGIONS = ["서울 전체", "서울 강남구", "서울 마포구", "서울 성동구", "경기 성남시", "부산 해운대구"]
+SPECIALTIES = ["펌", "컷", "염색", "탈색", "클리닉"]
+MODES = [["대면"], ["비대면"], ["대면", "비대면"]]
+METRIC_PATHS = ["/designers/", "/reservation/list", "/reservation/pay_ready", "/reservation/create",
+                "/payments/ready", "/payments/approve", "/user/me", "/introduce/"]
+BATCH_SIZE = 1000
+
+
+@dataclass
+class SeedVolumes:
+    designers: int = 100
+    users: int = 1000
+    reservations: int = 5000
+    payments: int = 5000
+    metrics: int = 50000
+
+
+@dataclass
+class SeedData:
+    designer_ids: List[ObjectId] = field(default_factory=list)
+    user_ids: List[ObjectId] = field(default_factory=list)
+    user_emails: List[str] = field(default_factory=list)
+    # 부하 테스트 중 pay_ready / create 에 사용할 빈 슬롯 (designer_id, 'YYYYMMDDHHMM')
+    free_slots: List[Tuple[ObjectId, str]] = field(default_factory=list)
+
+
+async def _insert(collection, documents: List[dict]):
+    for start in range(0, len(documents), BATCH_SIZE):
+        await collection.insert_many(documents[start:start + BATCH_SIZE], ordered=False)
+
+
+def _slot(day: datetime, hour: int, minute: int) -> str:
+    return f"{day.strftime('%Y%m%d')}{hour:02d}{minute:02d}"
+
+
+async def seed(db, volumes: SeedVolumes, rng: random.Random) -> SeedData:
+    """기존 데이터를 지우고 designers / users / reservations / payments / metrics 생성
+
+    시드 예약은 정각 슬롯만 사용하고, 부하 테스트의 pay_ready는 30분 슬롯을 사용해서
+    (designer_id, reservation_date_time) unique 인덱스 충돌 없이 매 요청이 새 예약을 만든다.
+    """
+    for name in ("designers", "users", "reservations", "payments", "metrics", "designer_availability", "jobs"):
+        await db[name].delete_many({})
+
+    data = SeedData()
+    now = datetime.now(timezone.utc)
+    today = datetime.now(kst).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    designers = []
+    for number in range(volumes.designers):
+        designer_id = ObjectId()
+        data.designer_ids.append(designer_id)
+        designers.append({
+            "_id": designer_id,
+            "name": f"디자이너{number}",
+            "region": rng.choice(REGIONS),
+            "shop_address": f"서울시 어딘가 {number}",
+            "profile_image": f"/static/designer_{number % 10}.png",
+            "specialties": rng.choice(SPECIALTIES),
+            "face_consulting_fee": rng.choice([20000, 30000, 40000]),
+            "non_face_consulting_fee": rng.choice([15000, 20000, 25000]),
+            "introduction": "벤치마크용 디자이너입니다.",
+            "available_modes": rng.choice(MODES),
+            "create_at": now,
+            "update_at": now,
+        })
+    await _insert(db["designers"], designers)
+
+    users = []
+    for number in range(volumes.users):
+        user_id = ObjectId()
+        email = f"bench{number}@example.com"
+        data.user_ids.append(user_id)
+        data.user_emails.append(email)
+        users.append({
+            "_id": user_id,
+            "email": email,
+            "name": f"사용자{number}",
+            "profile_image": "",
+            "google_access_token": f"ya29.bench{number}",
+            "google_refresh_token": f"1//bench{number}",
+            "status": "active",
+            "created_at": now.isoformat(),
+            "updated_at": now.isoformat(),
+        })
+    await _insert(db["users"], users)
+
+    # 정각 슬롯: 지난 30일(이용완료) ~ 앞으로 85일(예약완료 / 예약취소)
+    reservations = []
+    taken = set()
+    while len(reservations) < volumes.reservations:
+        designer_id = rng.choice(data.designer_ids)
+        day = today + timedelta(days=rng.randint(-30, 85))
+        reservation_date_time = _slot(day, rng.randint(10, 20), 0)
+        if (designer_id, reservation_date_time) in taken:
+            continue
+        taken.add((designer_id, reservation_date_time))
+        status = "이용완료" if day < today else rng.choices(["예약완료", "예약취소"], weights=[8, 2])[0]
+        reservations.append({
+            "designer_id": designer_id,
+            "user_id": rng.choice(data.user_ids),
+            "reservation_date_time": reservation_date_time,
+            "consulting_fee": 30000,
+            "mode": rng.choice(["대면", "비대면"]),
+            "status": status,
+            "active_slot": status == "예약완료",
+            "create_at": now.isoformat(),
+            "update_at": now.isoformat(),
+            "del_yn": "N",
+        })
+    await _insert(db["reservations"], reservations)
+
+    payments = []
+    for number in range(volumes.payments):
+        created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 90))
+        payments.append({
+            "reservation_id": str(ObjectId()),
+            "user_id": str(rng.choice(data.user_ids)),
+            "payment_method": "카카오페이",
+            "amount": 30000,
+            "status": rng.choices(["completed", "ready", "cancelled"], weights=[7, 2, 1])[0],
+            "tid": f"T{number:018d}",
+            "created_at": created_at.replace(tzinfo=None),
+            "updated_at": created_at.replace(tzinfo=None),
+        })
+    await _insert(db["payments"], payments)
+
+    metrics = []
+    for _ in range(volumes.metrics):
+        path = rng.choice(METRIC_PATHS)
+        status_code = rng.choices([200, 400, 401, 500], weights=[90, 5, 4, 1])[0]
+        process_time_ms = round(rng.lognormvariate(3, 0.6), 2)
+        metrics.append({
+            "timestamp": now - timedelta(seconds=rng.randint(0, 60 * 60 * 24 * 7)),
+            "path": path,
+            "endpoint_category": path.split("/")[1],
+            "method": "GET",
+            "status_code": status_code,
+            "process_time_ms": process_time_ms,
+            "performance": {"total_time_ms": process_time_ms},
+        })
+    await _insert(db["metrics"], metrics)
+
+    # 30분 슬롯 (10:30 ~ 19:30), 예약 가능 기간(내일 ~ 85일 후) 안에서만
+    data.free_slots = [
+        (designer_id, _slot(today + timedelta(days=day), hour, 30))
+        for day in range(1, 86)
+        for hour in range(10, 20)
+        for designer_id in data.designer_ids
+    ]
+    rng.shuffle(data.free_slots)
+    return data
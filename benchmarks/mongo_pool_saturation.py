@@ -0,0 +1,221 @@
+"""MongoDB 커넥션 풀 포화 시 예약 조회 지연 측정
+
+예약 경로의 짧은 조회(디자이너 + 시간 슬롯, 인덱스 사용)를 동시성을 풀 크기의 0.5 / 1 / 2 / 4배로 늘려가며 보내고,
+그동안 BI 집계(metrics 전체 $group)를 계속 실행한다.
+
+- shared: BI 집계를 예약 조회와 같은 클라이언트(풀, primary)에서 실행 (변경 전 구성)
+- separate: BI 집계는 분석용 별도 클라이언트 + MONGO_ANALYTICS_READ_PREFERENCE (app.db.session 구성)
+
+동시성 단계마다 예약 조회 처리량, p50 / p95 / p99 지연, 풀 대기 시간 p95, WaitQueueTimeout 수를 출력한다.
+실제 MongoDB가 필요하다 (.env의 DATABASE_URL 사용, --database 의 기존 데이터는 삭제됨).
+
+    python -m benchmarks.mongo_pool_saturation --pool-size 10 --duration 10
+    python -m benchmarks.mongo_pool_saturation --mode separate --wait-queue-timeout-ms 500 --output pool.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import List
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+from pymongo.errors import PyMongoError, WaitQueueTimeoutError
+
+from app.core.config import settings
+from app.db.indexes import ensure_indexes
+from app.db.session import analytics_read_preference, available_compressors, client_options
+from benchmarks.load.seed import SeedVolumes, seed
+
+MODES = ("shared", "separate")
+CONCURRENCY_FACTORS = (0.5, 1, 2, 4)
+
+# MetricsAnalyzer.get_performance_metrics 와 비슷한 원본 metrics 전체 집계
+BI_PIPELINE = [
+    {"$group": {
+        "_id": {"path": "$path", "status_code": "$status_code"},
+        "count": {"$sum": 1},
+        "avg_ms": {"$avg": "$process_time_ms"},
+        "max_ms": {"$max": "$process_time_ms"},
+    }},
+    {"$sort": {"count": -1}},
+]
+
+
+class PoolWaits(monitoring.ConnectionPoolListener):
+    """커넥션 checkout 대기 시간 / 타임아웃 수집"""
+
+    def __init__(self):
+        self.waits_ms: List[float] = []
+        self.timeouts = 0
+
+    def reset(self):
+        self.waits_ms, self.timeouts = [], 0
+
+    def connection_checked_out(self, event):
+        self.waits_ms.append(event.duration * 1000)
+
+    def connection_check_out_failed(self, event):
+        if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+            self.timeouts += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+
+def _percentile(values: List[float], quantile: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return round(values[min(int(len(values) * quantile), len(values) - 1)], 2)
+
+
+def _client(pool_size: int, wait_queue_timeout_ms: int, listeners: list) -> AsyncIOMotorClient:
+    options = client_options(pool_size, 0, available_compressors(settings.MONGO_COMPRESSORS))
+    options["waitQueueTimeoutMS"] = wait_queue_timeout_ms
+    return AsyncIOMotorClient(settings.DATABASE_URL, event_listeners=listeners, **options)
+
+
+async def _booking_worker(db, slots, deadline: float, rng: random.Random, latencies: List[float], errors: dict):
+    reservations = db["reservations"]
+    while time.perf_counter() < deadline:
+        designer_id, reservation_date_time = rng.choice(slots)
+        started = time.perf_counter()
+        try:
+            await reservations.find_one(
+                {"designer_id": designer_id, "reservation_date_time": reservation_date_time, "del_yn": "N"}
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+        except WaitQueueTimeoutError:
+            errors["wait_queue_timeout"] += 1
+        except PyMongoError:
+            errors["other"] += 1
+
+
+async def _bi_worker(db, deadline: float, stats: dict):
+    while time.perf_counter() < deadline:
+        try:
+            await db["metrics"].aggregate(BI_PIPELINE, allowDiskUse=True).to_list(None)
+            stats["completed"] += 1
+        except PyMongoError:
+            stats["errors"] += 1
+
+
+async def run_mode(mode: str, args, slots, rng: random.Random) -> List[dict]:
+    waits = PoolWaits()
+    booking_client = _client(args.pool_size, args.wait_queue_timeout_ms, [waits])
+    if mode == "shared":
+        analytics_client = booking_client
+        analytics_db = booking_client[args.database]
+    else:
+        analytics_client = _client(args.analytics_pool_size, args.wait_queue_timeout_ms, [])
+        analytics_db = analytics_client.get_database(args.database, read_preference=analytics_read_preference())
+    booking_db = booking_client[args.database]
+
+    rows = []
+    try:
+        # 연결 미리 생성 (첫 단계에 연결 생성 비용이 섞이지 않도록)
+        await asyncio.gather(*[booking_db.command("ping") for _ in range(args.pool_size)])
+        for factor in CONCURRENCY_FACTORS:
+            concurrency = max(int(args.pool_size * factor), 1)
+            latencies: List[float] = []
+            errors = {"wait_queue_timeout": 0, "other": 0}
+            bi_stats = {"completed": 0, "errors": 0}
+            waits.reset()
+
+            deadline = time.perf_counter() + args.duration
+            await asyncio.gather(
+                *[_booking_worker(booking_db, slots, deadline, rng, latencies, errors) for _ in range(concurrency)],
+                *[_bi_worker(analytics_db, deadline, bi_stats) for _ in range(args.bi_concurrency)],
+            )
+            rows.append({
+                "mode": mode,
+                "pool_size": args.pool_size,
+                "concurrency": concurrency,
+                "bi_concurrency": args.bi_concurrency,
+                "booking_rps": round(len(latencies) / args.duration, 1),
+                "booking_p50_ms": round(statistics.median(latencies), 2) if latencies else 0.0,
+                "booking_p95_ms": _percentile(latencies, 0.95),
+                "booking_p99_ms": _percentile(latencies, 0.99),
+                "checkout_wait_p95_ms": _percentile(waits.waits_ms, 0.95),
+                "wait_queue_timeouts": errors["wait_queue_timeout"],
+                "other_errors": errors["other"],
+                "bi_completed": bi_stats["completed"],
+                "bi_errors": bi_stats["errors"],
+            })
+            print(json.dumps(rows[-1], ensure_ascii=False))
+    finally:
+        booking_client.close()
+        if analytics_client is not booking_client:
+            analytics_client.close()
+    return rows
+
+
+async def main(args):
+    rng = random.Random(args.seed)
+    setup_client = AsyncIOMotorClient(settings.DATABASE_URL)
+    try:
+        db = setup_client[args.database]
+        await ensure_indexes(db)
+        data = await seed(db, SeedVolumes(designers=args.designers, users=100, reservations=args.reservations,
+                                          payments=0, metrics=args.metrics), rng)
+    finally:
+        setup_client.close()
+
+    # 정각 슬롯(시드 예약이 있는 슬롯)과 30분 슬롯(빈 슬롯)을 섞어 조회
+    slots = [(designer_id, reservation_date_time[:-2] + "00") for designer_id, reservation_date_time in data.free_slots]
+    slots += data.free_slots
+
+    rows = []
+    for mode in args.mode or MODES:
+        rows.extend(await run_mode(mode, args, slots, rng))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.mongo_pool_saturation")
+    parser.add_argument("--mode", action="append", choices=MODES, help="실행할 구성 (여러 번 지정 가능, 기본 전체)")
+    parser.add_argument("--pool-size", type=int, default=10, help="예약 조회 클라이언트 maxPoolSize")
+    parser.add_argument("--analytics-pool-size", type=int, default=settings.MONGO_ANALYTICS_MAX_POOL_SIZE)
+    parser.add_argument("--wait-queue-timeout-ms", type=int, default=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS)
+    parser.add_argument("--bi-concurrency", type=int, default=4, help="동시에 실행하는 BI 집계 수")
+    parser.add_argument("--duration", type=float, default=10.0, help="동시성 단계별 측정 시간 (초)")
+    parser.add_argument("--database", default="harmari_benchmark", help="시드 데이터를 만들 DB 이름 (기존 데이터 삭제됨)")
+    parser.add_argument("--designers", type=int, default=100)
+    parser.add_argument("--reservations", type=int, default=5000)
+    parser.add_argument("--metrics", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="JSON 리포트 파일")
+    args = parser.parse_args()
+    if "bench" not in args.database:
+        parser.error("--database 이름에 'bench'가 포함되어야 합니다 (시드 시 기존 데이터를 삭제함)")
+    asyncio.run(main(args))
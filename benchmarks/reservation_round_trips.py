@@ -0,0 +1,144 @@
+"""예약 API별 MongoDB 왕복(round-trip) 수 / 지연 측정
+
+pymongo CommandListener로 서비스 함수 1회 호출 동안 보낸 명령 수를 센다.
+상태 변경은 기존 방식(find_one -> update_one -> find_one)과
+app.services.reservation_state.transition(find_one_and_update 1회)을 같은 데이터로 비교한다.
+
+실제 MongoDB가 필요하다 (.env의 DATABASE_* 설정 사용, 벤치마크용 문서는 끝나면 삭제).
+
+    python -m benchmarks.reservation_round_trips --iterations 50
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytz
+from pymongo import monitoring
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.commands = Counter()
+
+    def started(self, event):
+        self.commands[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def reset(self) -> Counter:
+        commands, self.commands = self.commands, Counter()
+        return commands
+
+
+# app 모듈이 import 시점에 MongoClient를 만들기 때문에 그 전에 등록해야 함
+counter = CommandCounter()
+monitoring.register(counter)
+
+from bson import ObjectId  # noqa: E402
+
+from app.db.session import get_database  # noqa: E402
+from app.schemas.reservation_schema import PayReadyRequest, ReservationCreateRequest  # noqa: E402
+from app.services import reservation_service  # noqa: E402
+from app.services.availability_service import apply_reservation_status  # noqa: E402
+
+BENCHMARK_MARKER = {"benchmark": "reservation_round_trips"}
+
+
+async def legacy_update_just_status(reservation_id: str, reservation_status: str):
+    """기존 update_just_status 흐름 (비교용)"""
+    collection = get_database()["reservations"]
+    reservation = await collection.find_one({"_id": ObjectId(reservation_id)})
+    if not reservation:
+        raise ValueError("예약을 찾을 수 없습니다.")
+    await collection.update_one(
+        {"_id": ObjectId(reservation_id)},
+        {"$set": {"status": reservation_status}, "$unset": {"expires_at": ""}},
+    )
+    updated_reservation = await collection.find_one({"_id": ObjectId(reservation_id)})
+    await apply_reservation_status(updated_reservation)
+    return updated_reservation
+
+
+class Recorder:
+    def __init__(self):
+        self.round_trips = {}
+        self.latencies = {}
+
+    async def measure(self, name: str, call):
+        counter.reset()
+        started = time.perf_counter()
+        result = await call()
+        self.latencies.setdefault(name, []).append((time.perf_counter() - started) * 1000)
+        self.round_trips.setdefault(name, []).append(counter.reset())
+        return result
+
+    def report(self) -> list:
+        rows = []
+        for name, samples in self.round_trips.items():
+            commands = sum(samples, Counter())
+            latencies = sorted(self.latencies[name])
+            rows.append({
+                "endpoint": name,
+                "round_trips": round(sum(commands.values()) / len(samples), 2),
+                "commands": {command: round(count / len(samples), 2) for command, count in commands.items()},
+                "p50_ms": round(statistics.median(latencies), 2),
+                "p95_ms": round(latencies[max(int(len(latencies) * 0.95) - 1, 0)], 2),
+            })
+        return rows
+
+
+async def main(iterations: int):
+    db = get_database()
+    reservation_date_time = (datetime.now(pytz.timezone("Asia/Seoul")) + timedelta(days=1)).strftime("%Y%m%d") + "1400"
+    user_id = (await db["users"].insert_one({**BENCHMARK_MARKER, "email": "benchmark@example.com"})).inserted_id
+    # get_auth_user 반환값과 같은 형태 (principal 캐시의 사용자 _id 포함)
+    login_user = {"_id": user_id, "email": "benchmark@example.com"}
+    recorder = Recorder()
+
+    try:
+        for _ in range(iterations):
+            # 디자이너마다 같은 시간 슬롯 하나씩 사용
+            designer_id = (await db["designers"].insert_one({**BENCHMARK_MARKER, "name": "benchmark"})).inserted_id
+
+            created = await recorder.measure("GET /reservation/pay_ready", lambda: reservation_service.reservation_pay_ready_service(
+                PayReadyRequest(designer_id=str(designer_id), reservation_date_time=reservation_date_time), login_user
+            ))
+            reservation_id = created["_id"]
+
+            await recorder.measure("POST /reservation/create", lambda: reservation_service.reservation_create_service(
+                ReservationCreateRequest(
+                    reservation_id=reservation_id, designer_id=str(designer_id), user_id=str(user_id),
+                    reservation_date_time=reservation_date_time, consulting_fee="30000",
+                    google_meet_link="", mode="대면", status="결제대기",
+                ), login_user
+            ))
+
+            await recorder.measure("PATCH /reservation/update_reservation_status (legacy)",
+                                   lambda: legacy_update_just_status(reservation_id, "결제대기"))
+            await recorder.measure("PATCH /reservation/update_reservation_status",
+                                   lambda: reservation_service.update_just_status(reservation_id, "예약완료"))
+            await recorder.measure("PATCH /reservation/cancel",
+                                   lambda: reservation_service.update_reservation_status(reservation_id, login_user))
+    finally:
+        designer_ids = await db["designers"].distinct("_id", BENCHMARK_MARKER)
+        await db["reservations"].delete_many({"designer_id": {"$in": designer_ids}})
+        await db["designer_availability"].delete_many({"designer_id": {"$in": designer_ids}})
+        await db["designers"].delete_many(BENCHMARK_MARKER)
+        await db["users"].delete_many(BENCHMARK_MARKER)
+
+    print(json.dumps(recorder.report(), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+# app.core.config 의 필수 설정 (real.env 없이 실행, 실제 값이 있으면 그대로 사용)
+TEST_ENV = {
+    "DATABASE_URL": "localhost:27017",
+    "DATABASE_NAME": "harmari_test",
+    "DB_USER": "test",
+    "DB_PW": "test",
+    "KAKAO_PAY_CLIENT_ID": "test",
+    "KAKAO_PAY_CLIENT_SECRET": "test",
+    "KAKAO_PAY_SECRET_KEY_DEV": "test",
+    "KAKAO_PAY_API_HOST": "https://open-api.kakaopay.com",
+    "KAKAO_PAY_REDIRECT_URL": "http://localhost:3000",
+    "GOOGLE_CLIENT_ID": "test",
+    "GOOGLE_CLIENT_SECRET": "test",
+    "GOOGLE_REDIRECT_URI": "http://localhost:3000",
+    "GOOGLE_SCOPES": '["openid"]',
+    "GOOGLE_CREDENTIALS_PATH": "credentials.json",
+    "TOKEN_PATH": "token.json",
+    "ADMIN_CALENDAR_ID": "test",
+    "SECRET_KEY": "test",
+    "REFRESH_SECRET_KEY": "test",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "FRONTEND_URL": "http://localhost:3000",
+}
+for key, value in TEST_ENV.items():
+    os.environ.setdefault(key, value)
+
+
+@pytest.fixture
+def mongo_db():
+    """테스트마다 새 mongomock DB (mongod 없이 실행)"""
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    return mongomock_motor.AsyncMongoMockClient()["harmari_test"]
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.services import availability_service
+from app.services.availability_service import slot_index
+
+DATE = "20991231"
+
+
+def _use_db(monkeypatch, mongo_db):
+    collection = mongo_db["designer_availability"]
+    update_one = collection.update_one
+
+    async def bulk_write(requests, ordered=True):
+        # mongomock bulk_write는 pymongo 4.11 UpdateOne(sort 인자)을 받지 못해 하나씩 실행
+        for request in requests:
+            await update_one(request._filter, request._doc, upsert=request._upsert)
+
+    monkeypatch.setattr(collection, "bulk_write", bulk_write, raising=False)
+    monkeypatch.setattr(availability_service, "db", mongo_db)
+    monkeypatch.setattr(availability_service, "collection", collection)
+
+
+def _day(mongo_db, designer_id):
+    return asyncio.run(mongo_db["designer_availability"].find_one({"designer_id": designer_id, "date": DATE}))
+
+
+def test_hook_materializes_missing_day_with_existing_reservations(monkeypatch, mongo_db):
+    _use_db(monkeypatch, mongo_db)
+    designer_id = ObjectId()
+    asyncio.run(mongo_db["reservations"].insert_one({
+        "designer_id": designer_id, "reservation_date_time": DATE + "1000", "status": "예약완료", "del_yn": "N",
+    }))
+
+    expires_at = datetime.utcnow() + timedelta(minutes=10)
+
+    asyncio.run(availability_service.mark_hold(designer_id, DATE + "1100", expires_at))
+
+    day = _day(mongo_db, designer_id)
+    assert day["booked"] == 1 << slot_index(DATE + "1000")
+    assert list(day["holds"]) == [str(slot_index(DATE + "1100"))]
+
+
+def test_hook_reapplies_over_stale_materialization(monkeypatch, mongo_db):
+    _use_db(monkeypatch, mongo_db)
+    designer_id = ObjectId()
+    update_one = availability_service.collection.update_one
+    stale_inserted = []
+
+    async def racing_update_one(filter, update, **kwargs):
+        # hook의 첫 update와 재계산 사이에 예약 변경 전 reservations로 만든 문서가 먼저 저장되는 경우
+        result = await update_one(filter, update, **kwargs)
+        if not stale_inserted and not kwargs.get("upsert"):
+            stale_inserted.append(True)
+            await availability_service.collection.insert_one(
+                {"designer_id": designer_id, "date": DATE, "booked": 0, "holds": {}}
+            )
+        return result
+
+    monkeypatch.setattr(availability_service.collection, "update_one", racing_update_one)
+    expires_at = datetime.utcnow() + timedelta(minutes=10)
+
+    asyncio.run(availability_service.mark_hold(designer_id, DATE + "1030", expires_at))
+
+    holds = _day(mongo_db, designer_id)["holds"]
+    assert str(slot_index(DATE + "1030")) in holds
@@ -0,0 +1,18 @@
+import pytest
+
+from app.services.image_service import ImageStore, SourceImage
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def test_resized_derivative_keeps_source_format(tmp_path):
+    path = tmp_path / "photo.jpg"
+    Image.new("RGB", (200, 100), "red").save(path, format="JPEG")
+    store = ImageStore(str(tmp_path), str(tmp_path / "cache"), (100,))
+    target = str(tmp_path / "photo.w100.jpg")
+
+    store._render(SourceImage("photo.jpg", str(path), "hash", "image/jpeg", 200), 100, None, target)
+
+    with Image.open(target) as rendered:
+        assert rendered.format == "JPEG"
+        assert rendered.size == (100, 50)
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.db import indexes
+from app.db.indexes import INDEXES, OBSOLETE_INDEXES, ensure_indexes, verify_query_plans
+
+
+def _index_names(db, collection_name: str) -> set:
+    return set(asyncio.run(db[collection_name].index_information()))
+
+
+def test_ensure_indexes_creates_declared_indexes(mongo_db):
+    asyncio.run(ensure_indexes(mongo_db))
+
+    for collection_name, models in INDEXES.items():
+        names = _index_names(mongo_db, collection_name)
+        for model in models:
+            assert model.document["name"] in names, f"{collection_name}.{model.document['name']}"
+
+
+def test_ensure_indexes_is_idempotent(mongo_db):
+    asyncio.run(ensure_indexes(mongo_db))
+    before = {name: _index_names(mongo_db, name) for name in INDEXES}
+
+    asyncio.run(ensure_indexes(mongo_db))
+
+    assert {name: _index_names(mongo_db, name) for name in INDEXES} == before
+
+
+def test_metrics_ttl_outlives_bi_window(mongo_db):
+    asyncio.run(ensure_indexes(mongo_db))
+
+    info = asyncio.run(mongo_db["metrics"].index_information())
+    expire = info["timestamp_ttl"]["expireAfterSeconds"]
+    assert expire == settings.METRICS_TTL_DAYS * 24 * 60 * 60
+    # BI API 최대 조회 구간 (/bi/api/metrics/* days <= 365)
+    assert expire >= 365 * 24 * 60 * 60
+
+
+def test_ensure_indexes_drops_obsolete_indexes(mongo_db):
+    for collection_name, names in OBSOLETE_INDEXES.items():
+        for name in names:
+            asyncio.run(mongo_db[collection_name].create_index([(f"obsolete_{name}", 1)], name=name))
+
+    asyncio.run(ensure_indexes(mongo_db))
+
+    for collection_name, names in OBSOLETE_INDEXES.items():
+        assert not set(names) & _index_names(mongo_db, collection_name)
+
+
+def test_ensure_indexes_updates_changed_ttl(mongo_db, monkeypatch):
+    commands = []
+
+    async def command(spec):
+        commands.append(spec)
+
+    monkeypatch.setattr(mongo_db, "command", command, raising=False)
+    asyncio.run(mongo_db["metrics"].create_index([("timestamp", 1)], name="timestamp_ttl", expireAfterSeconds=60))
+
+    asyncio.run(ensure_indexes(mongo_db))
+
+    assert {
+        "collMod": "metrics",
+        "index": {"name": "timestamp_ttl", "expireAfterSeconds": settings.METRICS_TTL_DAYS * 24 * 60 * 60},
+    } in commands
+
+
+class _ExplainCursor:
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def sort(self, sort):
+        return self
+
+    async def explain(self):
+        return {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": self.stage}}}}
+
+
+class _ExplainCollection:
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def find(self, filter):
+        return _ExplainCursor(self.stage)
+
+
+class _ExplainDb:
+    """mongomock은 explain 미지원이라 winning plan만 돌려주는 대체 DB"""
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __getitem__(self, name):
+        return _ExplainCollection(self.stage)
+
+
+def test_verify_query_plans_passes_on_index_scans(monkeypatch):
+    monkeypatch.setattr(settings, "INDEX_PLAN_CHECK", "fail")
+
+    assert asyncio.run(verify_query_plans(_ExplainDb("IXSCAN"))) == []
+
+
+def test_verify_query_plans_warns_on_collscan(monkeypatch):
+    monkeypatch.setattr(settings, "INDEX_PLAN_CHECK", "warn")
+
+    collscans = asyncio.run(verify_query_plans(_ExplainDb("COLLSCAN")))
+
+    assert collscans == [query["name"] for query in indexes._sample_query_plans()]
+
+
+def test_verify_query_plans_fails_on_collscan(monkeypatch):
+    monkeypatch.setattr(settings, "INDEX_PLAN_CHECK", "fail")
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(verify_query_plans(_ExplainDb("COLLSCAN")))
+
+
+def test_backfill_active_slot_marks_only_slot_holding_reservations(mongo_db):
+    reservations = mongo_db["reservations"]
+    asyncio.run(reservations.insert_many([
+        {"_id": 1, "status": "예약완료", "del_yn": "N"},
+        {"_id": 2, "status": "결제대기", "del_yn": "N"},
+        {"_id": 3, "status": "예약취소", "del_yn": "N"},
+        {"_id": 4, "status": "예약완료", "del_yn": "Y"},
+        {"_id": 5, "status": "이용완료", "del_yn": "N"},
+    ]))
+
+    asyncio.run(indexes.backfill_active_slot(mongo_db))
+
+    active = {doc["_id"]: doc["active_slot"] for doc in asyncio.run(reservations.find().to_list(None))}
+    assert active == {1: True, 2: True, 3: False, 4: False, 5: False}
+
+
+def test_verify_required_indexes_fails_without_slot_index(mongo_db):
+    asyncio.run(mongo_db["reservations"].insert_one({"status": "예약완료"}))
+
+    with pytest.raises(RuntimeError, match=indexes.SLOT_UNIQUE_INDEX):
+        asyncio.run(indexes.verify_required_indexes(mongo_db))
+
+    asyncio.run(ensure_indexes(mongo_db))
+    asyncio.run(indexes.verify_required_indexes(mongo_db))
@@ -0,0 +1,57 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.analytics.query_profiler import ANALYTICS_CLIENT, MAIN_CLIENT, QueryProfiler
+
+
+class _ExplainDb:
+    """explain 명령만 기록하고 COLLSCAN 플랜을 돌려주는 대체 DB"""
+
+    def __init__(self):
+        self.commands = []
+
+    async def command(self, spec):
+        self.commands.append(spec)
+        return {"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}
+
+
+def _profiler() -> QueryProfiler:
+    return QueryProfiler(max_shapes=100, explain_threshold_ms=0, explain_interval=0,
+                         examined_ratio=10, min_examined=100)
+
+
+def _run_command(profiler: QueryProfiler, client_name: str, command_name: str, command: dict, request_id: int):
+    started = SimpleNamespace(command_name=command_name, command=command, request_id=request_id, connection_id=1)
+    profiler.started(started, client_name)
+    profiler.succeeded(SimpleNamespace(command_name=command_name, reply={"n": 0}, request_id=request_id,
+                                       connection_id=1, duration_micros=5000))
+
+
+def test_explain_uses_issuing_client_and_plans_only_aggregates():
+    profiler = _profiler()
+    _run_command(profiler, MAIN_CLIENT, "find", {"find": "reservations", "filter": {"designer_id": 1}}, 1)
+    _run_command(profiler, ANALYTICS_CLIENT, "aggregate",
+                 {"aggregate": "metrics", "pipeline": [{"$match": {"timestamp": {"$gte": 1}}}, {"$group": {}}]}, 2)
+    main, analytics = _ExplainDb(), _ExplainDb()
+
+    assert asyncio.run(profiler.explain_slow_shapes({MAIN_CLIENT: main, ANALYTICS_CLIENT: analytics})) == 2
+
+    assert [spec["explain"]["find"] for spec in main.commands] == ["reservations"]
+    assert main.commands[0]["verbosity"] == "executionStats"
+    assert [spec["explain"]["find"] for spec in analytics.commands] == ["metrics"]
+    assert analytics.commands[0]["verbosity"] == "queryPlanner"
+    aggregate = next(item for item in profiler.top_queries() if item["command"] == "aggregate")
+    assert aggregate["client"] == ANALYTICS_CLIENT
+    assert aggregate["missing_index"] is True
+
+
+def test_secondary_read_preference_is_explained_on_analytics_db():
+    profiler = _profiler()
+    command = {"find": "metrics", "filter": {}, "$readPreference": {"mode": "secondaryPreferred"}}
+    _run_command(profiler, MAIN_CLIENT, "find", command, 1)
+    main, analytics = _ExplainDb(), _ExplainDb()
+
+    asyncio.run(profiler.explain_slow_shapes({MAIN_CLIENT: main, ANALYTICS_CLIENT: analytics}))
+
+    assert main.commands == []
+    assert len(analytics.commands) == 1
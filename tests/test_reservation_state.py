@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.services import reservation_state
+from app.services.reservation_state import (
+    CANCELED, COMPLETED, CONFIRMED, PAYMENT_WAITING, TEMPORARY, InvalidTransitionError, transition,
+    transition_from,
+)
+
+
+@pytest.fixture
+def reservations(monkeypatch, mongo_db):
+    collection = mongo_db["reservations"]
+    monkeypatch.setattr(reservation_state, "collection", collection)
+    return collection
+
+
+def _insert(reservations, status: str, **fields) -> ObjectId:
+    reservation_id = ObjectId()
+    asyncio.run(reservations.insert_one({"_id": reservation_id, "status": status, "update_at": "before", **fields}))
+    return reservation_id
+
+
+@pytest.mark.parametrize("status", [CONFIRMED, PAYMENT_WAITING, CANCELED])
+def test_same_state_repeat_is_a_no_op(reservations, status):
+    deadline = datetime(2099, 1, 1)
+    reservation_id = _insert(reservations, status, payment_deadline=deadline)
+
+    reservation = asyncio.run(transition(reservation_id, status))
+
+    assert reservation["status"] == status
+    assert reservation["update_at"] == "before"
+    assert reservation["payment_deadline"] == deadline
+
+
+def test_repeat_respects_from_statuses(reservations):
+    reservation_id = _insert(reservations, CONFIRMED)
+
+    with pytest.raises(InvalidTransitionError):
+        asyncio.run(transition(reservation_id, CONFIRMED, from_statuses=[TEMPORARY]))
+
+
+def test_transition_updates_status(reservations):
+    reservation_id = _insert(reservations, TEMPORARY, expires_at=datetime(2099, 1, 1))
+
+    reservation = asyncio.run(transition(reservation_id, CONFIRMED))
+
+    assert reservation["status"] == CONFIRMED
+    assert reservation["active_slot"] is True
+    assert "expires_at" not in reservation
+
+
+def test_completed_is_final(reservations):
+    reservation_id = _insert(reservations, COMPLETED)
+
+    with pytest.raises(InvalidTransitionError):
+        asyncio.run(transition(reservation_id, COMPLETED))
+
+
+def test_transition_from_returns_previous_slot(reservations):
+    designer_id, other_designer_id = ObjectId(), ObjectId()
+    reservation_id = _insert(reservations, TEMPORARY, designer_id=designer_id, reservation_date_time="209912311000")
+
+    previous, reservation = asyncio.run(transition_from(
+        reservation_id, CONFIRMED, extra_set={"designer_id": other_designer_id, "reservation_date_time": "209912311100"}
+    ))
+
+    assert (previous["designer_id"], previous["reservation_date_time"]) == (designer_id, "209912311000")
+    assert (reservation["designer_id"], reservation["reservation_date_time"]) == (other_designer_id, "209912311100")
+    stored = asyncio.run(reservations.find_one({"_id": reservation_id}))
+    assert {key: stored[key] for key in reservation} == reservation